@@ -1,9 +1,75 @@
-from flask import Flask, request, jsonify
-from backend.bot.bot_core import ChatBot
-from backend.scraper.run_scraper import run_with_config
+import os
+import time
+import logging
+import threading
+from flask import Flask, Response, request, jsonify
+from backend.bot.registry import DEFAULT_SITE, UnknownSite, get_bot_registry
+from backend.bot.reply_cache import get_reply_cache
+from backend.api.jobs import UnknownConfig, get_job_queue
+from backend import metrics
 
 app = Flask(__name__)
-bot = ChatBot()
+MAX_BATCH = 1000  # Messages per /chat/batch request
+bots = get_bot_registry()  # One ChatBot per site (config name), loaded on first use
+
+
+def _on_scrape_finished(job):
+    if job["status"] == "success" and job["changed"]:
+        # Background swap of that site's bot data, if it is loaded (applies the run's changeset when it can)
+        bots.reload(job["config"])
+
+
+def job_queue():
+    """
+    The process's scrape job queue (scrapes run off the request threads). Created on first use, never
+    at import: the queue opens its SQLite database and thread pools.
+    """
+    return get_job_queue(on_finish=_on_scrape_finished)
+
+
+_services_pid = None
+_services_lock = threading.Lock()
+
+
+def warm_bots():
+    """
+    Load the default site's bot now instead of on the first /chat. Importing this module never does
+    (chat-only workers start fast); serve.py calls this in the gunicorn master before forking, so
+    workers share the data copy-on-write, and before the threaded server starts listening.
+    """
+    try:
+        bots.get(DEFAULT_SITE)
+    except UnknownSite as e:
+        logging.warning(f"Default site not loaded: {e}")
+
+
+def start_background_services():
+    """
+    Threads that belong to the serving process: the bot data watcher and the job queue.
+    Importing this module never starts them, so a preforking server can load the app (and bot data)
+    once in the master and start them in each worker after fork. Idempotent per process.
+    """
+    global _services_pid
+    with _services_lock:
+        if _services_pid == os.getpid():
+            return
+        _services_pid = os.getpid()
+    bots.watch()  # Pick up CSVs rewritten outside this process (CLI / batch runs)
+    job_queue().start()  # Run queued jobs, re-queue ones whose process died
+
+
+def stop_background_services(wait: bool = True):
+    """Graceful shutdown: stop watching, leave unclaimed jobs queued, let running scrapes finish"""
+    bots.stop_watching()
+    if _services_pid is not None:  # Otherwise this process never created the queue
+        job_queue().shutdown(wait=wait)
+
+
+@app.before_request
+def _ensure_background_services():
+    # Servers without a post-fork hook (flask run, the dev server) start them on the first request
+    if _services_pid != os.getpid():
+        start_background_services()
 
 @app.route("/", methods=["GET"])
 def home():
@@ -11,19 +77,26 @@ def home():
 
 @app.route("/scrape", methods=["POST"])
 def scrape():
+    """Queue a scrape and return its job id right away (poll GET /scrape/<job_id>)"""
     payload = request.get_json(silent=True) or {}
     config_name = payload.get("config", "clubinject_scottsdale")
     try:
-        rows, out_path, sample = run_with_config(config_name)
-        return jsonify({
-            "status": "success",
-            "message": f"{config_name} scraper execution completed",
-            "rows": rows, "output": out_path, "sample": sample
-        })
-    except PermissionError as e:
-        return jsonify({"status": "blocked_by_robots", "message": str(e)}), 451
-    except Exception as e:
-        return jsonify({"status": "error", "message": str(e)}), 500
+        job, deduplicated = job_queue().submit(config_name)
+    except UnknownConfig as e:
+        return jsonify({"status": "error", "message": str(e)}), 404
+    return jsonify({
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "deduplicated": deduplicated,  # An identical job was already queued or running
+        "status_url": f"/scrape/{job['job_id']}",
+    }), 202
+
+@app.route("/scrape/<job_id>", methods=["GET"])
+def scrape_status(job_id):
+    job = job_queue().get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": f"Unknown job: {job_id}"}), 404
+    return jsonify(job)
 
 @app.route("/chat", methods=["POST"])
 def chat():
@@ -32,19 +105,87 @@ def chat():
     if not data or "message" not in data:
         return jsonify({"error": "Missing 'message' field"}), 400
 
+    start = time.perf_counter()
     user_message = data["message"]
-    response = bot.chat(user_message)
-    return jsonify({"reply": response})
+    site = data.get("site", DEFAULT_SITE)
+    if not isinstance(site, str):
+        return jsonify({"error": "'site' must be a string"}), 400
+    try:
+        response = bots.chat(user_message, site)
+    except UnknownSite as e:
+        return jsonify({"error": str(e)}), 404
+    metrics.observe("monagent_chat_seconds", time.perf_counter() - start, endpoint="chat")
+    metrics.inc("monagent_chat_messages_total", endpoint="chat")
+    return jsonify({"reply": response, "site": site})
+
+@app.route("/metrics", methods=["GET"])
+def metrics_endpoint():
+    """Prometheus text format: scrape phase histograms, chat latency and intent counters"""
+    return Response(metrics.get_metrics().render(), mimetype="text/plain; version=0.0.4")
+
+@app.route("/chat/cache", methods=["GET"])
+def chat_cache_stats():
+    """Reply cache hit/miss counters plus the sites currently loaded"""
+    return jsonify({"reply_cache": get_reply_cache().stats(), "bots": bots.stats()})
+
+@app.route("/chat/batch", methods=["POST"])
+def chat_batch():
+    """
+    Answer many messages in one request, e.g.
+        {"site": "clubinject_scottsdale", "messages": ["20 units?", {"message": "where", "site": "other_site"}]}
+    Replies come back in input order; items for unknown sites get a null reply and an entry in "errors".
+    """
+    start = time.perf_counter()
+    data = request.get_json(silent=True) or {}
+    messages = data.get("messages")
+    if not isinstance(messages, list):
+        return jsonify({"error": "Missing 'messages' list"}), 400
+    if len(messages) > MAX_BATCH:
+        return jsonify({"error": f"Too many messages (max {MAX_BATCH})"}), 413
+
+    # Group by site so each site's messages go through its bot in one call
+    default_site = data.get("site", DEFAULT_SITE)
+    groups = {}
+    for i, item in enumerate(messages):
+        if isinstance(item, dict):
+            message, site = item.get("message"), item.get("site", default_site)
+        else:
+            message, site = item, default_site
+        if not isinstance(message, str):
+            return jsonify({"error": f"messages[{i}]: 'message' must be a string"}), 400
+        if not isinstance(site, str):
+            return jsonify({"error": f"messages[{i}]: 'site' must be a string"}), 400
+        groups.setdefault(site, []).append((i, message))
+
+    replies = [None] * len(messages)
+    errors = []
+    for site, items in groups.items():
+        try:
+            answers = bots.chat_many([m for _, m in items], site)
+        except UnknownSite as e:
+            errors += [{"index": i, "site": site, "error": str(e)} for i, _ in items]
+            continue
+        for (i, _), reply in zip(items, answers):
+            replies[i] = reply
 
-@app.post("/chat")
-def chat_api():
-    message = request.json.get("message", "")
-    reply = bot.chat(message)
-    return jsonify({"reply": reply})
+    seconds = time.perf_counter() - start
+    metrics.observe("monagent_chat_seconds", seconds, endpoint="chat_batch")
+    metrics.inc("monagent_chat_messages_total", len(messages), endpoint="chat_batch")
+    return jsonify({
+        "replies": replies,
+        "errors": sorted(errors, key=lambda e: e["index"]),
+        "meta": {
+            "count": len(messages),
+            "unique": len(set(m if isinstance(m, str) else m.get("message") for m in messages)),
+            "sites": len(groups),
+            "seconds": round(seconds, 6),
+            "per_message_ms": round(seconds * 1000 / len(messages), 4) if messages else 0.0,
+        },
+    })
 
 
 if __name__ == "__main__":
-    import os
     # Ensure the path is correct
     os.environ["PYTHONPATH"] = "."
+    warm_bots()
     app.run(host="0.0.0.0", port=5000, debug=True)
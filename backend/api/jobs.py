@@ -0,0 +1,240 @@
+# backend/api/jobs.py
+import os
+import json
+import time
+import uuid
+import socket
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.config.config_loader import load_config, resolve_config_names
+from backend.scraper.batch_runner import DomainGate, run_one
+
+# queued -> running -> success | blocked_by_robots | error
+ACTIVE = ("queued", "running")
+DB_PATH = "backend/data/jobs/jobs.sqlite3"  # Default; get_job_queue() reads MONAGENT_JOBS_DB first
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    config TEXT NOT NULL,
+    mode TEXT,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    result TEXT,
+    error TEXT,
+    owner TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_config_status ON jobs (config, status);
+"""
+
+
+class UnknownConfig(LookupError):
+    pass
+
+
+class JobQueue:
+    """
+    Scrape jobs persisted in SQLite and run on bounded thread pools:
+    - submit() returns at once with a job id; an identical config already queued or running is reused
+      (checked and inserted in one BEGIN IMMEDIATE transaction, so this holds across worker processes)
+    - static and dynamic configs get separate pools (dynamic ones hold a browser, keep them few)
+    - per-domain politeness is shared by all jobs (same DomainGate as batch runs)
+    - start() (once per serving process) re-queues jobs whose owning process died and runs queued jobs;
+      jobs are claimed atomically in the database, so several worker processes can share one queue
+    `on_finish(job)` is called after each job with its final state (e.g. to reload bot data).
+    """
+
+    def __init__(self, db_path=DB_PATH, static_workers: int = 4,
+                 dynamic_workers: int = 2, per_domain: int = 1, politeness_delay: float = 1.0,
+                 on_finish=None, keep_days: float = 7.0):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.on_finish = on_finish
+        self._gate = DomainGate(per_domain, politeness_delay)
+        self._lock = threading.Lock()
+        self._pools = {
+            "static": ThreadPoolExecutor(max_workers=max(1, static_workers), thread_name_prefix="job-static"),
+            "dynamic": ThreadPoolExecutor(max_workers=max(1, dynamic_workers), thread_name_prefix="job-dynamic"),
+        }
+        self._started_pid = None
+        with self._connect(immediate=True) as conn:
+            for statement in filter(str.strip, _SCHEMA.split(";")):
+                conn.execute(statement)
+            if "owner" not in {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}:
+                conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+            conn.execute("DELETE FROM jobs WHERE finished_at < ?", (time.time() - keep_days * 86400,))
+
+    @contextmanager
+    def _connect(self, immediate: bool = False):
+        """
+        One transaction on a fresh connection: committed on success, rolled back on error, always closed.
+        immediate=True takes the database write lock up front (read-then-write without races between processes).
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)  # Transactions are explicit
+        try:
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield conn
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _owner() -> str:
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    @staticmethod
+    def _owner_alive(owner) -> bool:
+        host, _, pid = (owner or "").rpartition(":")
+        if not pid.isdigit():
+            return False  # No owner recorded
+        if host != socket.gethostname():
+            return True  # Another host's job: not ours to judge
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def start(self):
+        """
+        Re-queue jobs whose process died mid-run and dispatch every queued job.
+        Call once in each serving process (after fork); later calls in the same process do nothing.
+        """
+        with self._lock:
+            if self._started_pid == os.getpid():
+                return
+            self._started_pid = os.getpid()
+        with self._connect(immediate=True) as conn:
+            for job_id, owner in conn.execute("SELECT id, owner FROM jobs WHERE status = 'running'").fetchall():
+                if not self._owner_alive(owner):
+                    logging.info(f"JobQueue: re-queueing interrupted job {job_id} (was {owner})")
+                    conn.execute("UPDATE jobs SET status = 'queued', started_at = NULL, owner = NULL "
+                                 "WHERE id = ? AND status = 'running'", (job_id,))
+            queued = conn.execute("SELECT id, config, mode FROM jobs WHERE status = 'queued' "
+                                  "ORDER BY created_at").fetchall()
+        for job_id, config, mode in queued:
+            self._dispatch(job_id, config, mode)
+
+    @staticmethod
+    def _mode(config_name: str) -> str:
+        if config_name not in resolve_config_names("*"):
+            raise UnknownConfig(f"Unknown config: {config_name}")
+        try:
+            return ((load_config(config_name) or {}).get("mode") or "static").lower()
+        except Exception:
+            return "static"  # Unreadable config: run_one reports the error in the job
+
+    def submit(self, config_name: str):
+        """
+        Queue a scrape of `config_name`.
+
+        Returns:
+            tuple: (job dict, True if an identical queued/running job was reused)
+        """
+        mode = self._mode(config_name)
+        # Check and insert under the database write lock: other threads and worker processes wait here
+        with self._connect(immediate=True) as conn:
+            row = conn.execute("SELECT id FROM jobs WHERE config = ? AND status IN (?, ?) "
+                               "ORDER BY created_at LIMIT 1", (config_name, *ACTIVE)).fetchone()
+            if row is None:
+                job_id = uuid.uuid4().hex
+                conn.execute("INSERT INTO jobs (id, config, mode, status, created_at) VALUES (?, ?, ?, 'queued', ?)",
+                             (job_id, config_name, mode, time.time()))
+        if row:
+            return self.get(row[0]), True
+        self._dispatch(job_id, config_name, mode)
+        return self.get(job_id), False
+
+    def _dispatch(self, job_id, config_name, mode):
+        pool = self._pools["dynamic" if mode == "dynamic" else "static"]
+        pool.submit(self._run, job_id, config_name)
+
+    def _run(self, job_id, config_name):
+        # Claim: only one process/thread moves a queued job to running
+        with self._connect() as conn:
+            claimed = conn.execute("UPDATE jobs SET status = 'running', started_at = ?, owner = ? "
+                                   "WHERE id = ? AND status = 'queued'",
+                                   (time.time(), self._owner(), job_id)).rowcount
+        if not claimed:
+            return
+        try:
+            result = run_one(config_name, self._gate)
+        except Exception as e:  # run_one already turns scrape failures into results
+            result = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ? WHERE id = ?",
+                         (result["status"], time.time(), json.dumps(result, ensure_ascii=False, default=str),
+                          result.get("error"), job_id))
+        logging.info(f"JobQueue: {config_name} job {job_id} -> {result['status']}")
+        if self.on_finish is not None:
+            try:
+                self.on_finish(self.get(job_id))
+            except Exception:
+                logging.exception(f"JobQueue: on_finish failed for job {job_id}")
+
+    def get(self, job_id: str):
+        """Job state with status, rows, row changes, output path, sample and timings (None if unknown)"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT id, config, mode, status, created_at, started_at, finished_at, result, error "
+                               "FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job_id, config, mode, status, created, started, finished, result, error = row
+        result = json.loads(result) if result else {}
+        now = time.time()
+        return {
+            "job_id": job_id,
+            "config": config,
+            "mode": mode,
+            "status": status,
+            "changed": result.get("changed"),
+            "changes": result.get("changes"),  # Added / modified / removed rows, see scraper/changeset.py
+            "rows": result.get("rows"),
+            "output": result.get("output"),
+            "sample": result.get("sample", []),
+            "error": error,
+            "timings": {
+                "created_at": created,
+                "started_at": started,
+                "finished_at": finished,
+                "queued_seconds": round((started or now) - created, 3),
+                "run_seconds": round((finished or now) - started, 3) if started else None,
+                "scrape_seconds": result.get("seconds"),
+            },
+        }
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop taking work: jobs not yet claimed stay queued in the database (the next start() runs them),
+        jobs already running finish when wait=True.
+        """
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue(**options) -> JobQueue:
+    """Process-wide job queue (options only apply on first call); the database path comes from MONAGENT_JOBS_DB"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            options.setdefault("db_path", os.environ.get("MONAGENT_JOBS_DB", DB_PATH))
+            _queue = JobQueue(**options)
+        return _queue
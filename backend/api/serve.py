@@ -0,0 +1,159 @@
+# backend/api/serve.py
+"""
+Production entry point for the MonAgent API (app.py's __main__ is the single-process debug server).
+
+Modes:
+    prefork   gunicorn master + N worker processes (gthread workers, `--threads` each). The app and the
+              default site's bot data are loaded once in the master before forking (when_ready), so
+              workers share them copy-on-write; background threads start in each worker after fork.
+    threaded  one process, one thread per connection (Werkzeug, no debugger / reloader). Fallback when
+              gunicorn is not installed (e.g. Windows); also what `--mode auto` picks then.
+
+Both stop gracefully on SIGTERM / SIGINT: in-flight requests and running scrape jobs finish,
+queued jobs stay in the job database for the next start.
+
+Usage:
+    pip install gunicorn
+    python -m backend.api.serve --workers 4 --threads 8 --port 5000
+    python -m backend.api.serve --mode threaded
+    # or gunicorn directly, with this module as its config:
+    gunicorn -c python:backend.api.serve backend.api.app:app
+
+Environment: MONAGENT_HOST, MONAGENT_PORT, WEB_CONCURRENCY (workers), MONAGENT_THREADS,
+MONAGENT_JOBS_DB (job database, default backend/data/jobs/jobs.sqlite3),
+MONAGENT_METRICS_DIR (where workers share metrics snapshots; default: a new temporary directory).
+"""
+import os
+import signal
+import argparse
+import threading
+import multiprocessing
+
+# ------------------ gunicorn settings (read by `gunicorn -c python:backend.api.serve`) ------------------ #
+
+bind = f"{os.environ.get('MONAGENT_HOST', '0.0.0.0')}:{os.environ.get('MONAGENT_PORT', '5000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", min(2 * multiprocessing.cpu_count() + 1, 8)))
+worker_class = "gthread"
+threads = int(os.environ.get("MONAGENT_THREADS", "4"))
+preload_app = True  # Import the app once, before forking (bot data: when_ready)
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+
+
+def when_ready(server):
+    # Runs in the master after the preloaded app import and before any worker is forked
+    from backend.api.app import warm_bots
+    share_metrics()
+    warm_bots()
+
+
+def share_metrics():
+    """
+    Point every worker's metrics at one directory, so /metrics sums all workers whichever one answers
+    (MONAGENT_METRICS_DIR, else a fresh temporary directory). Old snapshots there are from a previous run.
+    """
+    import tempfile
+    from pathlib import Path
+    from backend import metrics
+
+    path = metrics.shared_dir() or tempfile.mkdtemp(prefix="monagent-metrics-")
+    metrics.set_shared_dir(path)
+    for old in Path(path).glob("metrics-*.json"):
+        if old.name != f"metrics-{os.getpid()}.json":
+            old.unlink(missing_ok=True)
+
+
+def post_fork(server, worker):
+    from backend.api.app import start_background_services
+    start_background_services()
+
+
+def worker_exit(server, worker):
+    from backend.api.app import stop_background_services
+    stop_background_services(wait=True)
+
+
+# ------------------ runners ------------------ #
+
+def gunicorn_available() -> bool:
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def run_prefork(host, port, n_workers, n_threads):
+    from gunicorn.app.base import BaseApplication
+
+    options = {
+        "bind": f"{host}:{port}",
+        "workers": n_workers,
+        "worker_class": worker_class,
+        "threads": n_threads,
+        "preload_app": preload_app,
+        "timeout": timeout,
+        "graceful_timeout": graceful_timeout,
+        "keepalive": keepalive,
+        "when_ready": when_ready,
+        "post_fork": post_fork,
+        "worker_exit": worker_exit,
+    }
+
+    class Application(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from backend.api.app import app
+            return app
+
+    Application().run()
+
+
+def run_threaded(host, port):
+    from werkzeug.serving import make_server
+    from backend.api.app import app, start_background_services, stop_background_services, warm_bots
+
+    warm_bots()
+    server = make_server(host, port, app, threaded=True)
+    start_background_services()
+
+    def stop(signum, frame):
+        # shutdown() blocks until serve_forever() returns, so call it off the main thread
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    print(f"🚀 MonAgent API (threaded) on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        stop_background_services(wait=True)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--mode", choices=["auto", "prefork", "threaded"], default="auto")
+    ap.add_argument("--host", default=os.environ.get("MONAGENT_HOST", "0.0.0.0"))
+    ap.add_argument("--port", type=int, default=int(os.environ.get("MONAGENT_PORT", "5000")))
+    ap.add_argument("--workers", type=int, default=workers)
+    ap.add_argument("--threads", type=int, default=threads)
+    args = ap.parse_args(argv)
+
+    mode = args.mode
+    if mode == "auto":
+        mode = "prefork" if gunicorn_available() else "threaded"
+    if mode == "prefork":
+        if not gunicorn_available():
+            ap.error("--mode prefork needs gunicorn: pip install gunicorn")
+        run_prefork(args.host, args.port, args.workers, args.threads)
+    else:
+        run_threaded(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,106 +1,230 @@
 # backend/bot/bot_core.py
-import re
-from backend.bot.data_loader import load_business_data
+import os
+import sys
+import logging
+import threading
+from collections import Counter
+from backend.bot.knowledge_store import build_store_from_records, read_records, record_from_row
+from backend.scraper.changeset import apply_changes, file_version, load_changes
 from backend.bot.intent_classifier import IntentClassifier  
+from backend.bot.reply_cache import ReplyCache, get_reply_cache
+from backend.bot.retrieval import RetrievalIndex, snippet
+from backend import metrics
+
+# Intents answered straight from the store's precomputed replies
+STATIC_INTENTS = ("address", "phone", "email", "about", "join", "review", "pricing")
+
+FALLBACK = "I didn't quite understand your question. I can answer questions about: address, pricing, membership plans, reviews, and service summaries!"
+
 
 class ChatBot:
 
-    def __init__(self, csv_path="backend/data/processed/clubinject_scottsdale.csv"):
+    def __init__(self, csv_path="backend/data/processed/clubinject_scottsdale.csv", reply_cache=None):
         self.csv_path = csv_path
-        self.data = load_business_data(csv_path)
+        self._signature = self._file_signature()
+        # Immutable, indexed view of the CSV. Replaced as a whole by reload(): readers take one
+        # reference per message, so they see either the old or the new snapshot, never a mix.
+        # The rows it was built from are kept so a scrape's changeset can be applied instead of a full read
+        self.store, self._records = self._load()
         self.intent = IntentClassifier()
+        # Finished replies keyed by (data version, normalized message); pass reply_cache=False to disable
+        self.reply_cache = get_reply_cache() if reply_cache is None else (reply_cache or None)
+        # BM25 index over store.documents for unknown intents, built on the first fallback (see _search_index)
+        self._index = None
+        self._index_lock = threading.Lock()
+
+        self._reload_lock = threading.Lock()
+        self._reload_pending = False
+        self._reload_thread = None
+        self._watch_stop = None
+
+    # ------------------ Data Snapshot Reload ------------------ #
+
+    def _file_signature(self):
+        try:
+            st = os.stat(self.csv_path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def reload(self, wait: bool = False):
+        """
+        Rebuild the store from the CSV in a background thread and swap it in when it is ready.
+        Requests arriving while a rebuild runs are coalesced into one more rebuild.
+        With wait=True, block until the rebuild (if any) has finished.
+        """
+        with self._reload_lock:
+            self._reload_pending = True
+            if self._reload_thread is None or not self._reload_thread.is_alive():
+                self._reload_thread = threading.Thread(target=self._reload_worker, name="bot-reload", daemon=True)
+                self._reload_thread.start()
+            thread = self._reload_thread
+        if wait:
+            thread.join()
+
+    def _reload_worker(self):
+        while True:
+            with self._reload_lock:
+                if not self._reload_pending:
+                    return
+                self._reload_pending = False
+            signature = self._file_signature()
+            try:
+                # The last scrape's row changeset on top of the current snapshot, else the whole file
+                snapshot = self._apply_changes() or self._load()
+            except Exception:
+                # Keep answering from the previous snapshot (e.g. the CSV is missing or unreadable)
+                logging.exception(f"ChatBot reload failed for {self.csv_path}")
+                continue
+            self._signature = signature
+            store, self._records = snapshot
+            if store.version != self.store.version:
+                self.store = store  # Single reference assignment: atomic for readers
+                logging.info(f"ChatBot data reloaded from {self.csv_path} (version {store.version})")
+                if self._index is not None:
+                    self._search_index(store)  # Rebuild here rather than in the next fallback request
+
+    def _load(self):
+        version, records = read_records(self.csv_path)
+        return build_store_from_records(records, str(self.csv_path), version), records
+
+    def _apply_changes(self):
+        """
+        (store, records) for the CSV on disk from the served rows plus the changeset written next to it,
+        or None when that changeset does not lead from the served version to the file's current one
+        """
+        changes = load_changes(self.csv_path)
+        if not changes or not changes.get("base_version") or changes["base_version"] != self.store.version:
+            return None
+        if changes.get("version") != file_version(self.csv_path):
+            return None  # The CSV changed again since (or was rewritten by something else)
+        try:
+            records = apply_changes(self._records, changes, convert=record_from_row)
+        except (ValueError, KeyError, TypeError):
+            return None
+        counts = changes.get("counts", {})
+        logging.info(f"ChatBot applying changeset to {self.csv_path}: {counts}")
+        return build_store_from_records(records, str(self.csv_path), changes["version"]), records
+
+    def is_stale(self) -> bool:
+        """True when the CSV's mtime/size differ from the snapshot being served"""
+        return self._file_signature() != self._signature
+
+    def watch(self, interval: float = 2.0):
+        """Poll the CSV's mtime/size and reload() when it changes (e.g. a scrape from the CLI rewrote it)"""
+        if self._watch_stop is not None:
+            return
+        self._watch_stop = stop = threading.Event()
+
+        def poll():
+            while not stop.wait(interval):
+                if self.is_stale():
+                    self.reload(wait=True)
+
+        threading.Thread(target=poll, name="bot-watch", daemon=True).start()
+
+    def stop_watching(self):
+        if self._watch_stop is not None:
+            self._watch_stop.set()
+            self._watch_stop = None
+
+    def approx_bytes(self) -> int:
+        """Store plus the kept records (estimated from a sample), for registry memory budgets"""
+        records = self._records
+        sample = records[:: max(1, len(records) // 100)]
+        per_record = sum(sys.getsizeof(r) + sum(sys.getsizeof(v) for v in r) for r in sample) / max(1, len(sample))
+        size = self.store.approx_bytes() + sys.getsizeof(records) + int(per_record * len(records))
+        index = self._index
+        return size + (index.approx_bytes() if index is not None else 0)
+
+    @property
+    def data(self):
+        """Legacy dict view (see knowledge_store.KnowledgeStore.as_dict)"""
+        return self.store.as_dict()
 
     # ------------------ Main Chat Function ------------------ #
     def chat(self, message: str) -> str:
-        intent = self.intent.classify(message)
-
-        # Address
-        if intent == "address":
-            return self._answer_address()
-
-        # Phone
-        if intent == "phone":
-            return self._answer_phone()
-
-        # Email
-        if intent == "email":
-            return self._answer_email()
-
-        # About
-        if intent == "about":
-            return self._answer_about()
-
-        # Membership
-        if intent == "join":
-            return self._answer_join()
-
-        # Reviews
-        if intent == "review":
-            return self._answer_reviews()
-
+        store = self.store  # One snapshot for the whole reply
+        cache = self.reply_cache
+        answer = None
+        if cache is not None:
+            key = (store.version, ReplyCache.normalize(message))
+            answer = cache.get(key)  # (intent, reply)
+
+        if answer is None:
+            # Intent and the first number in the message, from one scan
+            intent, units = self.intent.match(message)
+            answer = self._answer(store, intent, units, message)
+            if cache is not None:
+                cache.put(key, answer)
+        metrics.inc("monagent_chat_intent_total", intent=answer[0])
+        return answer[1]
+
+    def chat_many(self, messages) -> list:
+        """
+        Replies for a list of messages, in order. The batch is answered from a single data snapshot,
+        cached replies are reused and the remaining distinct messages are classified once.
+        """
+        store = self.store
+        cache = self.reply_cache
+        keys = [(store.version, ReplyCache.normalize(m)) for m in messages]
+        answers = dict.fromkeys(keys)  # key -> (intent, reply)
+        if cache is not None:
+            for key in answers:
+                answers[key] = cache.get(key)
+
+        missing = [m for m, key in zip(messages, keys) if answers[key] is None]
+        for message, (intent, units) in zip(missing, self.intent.match_many(missing)):
+            key = (store.version, ReplyCache.normalize(message))
+            if answers[key] is None:
+                answers[key] = self._answer(store, intent, units, message)
+                if cache is not None:
+                    cache.put(key, answers[key])
+
+        results = [answers[key] for key in keys]
+        if metrics.enabled():
+            for intent, n in Counter(intent for intent, _ in results).items():
+                metrics.inc("monagent_chat_intent_total", n, intent=intent)
+        return [reply for _, reply in results]
+
+    def _answer(self, store, intent, units, message) -> tuple:
+        """(intent, reply); an unknown message answered from the site's own text has intent "retrieval"."""
+        if intent == "unknown":
+            hits = self._search_index(store).search(message, k=1)
+            if hits:
+                return "retrieval", f"Here's what I found on our site:\n{snippet(hits[0][0])}"
+        return intent, self._reply(store, intent, units)
+
+    def _search_index(self, store) -> RetrievalIndex:
+        """
+        The retrieval index of a store snapshot, built once per data version. A rebuild starts from the
+        previous index, so only documents that changed since are tokenized again.
+        """
+        index = self._index
+        if index is not None and index.version == store.version:
+            return index
+        with self._index_lock:
+            index = self._index
+            if index is None or index.version != store.version:
+                index = RetrievalIndex(store.documents, store.version, previous=index)
+                if store is self.store:  # A reader still on an older snapshot does not replace the current index
+                    self._index = index
+        return index
+
+    def _reply(self, store, intent, units) -> str:
         # Units price
-        if intent == "unit_price":
-            import re
-            m = re.search(r"(\d+)", message)
-            if m:
-                units = int(m.group(1))
-                return self._answer_unit_price(units)
+        if intent == "unit_price" and units is not None:
+            return store.price_answer(units)
 
-        # Botox / Dysport pricing
-        if intent == "pricing":
-            return self._answer_service_summary()
+        # Address / phone / email / about / membership / reviews / Botox-Dysport pricing
+        if intent in STATIC_INTENTS:
+            return store.answer(intent)
 
         # Unknown → fallback
-        return "I didn't quite understand your question. I can answer questions about: address, pricing, membership plans, reviews, and service summaries!"
+        return FALLBACK
 
 
     # ------------------ Response Builders ------------------ #
 
-    def _answer_address(self):
-        addr = self.data.get("address")
-        if addr:
-            return f"Our address is: {addr}"
-        return "Address information is currently unavailable."
-
-    def _answer_phone(self):
-        phone = self.data.get("phone")
-        if phone:
-            return f"Our phone number is: {phone}"
-        return "Phone information is currently unavailable."
-
-    def _answer_email(self):
-        email = self.data.get("email")
-        if email:
-            return f"You can email us at: {email}"
-        return "Email information is currently unavailable."
-
-    def _answer_about(self):
-        about = self.data.get("about")
-        if about:
-            return f"About us:\n{about}"
-        return "No 'About us' information found."
-
-    def _answer_join(self):
-        join = self.data.get("join_info")
-        if join:
-            return f"Membership plan info:\n{join}"
-        return "Membership plan information is unavailable."
-
-    def _answer_reviews(self):
-        reviews = self.data.get("testimonials", [])
-        if not reviews:
-            return "No review information available."
-        joined = "\n\n".join(reviews[:3])  # Return first three entries
-        return f"Here are some customer reviews:\n{joined}"
-
     def _answer_unit_price(self, units):
-        for s in self.data.get("services", []):
-            if s["units"] == units:
-                return f"The price for {units} units is: ${s['price']}"
-        return f"Could not find pricing for {units} units."
-
-    def _answer_service_summary(self):
-        summary = self.data.get("pricing_summary")
-        if summary:
-            return f"Botox / Dysport pricing summary:\n{summary}"
-        return "Botox / Dysport pricing information is unavailable."
+        return self.store.price_answer(units)
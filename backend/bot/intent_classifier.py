@@ -1,41 +1,79 @@
 import re
 
-class IntentClassifier:
+# Intents in priority order: when a message contains keywords of several intents, the first one wins.
+# Keywords are plain substrings of the lower-cased message (English and Chinese alike).
+INTENT_KEYWORDS = (
+    ("address", ("address", "在哪", "location", "where")),
+    ("phone", ("phone", "電話")),
+    ("email", ("email", "mail")),
+    ("about", ("about", "你們是誰", "介紹", "who are you")),
+    ("join", ("member", "membership", "加入", "會員")),
+    ("review", ("review", "評論", "評價")),
+    ("unit_price", None),  # "<number> unit(s)", see _UNITS
+    ("pricing", ("botox", "dysport", "價格", "price")),
+)
 
-    def classify(self, message: str) -> str:
-        msg = message.lower().strip()
+_UNITS = re.compile(r"\d+\s*units?")
+_NUMBER = re.compile(r"\d+")
 
-        # Address
-        if any(k in msg for k in ["address", "在哪", "location", "where"]):
-            return "address"
 
-        # Phone
-        if any(k in msg for k in ["phone", "電話"]):
-            return "phone"
+def _compile(rules):
+    """
+    Flatten the rules into one (keyword, intent) table in priority order, built once at import.
+    Keywords that contain an earlier keyword (e.g. "membership" after "member", "email" after
+    "mail") can never decide the result, so they are dropped. `None` marks the unit-count regex.
+    """
+    table, seen = [], []
+    for intent, keywords in rules:
+        if keywords is None:
+            table.append((None, intent))
+            continue
+        for k in sorted(keywords, key=len):
+            if not any(s in k for s in seen):
+                seen.append(k)
+                table.append((k, intent))
+    return tuple(table)
 
-        # Email
-        if "email" in msg or "mail" in msg:
-            return "email"
 
-        # About Us
-        if any(k in msg for k in ["about", "你們是誰", "介紹", "who are you"]):
-            return "about"
+_TABLE = _compile(INTENT_KEYWORDS)
 
-        # Membership
-        if any(k in msg for k in ["member", "membership", "加入", "會員"]):
-            return "join"
 
-        # Reviews
-        if any(k in msg for k in ["review", "評論", "評價"]):
-            return "review"
+class IntentClassifier:
+
+    def match(self, message: str):
+        """
+        Classify a message, returning the unit count for unit-price questions from the same call.
 
-        # Units price
-        unit_match = re.search(r"(\d+)\s*units?", msg)
-        if unit_match:
-            return "unit_price"
+        Substring tests run in C and stop at the first hit; on short chat messages this beats a
+        combined regex or a pure-Python automaton, which must visit every position.
+
+        Returns:
+            tuple: (intent, units) where units is the first number in the message for "unit_price", else None.
+        """
+        msg = message.lower().strip()
+        for keyword, intent in _TABLE:
+            if keyword is None:
+                m = _UNITS.search(msg)
+                if m:
+                    # First number in the message (it ends no later than the matched "<n> units")
+                    return intent, int(_NUMBER.search(msg, 0, m.end()).group())
+            elif keyword in msg:
+                return intent, None
+        return "unknown", None
+
+    def classify(self, message: str) -> str:
+        return self.match(message)[0]
 
-        # General pricing (botox/dysport)
-        if any(k in msg for k in ["botox", "dysport", "價格", "price"]):
-            return "pricing"
+    def match_many(self, messages) -> list:
+        """match() for a list of messages, in order; repeated messages in a batch are matched once"""
+        done = {}
+        results = []
+        for message in messages:
+            result = done.get(message)
+            if result is None:
+                result = done[message] = self.match(message)
+            results.append(result)
+        return results
 
-        return "unknown"
+    def classify_many(self, messages) -> list:
+        return [intent for intent, _ in self.match_many(messages)]
@@ -0,0 +1,217 @@
+# backend/bot/knowledge_store.py
+import io
+import csv
+import sys
+import hashlib
+from dataclasses import dataclass, field
+from operator import itemgetter
+from types import MappingProxyType
+
+# Columns of the scraper's general row schema that the bot reads (others are never parsed)
+COLUMNS = ("type", "content", "units", "price", "member_fee_month", "phone", "email", "address",
+           "link_text", "link_url")
+
+# Row types whose content is searchable text (the retrieval fallback's documents)
+DOC_TYPES = ("about", "generic", "testimonial", "join_info", "pricing_summary")
+
+# Replies for intents whose data is missing from the CSV
+MISSING = {
+    "address": "Address information is currently unavailable.",
+    "phone": "Phone information is currently unavailable.",
+    "email": "Email information is currently unavailable.",
+    "about": "No 'About us' information found.",
+    "join": "Membership plan information is unavailable.",
+    "review": "No review information available.",
+    "pricing": "Botox / Dysport pricing information is unavailable.",
+}
+
+# Cells pandas.read_csv reads as missing (the bot's CSVs were read with pandas before), treated as missing here too
+NA_VALUES = frozenset({"", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+                       "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"})
+
+_EMPTY = MappingProxyType({})
+
+
+@dataclass(frozen=True)
+class KnowledgeStore:
+    """
+    Everything the ChatBot answers from, built once per CSV and never mutated:
+    - prices: unit count (int) -> price, so unit-price questions are a dict lookup
+    - answers: intent -> finished reply string for the static intents
+    - version: content hash of the source CSV (changes whenever the data does)
+    - documents: distinct content of the text rows (DOC_TYPES), in file order, for the retrieval fallback
+    """
+
+    source: str = None
+    version: str = ""
+    address: str = None
+    phone: str = None
+    email: str = None
+    about: str = None
+    join_info: str = None
+    pricing_summary: str = None
+    member_fee_month: float = None
+    testimonials: tuple = ()
+    links: tuple = ()  # ((text, url), ...)
+    documents: tuple = ()
+    prices: MappingProxyType = field(default_factory=lambda: _EMPTY)
+    answers: MappingProxyType = field(default_factory=lambda: _EMPTY)
+
+    def answer(self, intent: str):
+        """Precomputed reply for a static intent (None for intents that need the message)"""
+        return self.answers.get(intent)
+
+    def price_answer(self, units: int) -> str:
+        price = self.prices.get(units)
+        if price is None:
+            return f"Could not find pricing for {units} units."
+        return f"The price for {units} units is: ${price}"
+
+    def approx_bytes(self) -> int:
+        """Rough memory footprint (strings, index and replies), used for registry memory budgets"""
+        size = sys.getsizeof(self)
+        for value in (self.address, self.phone, self.email, self.about, self.join_info, self.pricing_summary):
+            size += sys.getsizeof(value) if value else 0
+        size += sum(sys.getsizeof(t) for t in self.testimonials)
+        size += sum(sys.getsizeof(t or "") + sys.getsizeof(u or "") + 64 for t, u in self.links)
+        size += sys.getsizeof(dict(self.prices)) + 64 * len(self.prices)
+        size += sum(sys.getsizeof(a) for a in self.answers.values())
+        size += sys.getsizeof(self.documents) + sum(sys.getsizeof(d) for d in self.documents)
+        return size
+
+    def as_dict(self) -> dict:
+        """The legacy load_business_data() layout"""
+        return {
+            "services": [{"units": u, "price": p, "member_fee_month": self.member_fee_month}
+                         for u, p in self.prices.items()],
+            "about": self.about,
+            "join_info": self.join_info,
+            "pricing_summary": self.pricing_summary,
+            "testimonials": list(self.testimonials),
+            "links": [{"text": t, "url": u} for t, u in self.links],
+            "address": self.address,
+            "phone": self.phone,
+            "email": self.email,
+        }
+
+
+def _build_answers(address, phone, email, about, join_info, pricing_summary, testimonials) -> dict:
+    answers = dict(MISSING)
+    if address:
+        answers["address"] = f"Our address is: {address}"
+    if phone:
+        answers["phone"] = f"Our phone number is: {phone}"
+    if email:
+        answers["email"] = f"You can email us at: {email}"
+    if about:
+        answers["about"] = f"About us:\n{about}"
+    if join_info:
+        answers["join"] = f"Membership plan info:\n{join_info}"
+    if testimonials:
+        joined = "\n\n".join(testimonials[:3])  # Return first three entries
+        answers["review"] = f"Here are some customer reviews:\n{joined}"
+    if pricing_summary:
+        answers["pricing"] = f"Botox / Dysport pricing summary:\n{pricing_summary}"
+    return answers
+
+
+def _make_store(source, version, prices, address, phone, email, member_fee_month, about, join_info, pricing_summary,
+                testimonials, links, documents=()) -> KnowledgeStore:
+    return KnowledgeStore(
+        source=source,
+        version=version,
+        address=address,
+        phone=phone,
+        email=email,
+        about=about,
+        join_info=join_info,
+        pricing_summary=pricing_summary,
+        member_fee_month=member_fee_month,
+        testimonials=tuple(testimonials),
+        links=tuple(links),
+        documents=tuple(dict.fromkeys(documents)),  # Repeated text (e.g. the same block on two pages) once
+        prices=MappingProxyType(prices),
+        answers=MappingProxyType(_build_answers(address, phone, email, about, join_info, pricing_summary,
+                                                tuple(testimonials))),
+    )
+
+
+def load_store(csv_path) -> KnowledgeStore:
+    """Read a scraper CSV once and build its KnowledgeStore (csv module, only the bot's columns are kept)"""
+    version, records = read_records(csv_path)
+    return build_store_from_records(records, source=str(csv_path), version=version)
+
+
+# ------------------ Records (plain tuples, no DataFrame) ------------------ #
+
+def _text(value):
+    return None if value in NA_VALUES else value
+
+
+def _number(value):
+    if value in NA_VALUES:
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return None if number != number else number  # NaN
+
+
+def record_from_row(row: dict) -> tuple:
+    """A scraper row (e.g. from a changeset) as a record: COLUMNS values as the CSV holds them"""
+    return tuple("" if row.get(name) is None else str(row.get(name)) for name in COLUMNS)
+
+
+def read_records(csv_path) -> tuple:
+    """(version, records): the CSV's content hash and one tuple of COLUMNS strings per row, in file order"""
+    with open(csv_path, "rb") as f:
+        raw = f.read()
+    version = hashlib.sha256(raw).hexdigest()[:16]
+    reader = csv.reader(io.StringIO(raw.decode("utf-8-sig")))
+    header = next(reader, [])
+    positions = {name: i for i, name in enumerate(header)}
+    picks = [positions.get(name, len(header)) for name in COLUMNS]  # Missing columns read a padding cell
+    pick = itemgetter(*picks)
+    need = max(picks) + 1
+    records = []
+    for row in reader:
+        if len(row) < need:
+            if not row:
+                continue  # Blank line
+            row = row + [""] * (need - len(row))
+        records.append(pick(row))
+    return version, records
+
+
+def build_store_from_records(records, source: str = None, version: str = "") -> KnowledgeStore:
+    """The store for a CSV's records, in one pass"""
+    prices = {}
+    first = {"address": None, "phone": None, "email": None, "member_fee_month": None}
+    last = {"about": None, "join_info": None, "pricing_summary": None}
+    testimonials, links, documents = [], [], []
+    doc_types = frozenset(DOC_TYPES)
+    for kind, content, units, price, fee, phone, email, address, link_text, link_url in records:
+        if kind in doc_types and _text(content) is not None:
+            documents.append(content)
+        if kind == "service":
+            u, p = _number(units), _number(price)
+            if u is not None and p is not None and u.is_integer() and int(u) not in prices:
+                prices[int(u)] = p
+            for name, value in (("address", address), ("phone", phone), ("email", email)):
+                if first[name] is None:
+                    first[name] = _text(value)
+            if first["member_fee_month"] is None and _text(fee) is not None:
+                number = _number(fee)
+                first["member_fee_month"] = fee if number is None else number
+        elif kind == "testimonial":
+            if _text(content) is not None:
+                testimonials.append(content)
+        elif kind == "link":
+            links.append((_text(link_text), _text(link_url)))
+        elif kind in last:
+            if _text(content) is not None:
+                last[kind] = content
+    return _make_store(source, version, prices, first["address"], first["phone"], first["email"],
+                       first["member_fee_month"], last["about"], last["join_info"], last["pricing_summary"],
+                       testimonials, links, documents)
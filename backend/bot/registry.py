@@ -0,0 +1,174 @@
+# backend/bot/registry.py
+import os
+import re
+import logging
+import threading
+from collections import OrderedDict
+
+from backend.bot.bot_core import ChatBot
+from backend.config.config_loader import load_config
+
+DEFAULT_SITE = "clubinject_scottsdale"
+
+# Site ids are config file stems; anything else (paths, "..") is rejected before touching the filesystem
+_SITE_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+
+
+class UnknownSite(LookupError):
+    """No usable config / scraped data for the requested site"""
+
+
+class BotRegistry:
+    """
+    Per-site ChatBots for one process, keyed by config name (backend/config/<site>.yml):
+    - a bot is built lazily on the first question for its site, from the config's storage.path CSV
+    - loaded bots live in an LRU; the least recently used ones are dropped once the bots' estimated
+      size exceeds `max_bytes` (or there are more than `max_sites`)
+    - one watcher thread (watch()) reloads every loaded bot whose CSV changed on disk
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, max_sites: int = None):
+        self.max_bytes = max_bytes
+        self.max_sites = max_sites
+        self._bots = OrderedDict()  # site -> (ChatBot, approx bytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._loading = {}  # site -> lock, so concurrent first requests build one bot
+        self._watch_stop = None
+
+    @staticmethod
+    def check_site(site) -> str:
+        """A well-formed site id (a config file stem), or UnknownSite; never touches the filesystem"""
+        if not isinstance(site, str) or not _SITE_RE.match(site):
+            raise UnknownSite(f"Invalid site id: {site!r}")
+        return site
+
+    @classmethod
+    def csv_path(cls, site: str) -> str:
+        """The bot's data file: storage.path of the site's config (must be CSV output)"""
+        cls.check_site(site)
+        try:
+            config = load_config(site)
+        except FileNotFoundError:
+            raise UnknownSite(f"Unknown site: {site}") from None
+        if not config:
+            raise UnknownSite(f"Site {site} has an empty config")
+        storage = config.get("storage") or {}
+        if (storage.get("type") or "csv").lower() != "csv":
+            raise UnknownSite(f"Site {site} does not write CSV output")
+        path = storage.get("path", "output.csv")
+        if not os.path.exists(path):
+            raise UnknownSite(f"No scraped data for site {site} yet ({path})")
+        return path
+
+    def get(self, site: str = DEFAULT_SITE) -> ChatBot:
+        self.check_site(site)
+        with self._lock:
+            entry = self._bots.get(site)
+            if entry is not None:
+                self._bots.move_to_end(site)
+                return entry[0]
+        # Unknown sites fail here, before a loading lock exists for them
+        path = self.csv_path(site)
+
+        with self._lock:
+            loading = self._loading.setdefault(site, threading.Lock())
+        try:
+            with loading:
+                with self._lock:
+                    entry = self._bots.get(site)
+                    if entry is not None:
+                        self._bots.move_to_end(site)
+                        return entry[0]
+                bot = ChatBot(path)
+                size = bot.approx_bytes()
+                with self._lock:
+                    self._bots[site] = (bot, size)
+                    self._bytes += size
+                    self._evict()
+                logging.info(f"BotRegistry: loaded {site} (~{size // 1024} KB, {len(self._bots)} sites)")
+                return bot
+        finally:
+            # Loaded or failed, the lock is only needed while a load is in flight
+            with self._lock:
+                if self._loading.get(site) is loading:
+                    del self._loading[site]
+
+    def _evict(self):
+        # Never evict the most recently used entry (the one just requested)
+        while len(self._bots) > 1 and (
+            self._bytes > self.max_bytes or (self.max_sites and len(self._bots) > self.max_sites)
+        ):
+            site, (bot, size) = self._bots.popitem(last=False)
+            self._bytes -= size
+            bot.stop_watching()
+            logging.info(f"BotRegistry: evicted {site}")
+
+    def chat(self, message: str, site: str = DEFAULT_SITE) -> str:
+        return self.get(site).chat(message)
+
+    def chat_many(self, messages, site: str = DEFAULT_SITE) -> list:
+        return self.get(site).chat_many(messages)
+
+    def loaded(self, site: str):
+        """The site's bot if it is loaded, without loading it"""
+        with self._lock:
+            entry = self._bots.get(site)
+        return entry[0] if entry else None
+
+    def reload(self, site: str):
+        """Background reload of a loaded site (no-op when it is not loaded: the next get() reads fresh data)"""
+        bot = self.loaded(site)
+        if bot is not None:
+            bot.reload()
+
+    def refresh_sizes(self):
+        """Re-measure stores after reloads and evict if the budget is now exceeded"""
+        with self._lock:
+            self._bytes = 0
+            for site, (bot, _) in list(self._bots.items()):
+                size = bot.approx_bytes()
+                self._bots[site] = (bot, size)
+                self._bytes += size
+            self._evict()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"sites": list(self._bots), "loaded": len(self._bots), "approx_bytes": self._bytes,
+                    "max_bytes": self.max_bytes, "max_sites": self.max_sites}
+
+    def watch(self, interval: float = 2.0):
+        """One polling thread for all loaded bots: reload those whose CSV changed"""
+        if self._watch_stop is not None:
+            return
+        self._watch_stop = stop = threading.Event()
+
+        def poll():
+            while not stop.wait(interval):
+                with self._lock:
+                    bots = [bot for bot, _ in self._bots.values()]
+                stale = [bot for bot in bots if bot.is_stale()]
+                for bot in stale:
+                    bot.reload(wait=True)
+                if stale:
+                    self.refresh_sizes()
+
+        threading.Thread(target=poll, name="bot-registry-watch", daemon=True).start()
+
+    def stop_watching(self):
+        if self._watch_stop is not None:
+            self._watch_stop.set()
+            self._watch_stop = None
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_bot_registry() -> BotRegistry:
+    """Process-wide registry; the memory budget comes from BOT_REGISTRY_MAX_MB (default 256)"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = BotRegistry(max_bytes=int(os.environ.get("BOT_REGISTRY_MAX_MB", "256")) * 1024 * 1024)
+        return _registry
@@ -0,0 +1,82 @@
+# backend/bot/reply_cache.py
+import os
+import time
+import threading
+from collections import OrderedDict
+
+
+class ReplyCache:
+    """
+    Bounded LRU + TTL cache of finished replies (values are whatever the bot stores, e.g. (intent, reply)).
+
+    Keys are (data version, normalized message): a reloaded CSV has a new version, so old replies
+    are simply never asked for again and age out of the LRU. Shared by every ChatBot in the process.
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl: float = 600.0):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, reply)
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expired = 0
+
+    @staticmethod
+    def normalize(message: str) -> str:
+        """Same normalisation the intent classifier applies, so equal keys always get equal replies"""
+        return message.lower().strip()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= now:
+                del self._data[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, reply):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, reply)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expired": self.expired,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_reply_cache() -> ReplyCache:
+    """Process-wide reply cache; size and TTL come from REPLY_CACHE_SIZE / REPLY_CACHE_TTL"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ReplyCache(max_entries=int(os.environ.get("REPLY_CACHE_SIZE", "4096")),
+                                ttl=float(os.environ.get("REPLY_CACHE_TTL", "600")))
+        return _cache
@@ -0,0 +1,118 @@
+# backend/bot/retrieval.py
+"""
+BM25 search over the site's scraped text, for messages no intent matches.
+
+The documents are the content of the store's text rows (about, generic, testimonial, membership and
+pricing text; see knowledge_store.DOC_TYPES). The index is an inverted index in CSR layout:
+
+    terms      term -> term id
+    offsets    postings of term t are [offsets[t], offsets[t + 1])
+    doc_ids    document of each posting
+    weights    BM25 weight of each posting (idf × saturated, length-normalized term frequency)
+
+so scoring a query is a gather of its terms' postings plus one np.bincount, and top-k an argpartition.
+Weights are computed when the index is built, once per data version; a rebuild after a reload
+re-tokenizes only the documents the previous index did not have.
+
+numpy is imported when the first index is built: chat paths that never fall back do not load it.
+"""
+import re
+from collections import Counter
+
+# BM25 parameters (the usual defaults)
+K1 = 1.5
+B = 0.75
+MIN_SCORE = 0.5  # Below this a "hit" only shares words that most documents contain
+SNIPPET_CHARS = 400
+
+# Lower-cased words and numbers; CJK characters are one token each
+_TOKEN = re.compile(r"[a-z0-9]+|[\u4e00-\u9fff]")
+STOPWORDS = frozenset("""
+a an and are as at be by can do does for from have how i if in is it me my of on or our so that the this
+to us was we what when which who why will with you your
+""".split())
+
+
+def tokenize(text: str) -> list:
+    return [t for t in _TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def snippet(text: str, limit: int = SNIPPET_CHARS) -> str:
+    """A document as a reply passage: whitespace collapsed, cut at a word boundary"""
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0] + "…"
+
+
+class RetrievalIndex:
+    """
+    Immutable BM25 index over a tuple of documents (strings):
+        index = RetrievalIndex(store.documents, store.version, previous=old_index)
+        index.search("do you do lip flips", k=3)   # [(document, score), ...], best first
+    """
+
+    def __init__(self, documents, version: str = "", previous: "RetrievalIndex" = None):
+        import numpy as np
+
+        self.documents = tuple(documents)
+        self.version = version
+        # Term counts per document text, reused by the next build for the documents that did not change
+        cache = previous._counts if previous is not None else {}
+        self._counts = {}
+        self.reused = 0
+        for doc in self.documents:
+            counts = cache.get(doc)
+            if counts is None:
+                counts = Counter(tokenize(doc))
+            else:
+                self.reused += 1
+            self._counts[doc] = counts
+
+        self.terms = {}
+        term_ids, doc_ids, tfs = [], [], []
+        lengths = np.zeros(len(self.documents))
+        for d, doc in enumerate(self.documents):
+            counts = self._counts[doc]
+            lengths[d] = sum(counts.values())
+            for term, tf in counts.items():
+                term_ids.append(self.terms.setdefault(term, len(self.terms)))
+                doc_ids.append(d)
+                tfs.append(tf)
+
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        order = np.argsort(term_ids, kind="stable")
+        df = np.bincount(term_ids, minlength=len(self.terms))
+        self.offsets = np.concatenate(([0], np.cumsum(df)))
+        self.doc_ids = np.asarray(doc_ids, dtype=np.int64)[order]
+
+        n = len(self.documents)
+        idf = np.log1p((n - df + 0.5) / (df + 0.5))
+        tf = np.asarray(tfs, dtype=np.float64)[order]
+        norm = K1 * (1 - B + B * lengths[self.doc_ids] / max(lengths.mean() if n else 0.0, 1.0))
+        self.weights = idf[term_ids[order]] * tf * (K1 + 1) / (tf + norm)
+
+    def __len__(self):
+        return len(self.documents)
+
+    def search(self, query: str, k: int = 3, min_score: float = MIN_SCORE) -> list:
+        """Top-k (document, score) pairs for a query, best first: documents sharing a term, scores >= min_score"""
+        import numpy as np
+
+        ids = {self.terms[t] for t in tokenize(query) if t in self.terms}
+        if not ids:
+            return []
+        spans = [slice(self.offsets[t], self.offsets[t + 1]) for t in ids]
+        docs = np.concatenate([self.doc_ids[s] for s in spans])
+        weights = np.concatenate([self.weights[s] for s in spans])
+        scores = np.bincount(docs, weights=weights, minlength=len(self.documents))
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.documents[d], float(scores[d])) for d in top if scores[d] > 0 and scores[d] >= min_score]
+
+    def approx_bytes(self) -> int:
+        """Postings arrays plus the vocabulary and cached term counts (rough), for registry memory budgets"""
+        size = self.offsets.nbytes + self.doc_ids.nbytes + self.weights.nbytes
+        size += 100 * len(self.terms) + 100 * sum(len(c) for c in self._counts.values())
+        return size
@@ -2,14 +2,33 @@
 import yaml
 from pathlib import Path
 
+CONFIG_DIR = Path(__file__).parent
+
 def load_config(config_name: str) -> dict:
     """
     Load config/*.yml configuration file and return it as a Python dictionary
     """
-    config_path = Path(__file__).parent / f"{config_name}.yml"
+    config_path = CONFIG_DIR / f"{config_name}.yml"
     if not config_path.exists():
         raise FileNotFoundError(f"Configuration file {config_name}.yml does not exist")
 
     with open(config_path, "r", encoding="utf-8") as f:
         config = yaml.safe_load(f)
     return config
+
+def resolve_config_names(specs) -> list:
+    """
+    Expand config names, glob patterns ("*", "clubinject_*") and *.yml paths into config names.
+    Order is preserved and duplicates are dropped; unknown plain names are kept so they fail loudly later.
+    """
+    if isinstance(specs, str):
+        specs = [specs]
+
+    names = []
+    for spec in specs:
+        stem = Path(spec).stem if spec.endswith(".yml") else spec
+        if any(ch in stem for ch in "*?["):
+            names.extend(sorted(p.stem for p in CONFIG_DIR.glob(f"{stem}.yml")))
+        else:
+            names.append(stem)
+    return list(dict.fromkeys(names))
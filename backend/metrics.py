@@ -0,0 +1,359 @@
+# backend/metrics.py
+"""
+In-process metrics: timing spans, histograms and counters, rendered in the Prometheus text format
+by the API's /metrics route.
+
+    with metrics.span("fetch", site="book_toscrape", record=self.spans) as s:
+        r = client.get(url)
+        s.add(bytes=len(r.content), retries=r.retries)
+
+Set MONAGENT_METRICS=0 to disable: span() then returns a shared no-op object and observe() / inc()
+return immediately, so instrumented code pays one flag check per call.
+
+Each process records into its own registry. Under a preforking server, set a shared directory
+(MONAGENT_METRICS_DIR, or set_shared_dir(); serve.py does this in the gunicorn master): every process then
+writes a snapshot of its registry to <dir>/metrics-<pid>.json about once a second and at exit, and render()
+sums the snapshots of all processes, so /metrics shows the same totals whichever worker answers it
+(at most FLUSH_INTERVAL behind). Snapshots of exited workers stay in the sum, so counters never go back.
+"""
+import os
+import json
+import time
+import atexit
+import threading
+from bisect import bisect_left
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+FLUSH_INTERVAL = 1.0  # Seconds between snapshots of this process's registry in the shared directory
+
+_enabled = os.environ.get("MONAGENT_METRICS", "1").lower() not in ("0", "false", "off", "no")
+_shared_dir = os.environ.get("MONAGENT_METRICS_DIR") or None
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(flag: bool):
+    global _enabled
+    _enabled = bool(flag)
+
+
+def shared_dir():
+    return _shared_dir
+
+
+def set_shared_dir(path):
+    """Aggregate metrics of all processes through snapshots in `path` (None: this process only)"""
+    global _shared_dir
+    _shared_dir = str(path) if path else None
+    if _shared_dir:
+        Path(_shared_dir).mkdir(parents=True, exist_ok=True)
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    items = key + extra
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+class _Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.series = {}  # label key -> [bucket counts..., +Inf count], sum
+
+    def observe(self, key, value):
+        entry = self.series.get(key)
+        if entry is None:
+            entry = self.series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    def dump(self) -> dict:
+        return {"buckets": list(self.buckets), "series": [[list(k), v] for k, v in self.series.items()]}
+
+    def merge(self, data: dict):
+        if tuple(data.get("buckets", ())) != self.buckets:
+            return  # Declared with other buckets by a different code version: not addable
+        for key, (counts, total) in data["series"]:
+            entry = self.series.setdefault(tuple(map(tuple, key)), [[0] * (len(self.buckets) + 1), 0.0])
+            entry[0] = [a + b for a, b in zip(entry[0], counts)]
+            entry[1] += total
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for key, (counts, total) in sorted(self.series.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                yield f"{self.name}_bucket{_format_labels(key, (('le', repr(float(bound))),))} {cumulative}"
+            cumulative += counts[-1]
+            yield f"{self.name}_bucket{_format_labels(key, (('le', '+Inf'),))} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(key)} {total}"
+            yield f"{self.name}_count{_format_labels(key)} {cumulative}"
+
+
+class _Counter:
+    kind = "counter"
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.series = {}
+
+    def inc(self, key, amount):
+        self.series[key] = self.series.get(key, 0) + amount
+
+    def dump(self) -> dict:
+        return {"series": [[list(k), v] for k, v in self.series.items()]}
+
+    def merge(self, data: dict):
+        for key, value in data["series"]:
+            self.inc(tuple(map(tuple, key)), value)
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for key, value in sorted(self.series.items()):
+            yield f"{self.name}{_format_labels(key)} {value}"
+
+
+# Metric names and help texts, declared once
+_DECLARED = {
+    "monagent_scrape_phase_seconds": (_Histogram, "Time spent per scrape phase"),
+    "monagent_scrape_phase_errors_total": (_Counter, "Scrape phases that raised"),
+    "monagent_scrape_bytes_total": (_Counter, "Bytes fetched / written per scrape phase"),
+    "monagent_scrape_rows_total": (_Counter, "Rows produced per scrape phase"),
+    "monagent_scrape_retries_total": (_Counter, "Retries per scrape phase"),
+    "monagent_chat_seconds": (_Histogram, "Chat request latency per endpoint"),
+    "monagent_chat_messages_total": (_Counter, "Chat messages answered per endpoint"),
+    "monagent_chat_intent_total": (_Counter, "Classified chat messages per intent"),
+}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._changes = 0  # Bumped on every update; a snapshot is only rewritten when it moved
+        self._flushed = 0
+
+    def _get(self, name):
+        metric = self._metrics.get(name)
+        if metric is None:
+            cls, help_text = _DECLARED.get(name, (_Counter if name.endswith("_total") else _Histogram, name))
+            metric = self._metrics[name] = cls(name, help_text)
+        return metric
+
+    def observe(self, name, value, labels):
+        with self._lock:
+            self._get(name).observe(_label_key(labels), value)
+            self._changes += 1
+
+    def inc(self, name, amount, labels):
+        with self._lock:
+            self._get(name).inc(_label_key(labels), amount)
+            self._changes += 1
+
+    def render(self) -> str:
+        """Prometheus text format; with a shared directory, the sum over every process's snapshot"""
+        if _shared_dir:
+            self.flush()
+            merged = MetricsRegistry()
+            for path in sorted(Path(_shared_dir).glob("metrics-*.json")):
+                try:
+                    merged.merge(json.loads(path.read_text(encoding="utf-8")))
+                except (OSError, ValueError):
+                    continue  # Being replaced or unreadable: the next scrape picks it up
+            return merged._render_own()
+        return self._render_own()
+
+    def _render_own(self) -> str:
+        with self._lock:
+            lines = [line for _, metric in sorted(self._metrics.items()) for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {name: metric.dump() for name, metric in self._metrics.items()}
+
+    def merge(self, snapshot: dict):
+        with self._lock:
+            for name, data in snapshot.items():
+                self._get(name).merge(data)
+
+    def flush(self):
+        """Write this process's snapshot to the shared directory if anything changed since the last write"""
+        if not _shared_dir or self._changes == self._flushed:
+            return
+        changes = self._changes
+        path = Path(_shared_dir) / f"metrics-{os.getpid()}.json"
+        tmp = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(self.snapshot()), encoding="utf-8")
+        os.replace(tmp, path)
+        self._flushed = changes
+
+    def clear(self):
+        with self._lock:
+            self._metrics.clear()
+            self._changes += 1
+
+
+_registry = MetricsRegistry()
+_flusher_pid = None
+_flusher_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    return _registry
+
+
+def _ensure_flusher():
+    """Start this process's snapshot thread (once per process: threads do not survive fork)"""
+    global _flusher_pid
+    if _flusher_pid == os.getpid():
+        return
+    with _flusher_lock:
+        if _flusher_pid == os.getpid():
+            return
+        _flusher_pid = os.getpid()
+
+    def run():
+        while True:
+            time.sleep(FLUSH_INTERVAL)
+            try:
+                _registry.flush()
+            except OSError:
+                pass
+
+    threading.Thread(target=run, name="metrics-flush", daemon=True).start()
+
+
+def _after_fork_in_child():
+    # The child starts from empty numbers: the parent's are in the parent's own snapshot
+    global _registry, _flusher_pid, _flusher_lock
+    _registry = MetricsRegistry()
+    _flusher_pid = None
+    _flusher_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+@atexit.register
+def _flush_at_exit():
+    try:
+        _registry.flush()
+    except OSError:
+        pass
+
+
+def observe(name: str, value: float, **labels):
+    if _enabled:
+        if _shared_dir:
+            _ensure_flusher()
+        _registry.observe(name, value, labels)
+
+
+def inc(name: str, amount: float = 1, **labels):
+    if _enabled:
+        if _shared_dir:
+            _ensure_flusher()
+        _registry.inc(name, amount, labels)
+
+
+def record_phase(phase: str, seconds: float, record=None, bytes: int = 0, rows: int = 0, retries: int = 0,
+                 error: bool = False, **labels) -> Optional[dict]:
+    """
+    Record one finished scrape phase (for code that measured it itself, e.g. generator stages).
+    Returns the span as a dict (also appended to `record`), or None when metrics are disabled.
+    """
+    if not _enabled:
+        return None
+    if _shared_dir:
+        _ensure_flusher()
+    labels["phase"] = phase
+    with _registry._lock:
+        _registry._changes += 1
+        key = _label_key(labels)
+        _registry._get("monagent_scrape_phase_seconds").observe(key, seconds)
+        if bytes:
+            _registry._get("monagent_scrape_bytes_total").inc(key, bytes)
+        if rows:
+            _registry._get("monagent_scrape_rows_total").inc(key, rows)
+        if retries:
+            _registry._get("monagent_scrape_retries_total").inc(key, retries)
+        if error:
+            _registry._get("monagent_scrape_phase_errors_total").inc(key, 1)
+    entry = {**labels, "seconds": round(seconds, 6), "bytes": bytes, "rows": rows, "retries": retries,
+             "error": error}
+    if record is not None:
+        record.append(entry)  # list.append is atomic: concurrent crawl threads may share one list
+    return entry
+
+
+class Span:
+    """Times a `with` block as one scrape phase; add() attaches bytes / rows / retries"""
+
+    __slots__ = ("phase", "labels", "record", "start", "bytes", "rows", "retries")
+
+    def __init__(self, phase, labels, record):
+        self.phase = phase
+        self.labels = labels
+        self.record = record
+        self.bytes = self.rows = self.retries = 0
+
+    def add(self, bytes: int = 0, rows: int = 0, retries: int = 0):
+        self.bytes += bytes
+        self.rows += rows
+        self.retries += retries
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record_phase(self.phase, time.perf_counter() - self.start, self.record, self.bytes, self.rows, self.retries,
+                     exc_type is not None, **self.labels)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def add(self, bytes: int = 0, rows: int = 0, retries: int = 0):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(phase: str, record=None, **labels):
+    """Context manager timing one scrape phase; `record` (a list) also receives the span as a dict"""
+    if not _enabled:
+        return _NOOP_SPAN
+    return Span(phase, labels, record)
@@ -1,15 +1,15 @@
 # backend/scraper/base_scraper.py
-import re, time, requests
-from bs4 import BeautifulSoup
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlsplit, urljoin
 from pathlib import Path
 from backend.scraper.utils import clean_url, is_allowed_by_robots
-
-# Default User-Agent string for HTTP requests
-DEFAULT_UA = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-    "(KHTML, like Gecko) Chrome/121.0 Safari/537.36"
-)
+from backend.scraper.http_client import get_http_client
+from backend.scraper.page_cache import get_page_cache, parse_fingerprint
+from backend.scraper.extractors import get_extractor
+from backend.scraper.html_parser import PageDocument
+from backend.scraper.sinks import make_sink, file_size
+from backend.scraper.changeset import make_tracker
+from backend import metrics
 
 class BaseScraper:
     def __init__(self, config: dict):
@@ -23,9 +23,44 @@ class BaseScraper:
         self.url = config.get("target_url")  # Target URL for scraping
         self.strip_query_params = config.get("strip_query_params", True)  # Whether to remove query parameters from the URL
         self.parse_mode = config.get("parse_mode", "generic")  # Parsing mode (e.g., generic, clubinject_units)
+        self.selectors = config.get("selectors") or {}  # Generic mode: field name -> "css selector[@attr]"
+        # Fields read from href / src attributes: resolved against the page URL, like pagination links
+        self.url_fields = [name for name, spec in self.selectors.items()
+                           if spec.partition("@")[2] in ("href", "src")]
+        self.item_selector = config.get("item")  # Generic mode: one record per matching element (optional)
+        self.pagination = config.get("pagination") or {}  # Generic mode: next / links / url_template, max_pages
         self.storage = config.get("storage", {})  # Storage settings for saving data
+        self.http = config.get("http", {}) or {}  # Optional fetch settings: timeout, retries, min_interval
+        self.use_cache = config.get("page_cache", True)  # Skip parsing when the page has not changed
+        self.parse_key = parse_fingerprint(config, type(self).__module__)  # Config + code the last output came from
+        self.changeset = config.get("changeset") or {}  # Row keys / enabled for the per-run changeset
+        self.changes = None  # Added / modified / removed row counts of the last save()
+        self.status = None  # "updated" or "unchanged" after run()
+        self.unchanged = False  # Set by fetch_page() on HTTP 304 or identical content
+        self.extractor = get_extractor(config)  # Compiled field rules (config `extract` block over defaults)
+        self.parser = config.get("parser", "auto")  # HTML parser backend: auto | selectolax | lxml | html.parser
+        self.crawl_stats = {}  # Pages fetched / failed by the last crawl
+        self.spans = []  # Timed phases of the last run (robots, fetch, parse, sink_write), see backend.metrics
         print(f"🕷️ Initializing scraper: {self.site_name} ({self.url})")
 
+    def _client(self, url):
+        """Shared HTTP client (keep-alive pools, compression, retries) with this site's politeness interval"""
+        client = get_http_client()
+        if "min_interval" in self.http:
+            # Per-site politeness interval (replaces the old fixed sleep after each request)
+            client.limiter.set_interval(urlsplit(url).netloc.lower(), self.http["min_interval"])
+        return client
+
+    @staticmethod
+    def _response_text(r):
+        """requests assumes ISO-8859-1 for text/* without a charset; prefer UTF-8 when the body decodes as such"""
+        if "charset" not in r.headers.get("Content-Type", "").lower():
+            try:
+                return r.content.decode("utf-8")
+            except UnicodeDecodeError:
+                pass
+        return r.text
+
     def fetch_page(self):
         """
         Fetch the HTML content of the target webpage.
@@ -35,18 +70,38 @@ class BaseScraper:
 
         Raises:
             PermissionError: If the URL is blocked by robots.txt.
-            requests.RequestException: If the HTTP request fails.
+            requests.RequestException: If the HTTP request fails after all retries.
         """
         u = clean_url(self.url, self.strip_query_params)  # Clean the URL by removing query parameters
-        if not is_allowed_by_robots(u):
+        with metrics.span("robots", self.spans, site=self.site_name):
+            allowed = is_allowed_by_robots(u)
+        if not allowed:
             raise PermissionError(f"Blocked by robots.txt: {u}")
 
-        headers = {"User-Agent": DEFAULT_UA}  # Set the User-Agent header
+        client = self._client(u)
+        cache = get_page_cache()
+        headers = cache.conditional_headers(u) if self.use_cache else {}  # If-None-Match / If-Modified-Since
+
         print(f"🔍 GET {u}")
-        r = requests.get(u, headers=headers, timeout=15)  # Send the HTTP GET request
+        with metrics.span("fetch", self.spans, site=self.site_name) as span:
+            r = client.get(u, headers=headers, timeout=self.http.get("timeout"), retries=self.http.get("retries"))
+            span.add(bytes=len(r.content), retries=getattr(r, "retries", 0))
+            if r.status_code == 304:
+                cached = cache.cached_body(u)
+                if cached is not None:
+                    cache.touch(u)
+                    self.unchanged = True
+                    return cached
+                # Cached body vanished: fetch unconditionally
+                r = client.get(u, timeout=self.http.get("timeout"), retries=self.http.get("retries"))
+                span.add(bytes=len(r.content), retries=getattr(r, "retries", 0))
         r.raise_for_status()  # Raise an exception for HTTP errors
-        time.sleep(1.2)  # Polite delay to avoid overloading the server
-        return r.text
+
+        html = self._response_text(r)
+        # page_cache: false neither reads nor writes the cache
+        self.unchanged = self.use_cache and not cache.store(u, html, r.headers.get("ETag"),
+                                                             r.headers.get("Last-Modified"))
+        return html
 
     def parse_page(self, html):
         """
@@ -58,9 +113,113 @@ class BaseScraper:
         Returns:
             list: A list of extracted data entries.
         """
-        if self.parse_mode == "clubinject_units":
-            return self._parse_clubinject_units(html)  # Use the specific parsing method for clubinject_units
-        return []
+        with metrics.span("parse", self.spans, site=self.site_name) as span:
+            if self.parse_mode == "clubinject_units":
+                rows = self._parse_clubinject_units(html)  # Use the specific parsing method for clubinject_units
+            elif self.selectors:
+                rows = self._parse_selectors(html)[0]  # Generic CSS-selector extraction from the config
+            else:
+                rows = []
+            span.add(rows=len(rows))
+        return rows
+
+    def _parse_selectors(self, html, page_url=None):
+        """
+        Extract records with the config's `selectors` block and find further listing pages.
+
+        Parameters:
+            html (str): The HTML content of the page.
+            page_url (str): URL the page was fetched from (relative links and @href / @src fields are resolved against it).
+
+        Returns:
+            tuple: (list of records, list of absolute URLs of further pages to crawl)
+        """
+        doc = PageDocument(html, self.parser)
+        records = doc.select_records(self.selectors, self.item_selector)
+
+        page_url = page_url or clean_url(self.url, self.strip_query_params)
+        for record in records:
+            for name in self.url_fields:
+                if record.get(name):
+                    record[name] = urljoin(page_url, record[name])
+        next_urls = []
+        for key in ("next", "links"):  # "next" link and/or numbered page links
+            spec = self.pagination.get(key)
+            if spec:
+                selector = spec if "@" in spec else f"{spec}@href"
+                next_urls += [urljoin(page_url, href) for href in doc.select_values(selector) if href]
+        return records, next_urls
+
+    def _fetch_url(self, url):
+        """Plain GET for crawled listing pages (robots-checked, rate limited, no page cache)"""
+        with metrics.span("robots", self.spans, site=self.site_name):
+            allowed = is_allowed_by_robots(url)
+        if not allowed:
+            raise PermissionError(f"Blocked by robots.txt: {url}")
+        with metrics.span("fetch", self.spans, site=self.site_name) as span:
+            r = self._client(url).get(url, timeout=self.http.get("timeout"), retries=self.http.get("retries"))
+            span.add(bytes=len(r.content), retries=getattr(r, "retries", 0))
+        r.raise_for_status()
+        return self._response_text(r)
+
+    def iter_records(self):
+        """
+        Crawl listing pages concurrently and yield records as each page is parsed.
+
+        Pages come from `pagination.url_template` ("...page-{page}.html", pages 1..max_pages, all known up front)
+        and/or are discovered through the `next` / `links` selectors. At most `pagination.concurrency` pages are
+        in flight; the shared per-host rate limiter still decides how fast requests actually go out.
+
+        Yields:
+            dict: One record per item, in page-completion order.
+        """
+        start = clean_url(self.url, self.strip_query_params)
+        max_pages = int(self.pagination.get("max_pages", 50))
+        concurrency = max(1, int(self.pagination.get("concurrency", 4)))
+
+        template = self.pagination.get("url_template")
+        seeds = [start] + ([urljoin(start, template.format(page=p)) for p in range(2, max_pages + 1)] if template else [])
+        queue = list(dict.fromkeys(seeds))[:max_pages]
+        seen = set(queue)
+        self.crawl_stats = {"pages": 0, "failed": 0, "records": 0}
+
+        def fetch_and_parse(url):
+            html = self._fetch_url(url)
+            with metrics.span("parse", self.spans, site=self.site_name) as span:
+                records, next_urls = self._parse_selectors(html, url)
+                span.add(rows=len(records))
+            return records, next_urls
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="crawl") as pool:
+            running = {}
+            while queue or running:
+                while queue and len(running) < concurrency:
+                    url = queue.pop(0)
+                    running[pool.submit(fetch_and_parse, url)] = url
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = running.pop(future)
+                    try:
+                        records, next_urls = future.result()
+                    except PermissionError:
+                        if url == start:
+                            raise
+                        self.crawl_stats["failed"] += 1
+                        continue
+                    except Exception as e:
+                        if url == start:
+                            raise
+                        print(f"⚠️ Failed to crawl {url}: {e}")
+                        self.crawl_stats["failed"] += 1
+                        continue
+                    self.crawl_stats["pages"] += 1
+                    self.crawl_stats["records"] += len(records)
+                    for nu in next_urls:
+                        nu = clean_url(nu, self.strip_query_params)
+                        if nu not in seen and len(seen) < max_pages:
+                            seen.add(nu)
+                            queue.append(nu)
+                    yield from records
 
     def _parse_clubinject_units(self, html):
         """
@@ -72,44 +231,23 @@ class BaseScraper:
         Returns:
             list: A list of dictionaries containing extracted data.
         """
-        soup = BeautifulSoup(html, "html.parser")  # Parse the HTML using BeautifulSoup
-        text = soup.get_text("\n", strip=True)  # Extract all text content from the HTML
-
-        # Extract units and prices (e.g., "20 Units $150.80")
-        unit_price = []
-        for m in re.finditer(r"(\d+)\s*Units?\s*\$([0-9]+(?:\.[0-9]{2})?)", text, flags=re.I):
-            unit_count = int(m.group(1))
-            price = float(m.group(2))
-            unit_price.append({"units": unit_count, "price": price})
-
-        # Extract membership fee (e.g., "$9.72/month")
-        member_fee = None
-        mm = re.search(r"\$([0-9]+(?:\.[0-9]{2})?)\s*/\s*month", text, flags=re.I)
-        if mm:
-            member_fee = float(mm.group(1))
-
-        # Extract contact information (phone, email, address)
-        phone = None
-        ph = re.search(r"\(\d{3}\)\s*\d{3}-\d{4}", text)
-        if ph: phone = ph.group(0)
-
-        email = None
-        em = re.search(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", text)
-        if em: email = em.group(0)
-
-        address = None
-        for line in text.splitlines():
-            if "Scottsdale" in line and ("AZ" in line or "Arizona" in line):
-                address = line.strip()
-                break
+        text = PageDocument(html, self.parser).text()  # Extract all text content with the configured parser
+
+        # Units/prices (e.g. "20 Units $150.80"), membership fee (e.g. "$9.72/month"), phone, email, address
+        fields = self.extractor.extract(text)
+        unit_price = fields.get("unit_price") or []
+        member_fee = fields.get("member_fee")
+        phone = fields.get("phone")
+        email = fields.get("email")
+        address = fields.get("address")
 
         # Combine extracted data into a structured list
         rows = []
-        for up in unit_price:
+        for units, price in unit_price:
             rows.append({
                 "location": "Scottsdale",
-                "units": up["units"],
-                "price": up["price"],
+                "units": units,
+                "price": price,
                 "member_fee_month": member_fee,
                 "phone": phone,
                 "email": email,
@@ -118,31 +256,59 @@ class BaseScraper:
             })
         return rows
 
-    def save_to_csv(self, data):
+    def save(self, data):
         """
-        Save the extracted data to a CSV file.
+        Stream the extracted data into the sink configured by `storage` (csv, jsonl, parquet, sqlite).
 
         Parameters:
-            data (list): The data to save.
+            data (iterable): Records to save; a generator is consumed incrementally.
 
         Returns:
-            tuple: The file path and the DataFrame object.
+            SinkResult: The file path, record count and the first records as a sample.
         """
-        path = Path(self.storage.get("path", "output.csv"))  # Get the file path from the configuration
-        df = pd.DataFrame(data)  # Convert the data to a pandas DataFrame
-        path.parent.mkdir(parents=True, exist_ok=True)  # Create the directory if it doesn't exist
-        df.to_csv(path, index=False, encoding="utf-8-sig")  # Save the DataFrame to a CSV file
-        return path, df
+        sink = make_sink(self.storage, sample_size=4)
+        tracker = make_tracker(self.changeset, sink.path)  # Diff against the previous run's rows
+        result = sink.write(tracker.track(data) if tracker else data)
+        if tracker:
+            self.changes = tracker.commit()
+        # The sink's own time only: a streamed input spends the rest fetching / parsing
+        metrics.record_phase("sink_write", sink.write_seconds, self.spans, bytes=file_size(result.path),
+                             rows=result.count, site=self.site_name)
+        return result
+
+    # Kept for callers of the previous API; the sink decides the actual format
+    save_to_csv = save
 
     def run(self):
         """
         Execute the full scraping process: fetch, parse, and save data.
+        If the page is unchanged since the last run, parsing and saving are skipped.
 
         Returns:
             tuple: The number of records, file path, and a sample of the data.
         """
+        self.spans = []
+        if self.selectors and self.pagination and self.parse_mode != "clubinject_units":
+            # Multi-page listing crawl: records stream from the crawler straight into the sink
+            result = self.save(self.iter_records())
+            self.status = "updated"
+            print(f"✅ {self.site_name} crawl completed: {self.crawl_stats}")
+            return result.count, result.path, result.sample
+
         html = self.fetch_page()  # Fetch the HTML content
+        u = clean_url(self.url, self.strip_query_params)
+        out = str(Path(self.storage.get("path", "output.csv")))
+        if self.unchanged:
+            previous = get_page_cache().unchanged_result(u, out, self.parse_key)
+            if previous is not None:
+                self.status = "unchanged"
+                print(f"⏭️ {self.site_name} unchanged since last run, skipping parse.")
+                return previous[0], out, previous[1]
+
         data = self.parse_page(html)  # Parse the HTML content
-        path, df = self.save_to_csv(data)  # Save the parsed data to a CSV file
-        print(f"✅ {self.site_name} scraping completed, total {len(data)} records.")
-        return len(data), str(path), df.head(4).to_dict(orient="records")
\ No newline at end of file
+        result = self.save(data)  # Save the parsed data with the configured sink
+        if self.use_cache:
+            get_page_cache().record_output(u, result.path, result.count, result.sample, self.parse_key)
+        self.status = "updated"
+        print(f"✅ {self.site_name} scraping completed, total {result.count} records.")
+        return result.count, result.path, result.sample
@@ -0,0 +1,110 @@
+# backend/scraper/batch_runner.py
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from backend.config.config_loader import load_config, resolve_config_names
+from backend.scraper.run_scraper import build_scraper
+
+
+class DomainGate:
+    """
+    Per-domain politeness: at most `max_concurrent` scrapes per netloc at once,
+    and consecutive scrapes of the same netloc start at least `delay` seconds apart.
+    """
+
+    def __init__(self, max_concurrent: int = 1, delay: float = 1.0):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._next_start = {}
+
+    @contextmanager
+    def enter(self, url: str):
+        domain = urlsplit(url or "").netloc.lower()
+        with self._lock:
+            slots = self._slots.setdefault(domain, threading.BoundedSemaphore(self.max_concurrent))
+        with slots:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(domain, now))
+                self._next_start[domain] = start + self.delay
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+
+def run_one(config_name: str, gate: DomainGate) -> dict:
+    """Run one config, turning every failure into a result entry instead of an exception"""
+    result = {"config": config_name, "site_name": None, "mode": None, "status": "success", "changed": None,
+              "changes": None, "rows": 0, "output": None, "sample": [], "seconds": 0.0, "error": None}
+    start = time.perf_counter()
+    try:
+        config = load_config(config_name)
+        result["site_name"] = config.get("site_name")
+        result["mode"] = config.get("mode", "static").lower()
+        with gate.enter(config.get("target_url")):
+            scraper = build_scraper(config)
+            rows, out_path, sample = scraper.run()
+        result.update(rows=rows, output=out_path, sample=sample, changed=scraper.status != "unchanged",
+                      changes=scraper.changes)
+    except PermissionError as e:
+        result.update(status="blocked_by_robots", error=str(e))
+    except Exception as e:
+        logging.exception(f"Batch scrape failed for {config_name}")
+        result.update(status="error", error=f"{type(e).__name__}: {e}")
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def run_batch(configs, static_workers: int = 8, dynamic_workers: int = 2,
+              per_domain: int = 1, politeness_delay: float = 1.0) -> dict:
+    """
+    Scrape many configs concurrently and return a single report.
+
+    Parameters:
+        configs (str | list): Config names, globs (e.g. "*" or "clubinject_*") or paths to .yml files.
+        static_workers (int): Thread pool size for static (requests) configs.
+        dynamic_workers (int): Concurrent dynamic configs; keep it <= browser_pool.size.
+        per_domain (int): Max concurrent scrapes against the same domain.
+        politeness_delay (float): Minimum seconds between scrape starts on the same domain.
+
+    Returns:
+        dict: Per-site results (in input order) plus batch totals and timing.
+    """
+    names = resolve_config_names(configs)
+    gate = DomainGate(per_domain, politeness_delay)
+
+    # Route configs by mode without failing the batch on unreadable files (those fail in run_one)
+    dynamic, static = [], []
+    for name in names:
+        try:
+            mode = load_config(name).get("mode", "static").lower()
+        except Exception:
+            mode = "static"
+        (dynamic if mode == "dynamic" else static).append(name)
+
+    start = time.perf_counter()
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, static_workers), thread_name_prefix="scrape-static") as static_pool, \
+         ThreadPoolExecutor(max_workers=max(1, dynamic_workers), thread_name_prefix="scrape-dynamic") as dynamic_pool:
+        futures = {static_pool.submit(run_one, n, gate): n for n in static}
+        futures.update({dynamic_pool.submit(run_one, n, gate): n for n in dynamic})
+        for future in as_completed(futures):
+            res = future.result()
+            results[futures[future]] = res
+            logging.info(f"Batch: {res['config']} -> {res['status']} ({res['seconds']}s)")
+
+    sites = [results[n] for n in names]
+    return {
+        "configs": len(sites),
+        "succeeded": sum(r["status"] == "success" for r in sites),
+        "failed": sum(r["status"] != "success" for r in sites),
+        "unchanged": sum(r["changed"] is False for r in sites),
+        "seconds": round(time.perf_counter() - start, 3),
+        "sites": sites,
+    }
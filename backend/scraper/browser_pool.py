@@ -0,0 +1,246 @@
+# backend/scraper/browser_pool.py
+import atexit
+import logging
+import queue
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+
+
+@lru_cache(maxsize=None)
+def resolve_chromedriver_path() -> str:
+    """Resolve the chromedriver binary once per process (webdriver_manager hits the network / disk cache)"""
+    from webdriver_manager.chrome import ChromeDriverManager
+    path = ChromeDriverManager().install()
+    logging.info(f"Resolved chromedriver: {path}")
+    return path
+
+
+@lru_cache(maxsize=None)
+def resolve_chrome_binary():
+    """In WSL, it might be google-chrome or chromium-browser"""
+    for candidate in ("/usr/bin/google-chrome", "/usr/bin/chromium-browser", "/usr/bin/chromium"):
+        if Path(candidate).exists():
+            return candidate
+    return None
+
+
+def _free_port() -> int:
+    """Ask the OS for an unused port so concurrent browsers never share a debugging port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class _PooledDriver:
+    __slots__ = ("driver", "pages")
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+
+class BrowserPool:
+    """
+    Size-bounded pool of warm headless browsers:
+    - At most `size` drivers exist at once (idle, borrowed or launching, warm() included);
+      callers block in acquire() until one is free
+    - A driver is recycled after `max_pages` pages, or immediately if it stops responding
+    - acquire() is a context manager, so the driver always goes back to the pool (or is quit) on error
+    """
+
+    def __init__(self, browser: str = "chrome", size: int = 2, max_pages: int = 50,
+                 headless: bool = True, acquire_timeout: float = 300):
+        if browser == "edge":
+            # Placeholder for future implementation if Edge support is needed
+            raise NotImplementedError("Edge browser support is reserved for future use.")
+        if browser != "chrome":
+            raise ValueError(f"Unsupported browser type: {browser}")
+
+        self.browser = browser
+        self.size = max(1, int(size))
+        self.max_pages = max(1, int(max_pages))
+        self.headless = headless
+        self.acquire_timeout = acquire_timeout
+
+        self._idle = queue.LifoQueue()  # Most recently used first: it is the warmest
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._live = set()
+        self._launching = 0  # Reserved by _reserve(), counted against `size` until the launch ends
+        self._closed = False
+
+    # ------------------ launch / quit ------------------ #
+
+    def _reserve(self) -> bool:
+        """Claim room for one more driver; False when live + launching drivers already fill the pool"""
+        with self._lock:
+            if len(self._live) + self._launching >= self.size:
+                return False
+            self._launching += 1
+            return True
+
+    def _launch(self):
+        """Start a driver in a slot taken with _reserve()"""
+        try:
+            driver = self._new_driver()
+        except BaseException:
+            with self._lock:
+                self._launching -= 1
+            raise
+        entry = _PooledDriver(driver)
+        with self._lock:
+            self._launching -= 1
+            self._live.add(entry)
+        logging.info(f"BrowserPool: launched {self.browser} ({len(self._live)}/{self.size} live)")
+        return entry
+
+    def _new_driver(self):
+        options = ChromeOptions()
+        if self.headless:
+            options.add_argument("--headless=new")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--window-size=1920,1080")
+        options.add_argument(f"--remote-debugging-port={_free_port()}")
+
+        binary = resolve_chrome_binary()
+        if binary:
+            options.binary_location = binary
+
+        service = ChromeService(resolve_chromedriver_path())
+        return webdriver.Chrome(service=service, options=options)
+
+    def _quit(self, entry):
+        with self._lock:
+            self._live.discard(entry)
+        try:
+            entry.driver.quit()
+        except Exception as e:
+            logging.warning(f"BrowserPool: error while quitting driver: {e}")
+
+    @staticmethod
+    def _is_alive(entry) -> bool:
+        """Cheap round-trip to the driver; fails if Chrome crashed or the session is gone"""
+        try:
+            entry.driver.delete_all_cookies()
+            entry.driver.get("about:blank")
+            return True
+        except Exception:
+            return False
+
+    # ------------------ public API ------------------ #
+
+    def warm(self, count=None):
+        """
+        Pre-launch up to `count` drivers (defaults to the pool size) so the first scrapes skip startup.
+        Drivers that already exist count: the pool never grows past `size`.
+        """
+        count = self.size if count is None else min(count, self.size)
+        launched = 0
+        while launched < count and self._reserve():
+            self._idle.put(self._launch())
+            launched += 1
+        return launched
+
+    def _take(self, deadline: float):
+        """An idle driver, a new one if there is room, else wait for one to come back"""
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            if self._reserve():
+                return self._launch()
+            # The pool is full of drivers being warmed or released: wait for one to turn idle
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"No browser available within {self.acquire_timeout}s")
+            try:
+                return self._idle.get(timeout=min(0.5, remaining))
+            except queue.Empty:
+                continue
+
+    @contextmanager
+    def acquire(self):
+        """Borrow a driver; it is returned to the pool or recycled even if the caller raises"""
+        if self._closed:
+            raise RuntimeError("BrowserPool is closed")
+        deadline = time.monotonic() + self.acquire_timeout
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise TimeoutError(f"No browser available within {self.acquire_timeout}s")
+
+        entry = None
+        failed = False
+        try:
+            entry = self._take(deadline)
+            yield entry.driver
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            try:
+                if entry is not None:
+                    entry.pages += 1
+                    self._release(entry, failed)
+            finally:
+                self._slots.release()
+
+    def _release(self, entry, failed: bool):
+        if self._closed:
+            self._quit(entry)
+        elif entry.pages >= self.max_pages:
+            logging.info(f"BrowserPool: recycling driver after {entry.pages} pages")
+            self._quit(entry)
+        elif not self._is_alive(entry):
+            logging.warning(f"BrowserPool: driver unresponsive (failed={failed}), recycling")
+            self._quit(entry)
+        else:
+            self._idle.put(entry)
+
+    def close(self):
+        """Quit every idle driver; drivers still in use are quit when released"""
+        self._closed = True
+        while True:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(entry)
+
+
+# ------------------ shared pools ------------------ #
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_browser_pool(browser: str = "chrome", **options) -> BrowserPool:
+    """
+    Return the process-wide pool for a browser type, creating it on first use.
+    Sizing options only apply when the pool is first created.
+    """
+    browser = (browser or "chrome").lower()
+    with _pools_lock:
+        pool = _pools.get(browser)
+        if pool is None or pool._closed:
+            pool = BrowserPool(browser=browser, **options)
+            _pools[browser] = pool
+        return pool
+
+
+@atexit.register
+def shutdown_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,228 @@
+# backend/scraper/changeset.py
+"""
+Row-level change detection between scrape runs.
+
+Every output row gets a stable identity (its key) and a content hash. While a run streams rows into
+its sink, a ChangeTracker compares them with the previous run's keys and hashes; once the sink has
+replaced the output, it writes a changeset next to it:
+
+    backend/data/processed/clubinject_scottsdale.csv
+    backend/data/processed/clubinject_scottsdale.changes.json
+        {"base_version": ..., "version": ..., "rows": 74, "order_changed": false, "counts": {...},
+         "added": [{"key", "index", "row"}], "modified": [{"key", "index", "old_index", "row"}],
+         "removed": [{"key", "old_index"}], ...}
+
+`version` / `base_version` are the content hashes of the new / previous output file (the same
+sha256[:16] the ChatBot uses as its data version), so a consumer applies a changeset only on top of
+exactly the snapshot it was computed against, and falls back to a full reload otherwise.
+
+Keys, per row type (override with the config's `changeset.key`: a list of fields, or type -> fields):
+    service       units
+    link          link_url
+    testimonial   content
+    other types   section_label + title
+    untyped rows  all fields (a changed row shows up as removed + added)
+A key is a list, e.g. ["service", "20"]; repeats of a key get their occurrence number appended.
+
+The previous run's keys and hashes live in backend/data/cache/changesets/ (one index per output file).
+"""
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+
+from backend.scraper.sinks import as_dict
+
+DEFAULT_KEYS = {"service": ("units",), "link": ("link_url",), "testimonial": ("content",)}
+NAMED_KEY = ("section_label", "title")
+INDEX_DIR = "backend/data/cache/changesets"
+_INTEGRAL = re.compile(r"-?\d+\.0*")
+
+
+def file_version(path) -> str:
+    """Content hash of an output file (None when it does not exist)"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()[:16]
+
+
+def changes_path(output) -> Path:
+    """Where the changeset of `output` is written: <name>.changes.json in the same directory"""
+    output = Path(output)
+    return output.with_name(f"{output.stem}.changes.json")
+
+
+def _cell(value) -> str:
+    """A value as the CSV sink writes it (None -> empty)"""
+    return "" if value is None else str(value)
+
+
+def _key_value(value) -> str:
+    """Key parts: 20, 20.0 and "20.0" are the same unit count"""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    text = _cell(value).strip()
+    return text.split(".", 1)[0] if _INTEGRAL.fullmatch(text) else text
+
+
+def row_hash(row) -> str:
+    """Content hash over all values, in field order"""
+    values = row if hasattr(row, "_fields") else tuple(as_dict(row).values())
+    return hashlib.blake2b(repr(tuple(values)).encode("utf-8", "surrogatepass"), digest_size=8).hexdigest()
+
+
+def key_fields(row: dict, key=None) -> tuple:
+    kind = row.get("type")
+    if isinstance(key, dict):
+        key = key.get(kind)
+    if key:
+        return tuple(key) if isinstance(key, (list, tuple)) else (key,)
+    if kind:
+        return DEFAULT_KEYS.get(kind, NAMED_KEY)
+    return tuple(row)
+
+
+def row_key(row, key=None) -> tuple:
+    """Identity of a row (before occurrence numbering): (type, key values...)"""
+    row = as_dict(row)
+    return (row.get("type") or "",) + tuple(_key_value(row.get(name)) for name in key_fields(row, key))
+
+
+def load_changes(output):
+    """The last changeset written for `output`, or None"""
+    try:
+        with open(changes_path(output), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def apply_changes(rows: list, changes: dict, convert=None) -> list:
+    """
+    The new output's rows from the previous ones (a list in file order) and a changeset.
+    `convert` turns a changeset row (dict) into the caller's row representation.
+    Raises ValueError when the changeset cannot be applied positionally (reordered rows, wrong base).
+    """
+    if changes.get("order_changed"):
+        raise ValueError("Changeset reorders rows")
+    convert = convert or (lambda row: row)
+    removed = {c["old_index"] for c in changes.get("removed", ())}
+    modified = {c["old_index"]: convert(c["row"]) for c in changes.get("modified", ())}
+    if any(i >= len(rows) for i in removed) or any(i >= len(rows) for i in modified):
+        raise ValueError("Changeset does not match the previous rows")
+    out = [modified.get(i, row) for i, row in enumerate(rows) if i not in removed]
+    for change in sorted(changes.get("added", ()), key=lambda c: c["index"]):
+        out.insert(change["index"], convert(change["row"]))
+    if len(out) != changes.get("rows", len(out)):
+        raise ValueError("Changeset does not match the previous rows")
+    return out
+
+
+class ChangeTracker:
+    """
+    Diffs one run's rows against the previous run of the same output:
+        tracker = ChangeTracker(sink.path, key=config_key)
+        result = sink.write(tracker.track(rows))
+        summary = tracker.commit()   # writes <output>.changes.json and the new index
+    Rows pass through unchanged; only keys and hashes (plus added / modified rows) are kept.
+    """
+
+    def __init__(self, output, key=None, index_dir=INDEX_DIR):
+        self.output = Path(output)
+        self.key = key
+        digest = hashlib.sha1(str(self.output.resolve()).encode("utf-8")).hexdigest()[:10]
+        self.index_path = Path(index_dir) / f"{self.output.stem}-{digest}.json"
+        self.base_version = None
+        self._previous = {}  # key -> (old index, hash)
+        self._entries = []  # (key, hash) in output order
+        self.added, self.modified = [], []
+        self._added = 0
+        self.order_changed = False
+        self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return
+        # The index only describes the output it was written with
+        if index.get("version") and index["version"] == file_version(self.output):
+            self.base_version = index["version"]
+            self._previous = {tuple(key): (i, h) for i, (key, h) in enumerate(index.get("rows", ()))}
+
+    def track(self, rows):
+        """Pass rows through, recording each one's key and hash"""
+        seen = {}
+        last_old = -1
+        previous = self._previous
+        for index, row in enumerate(rows):
+            record = as_dict(row)
+            base = row_key(record, self.key)
+            n = seen.get(base, 0)
+            seen[base] = n + 1
+            key = base if n == 0 else base + (n,)
+            digest = row_hash(row)
+            self._entries.append((key, digest))
+
+            old = previous.get(key)
+            if old is None:
+                self._added += 1
+                if self.base_version is not None:  # A first run's changeset would just repeat the output
+                    self.added.append({"key": list(key), "index": index, "row": dict(record)})
+            else:
+                if old[0] < last_old:
+                    self.order_changed = True
+                last_old = old[0]
+                if old[1] != digest:
+                    self.modified.append({"key": list(key), "index": index, "old_index": old[0],
+                                          "row": dict(record)})
+            yield row
+
+    def commit(self) -> dict:
+        """After the sink replaced the output: write the changeset and the new index; returns the counts"""
+        current = {key for key, _ in self._entries}
+        removed = [{"key": list(key), "old_index": i} for key, (i, _) in self._previous.items() if key not in current]
+        removed.sort(key=lambda c: c["old_index"])
+        version = file_version(self.output)
+        counts = {"added": self._added, "modified": len(self.modified), "removed": len(removed)}
+        changes = {
+            "output": str(self.output),
+            "created_at": time.time(),
+            "base_version": self.base_version,  # None: no usable previous snapshot, consumers reload in full
+            "version": version,
+            "rows": len(self._entries),
+            "order_changed": self.order_changed,
+            "counts": counts,
+            "added": self.added,
+            "modified": self.modified,
+            "removed": removed,
+        }
+        _write_json(changes_path(self.output), changes, indent=1)
+        _write_json(self.index_path, {"output": str(self.output), "version": version, "rows": self._entries})
+        return {"base_version": self.base_version, "version": version, "rows": len(self._entries),
+                "order_changed": self.order_changed, **counts}
+
+
+def _write_json(path: Path, data: dict, indent=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, default=str, indent=indent)
+    os.replace(tmp, path)
+
+
+def make_tracker(options: dict, output):
+    """ChangeTracker for an output from a config's `changeset` block, or None when it sets enabled: false"""
+    options = options or {}
+    if options.get("enabled", True) is False:
+        return None
+    return ChangeTracker(output, key=options.get("key"))
@@ -1,20 +1,20 @@
+import json
 import time
-import re
 import logging
 from pathlib import Path
-from urllib import robotparser
 from urllib.parse import urlsplit
 
-import pandas as pd
-from bs4 import BeautifulSoup
-
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from backend.scraper.render_wait import RenderWaiter
+from backend.scraper.http_client import get_http_client
+from backend.scraper.robots import get_robots_cache
+from backend.scraper.page_cache import get_page_cache, parse_fingerprint
+from backend.scraper.utils import clean_url
+from backend.scraper.extractors import get_extractor
+from backend.scraper.html_parser import PageDocument
+from backend.scraper.sinks import make_sink, file_size
+from backend.scraper.changeset import make_tracker
+from backend.scraper.rows import Row
+from backend import metrics
 
 
 class DynamicScraper:
@@ -33,6 +33,25 @@ class DynamicScraper:
         self.retry = config.get("retry", 2)
         self.delay = config.get("delay", 3)
         self.storage = config.get("storage", {})
+        # Optional pool sizing, e.g. {size: 2, max_pages: 50, headless: true}
+        self.pool_options = config.get("browser_pool", {}) or {}
+        # Readiness conditions after page load; see render_wait.RenderWaiter for step types
+        self.render_waiter = RenderWaiter(config.get("render_wait"))
+        self.render_timings = {}
+        self.debug_html = config.get("debug_html")  # Optional path to save each rendered page to
+        self.stage_stats = {}  # Per parse stage: {"rows": n, "seconds": t}
+        self._attempts = 0
+        self.spans = []  # Timed phases of the last run (robots, browser, render wait, parse, sink), see backend.metrics
+        # Field rules from the optional `extract` block, compiled once per rule set
+        self.extractor = get_extractor(config)
+        # HTML parser backend: auto (fastest installed) | selectolax | lxml | html.parser
+        self.parser = config.get("parser", "auto")
+        self.use_cache = config.get("page_cache", True)  # Skip parsing when the rendered page has not changed
+        self.cache_key = clean_url(self.url, config.get("strip_query_params", True)) if self.url else None
+        self.parse_key = parse_fingerprint(config, type(self).__module__)  # Config + code the last output came from
+        self.status = None  # "updated" or "unchanged" after run()
+        self.unchanged = False  # Set by fetch_page() when the rendered HTML hash matches the last run
+        self.changes = None  # Added / modified / removed row counts of the last save(), see changeset.py
 
         log_name = self.site_name.replace(" ", "_").lower()
         self.log_path = Path("logs") / f"{log_name}.log"
@@ -51,56 +70,21 @@ class DynamicScraper:
         )
 
     def _is_allowed_by_robots(self) -> bool:
-        """Check if robots.txt allows crawling the target_url"""
+        """Check if robots.txt allows crawling the target_url (shared, cached resolver)"""
         if not self.url:
             logging.error("No target URL provided")
             return False
 
-        parts = urlsplit(self.url)
-        robots_url = f"{parts.scheme}://{parts.netloc}/robots.txt"
-
-        rp = robotparser.RobotFileParser()
-        rp.set_url(robots_url)
-        try:
-            rp.read()
-            allowed = rp.can_fetch("MonAgentCrawler", self.url)
-            logging.info(f"robots.txt check: {robots_url}, allowed={allowed}")
-            return allowed
-        except Exception as e:
-            logging.error(f"Failed to read robots.txt: {e}")
-            # Conservative approach: treat as disallowed if unreadable (change to True for testing purposes)
-            return False
+        allowed = get_robots_cache().allowed(self.url, "MonAgentCrawler")
+        logging.info(f"robots.txt check: {self.url}, allowed={allowed}")
+        return allowed
 
     # ------------------ browser / fetch ------------------ #
 
-    def _init_chrome(self):
-        options = ChromeOptions()
-        # If WSL has no GUI, enable headless mode by uncommenting the line below:
-        # options.add_argument("--headless=new")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--window-size=1920,1080")
-        options.add_argument("--remote-debugging-port=9222")
-
-        # In WSL, it might be google-chrome or chromium-browser
-        if Path("/usr/bin/google-chrome").exists():
-            options.binary_location = "/usr/bin/google-chrome"
-        elif Path("/usr/bin/chromium-browser").exists():
-            options.binary_location = "/usr/bin/chromium-browser"
-
-        service = ChromeService(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
-        return driver
-
-    def _init_browser(self):
-        if self.browser == "chrome":
-            return self._init_chrome()
-        elif self.browser == "edge":
-            # Placeholder for future implementation if Edge support is needed
-            raise NotImplementedError("Edge browser support is reserved for future use.")
-        else:
-            raise ValueError(f"Unsupported browser type: {self.browser}")
+    def _browser_pool(self):
+        """Shared warm browser pool; sizing comes from the optional `browser_pool` config block"""
+        from backend.scraper.browser_pool import get_browser_pool  # selenium: only when a page is fetched
+        return get_browser_pool(self.browser, **self.pool_options)
 
     def fetch_page(self) -> str:
         """With retry + wait for rendering completion + multiple scrolls to trigger lazy-load"""
@@ -108,33 +92,53 @@ class DynamicScraper:
             raise ValueError("No target URL provided")
 
         if self.check_robots:
-            if not self._is_allowed_by_robots():
+            with metrics.span("robots", self.spans, site=self.site_name):
+                allowed = self._is_allowed_by_robots()
+            if not allowed:
                 raise PermissionError(f"Robots.txt disallows crawling: {self.url}")
 
+        with metrics.span("fetch", self.spans, site=self.site_name) as span:
+            try:
+                html = self._fetch_with_retries()
+            finally:
+                span.add(retries=max(0, self._attempts - 1))
+            span.add(bytes=len(html.encode("utf-8")))
+        return html
+
+    def _fetch_with_retries(self) -> str:
+        """Load and render the page in a pooled browser, up to `retry` attempts `delay` seconds apart"""
+        pool = self._browser_pool()
+        host = urlsplit(self.url).netloc.lower()
         last_error = None
         for attempt in range(1, self.retry + 1):
+            self._attempts = attempt
             try:
+                # Same per-host spacing as the HTTP path, so robots.txt Crawl-delay holds for browser loads too
+                get_http_client().limiter.wait(host)
                 logging.info(f"[Attempt {attempt}] Starting to load page: {self.url}")
-                driver = self._init_browser()
-                driver.get(self.url)
-
-                # Wait for footer to appear, indicating most content is loaded
-                WebDriverWait(driver, 20).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "footer"))
-                )
-
-                # Scroll down multiple times to load Elfsight / lazy blocks
-                for _ in range(4):
-                    driver.execute_script("window.scrollBy(0, document.body.scrollHeight);")
-                    time.sleep(1.8)
-
-                html = driver.page_source
-                # For debugging: save full HTML for analysis if needed
-                with open("debug_scottsdale.html", "w", encoding="utf-8") as f:
-                    f.write(html)
-
-                driver.quit()
-                logging.info(f"[Attempt {attempt}] Page loaded successfully")
+                # The driver goes back to the pool (or is recycled) even if loading fails
+                start = time.perf_counter()
+                with pool.acquire() as driver:
+                    # Warm driver from the pool, or a browser launch when the pool has none idle
+                    metrics.record_phase("browser_acquire", time.perf_counter() - start, self.spans,
+                                         site=self.site_name)
+                    with metrics.span("navigate", self.spans, site=self.site_name):
+                        driver.get(self.url)
+
+                    # Wait until the configured readiness conditions hold (footer, widgets, lazy blocks)
+                    with metrics.span("render_wait", self.spans, site=self.site_name):
+                        self.render_timings = self.render_waiter.wait(driver)
+
+                    html = driver.page_source
+
+                if self.debug_html:
+                    # For debugging: save the rendered HTML for analysis (opt-in, per-config path)
+                    Path(self.debug_html).parent.mkdir(parents=True, exist_ok=True)
+                    Path(self.debug_html).write_text(html, encoding="utf-8")
+
+                # Rendered pages have no validators, so compare the body hash with the last run
+                self.unchanged = self.use_cache and not get_page_cache().store(self.cache_key, html)
+                logging.info(f"[Attempt {attempt}] Page loaded successfully (unchanged={self.unchanged})")
                 return html
             except Exception as e:
                 logging.error(f"[Attempt {attempt}] Failed to load: {e}")
@@ -145,117 +149,56 @@ class DynamicScraper:
 
     # ------------------ General row schema ------------------ #
 
-    def _empty_row(self):
-        """Create an empty row with a general schema"""
-        return {
-            "type": None,
-            "section_label": None,
-            "title": None,
-            "content": None,
-            "units": None,
-            "price": None,
-            "member_fee_month": None,
-            "phone": None,
-            "email": None,
-            "address": None,
-            "hours": None,
-            "link_text": None,
-            "link_url": None,
-            "source_url": self.url,
-        }
+    def _row(self, **fields) -> Row:
+        """Create a row with the general schema (unset fields are None)"""
+        return Row(source_url=self.url, **fields)
 
     # ------------------ Services & Contact Info ------------------ #
 
-    def _parse_services_and_contact(self, soup: BeautifulSoup):
+    def _parse_services_and_contact(self, doc: PageDocument):
         """Parse Botox / Dysport prices, membership fees, phone, email, address, hours"""
-        full_text = soup.get_text("\n", strip=True)
-        rows = []
-
-        # Units + price, e.g., 20 Units $150.80
-        unit_price = []
-        for m in re.finditer(r"(\d+)\s*Units?\s*\$([0-9]+(?:\.[0-9]{2})?)", full_text, re.I):
-            unit_price.append((int(m.group(1)), float(m.group(2))))
-
-        # Membership monthly fee, e.g., $9.72/month
-        member_fee = None
-        mm = re.search(r"\$([0-9]+(?:\.[0-9]{2})?)\s*/\s*month", full_text, re.I)
-        if mm:
-            member_fee = float(mm.group(1))
-
-        # Phone
-        phone = None
-        ph = re.search(r"\(\d{3}\)\s*\d{3}-\d{4}", full_text)
-        if ph:
-            phone = ph.group(0)
-
-        # Email
-        email = None
-        em = re.search(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", full_text)
-        if em:
-            email = em.group(0)
-
-        # Address: avoid capturing titles like "Botox® / Dysport® Scottsdale Arizona — ClubInject®"
-        address = None
-        candidate_lines = []
-        for line in full_text.splitlines():
-            if "Scottsdale" in line and ("AZ" in line or "Arizona" in line):
-                candidate_lines.append(line.strip())
-
-        # Prefer lines containing street numbers
-        for line in candidate_lines:
-            if re.search(r"\d{3,}", line):
-                address = line.strip()
-                break
-        if not address and candidate_lines:
-            address = candidate_lines[-1].strip()
-
-        # Hours (e.g., Mon–Fri 10AM–6PM)
-        hours = None
-        for line in full_text.splitlines():
-            l = line.strip()
-            if not l:
-                continue
-            if re.search(r"(Mon|Tue|Wed|Thu|Fri|Sat|Sun)", l) and re.search(r"(AM|PM|am|pm)", l):
-                hours = l
-                break
+        full_text = doc.text()
 
-        for units, price in unit_price:
-            row = self._empty_row()
-            row["type"] = "service"
-            row["section_label"] = "Botox / Dysport"
-            row["title"] = "Botox® / Dysport®"
-            row["content"] = "It's all we do."
-            row["units"] = units
-            row["price"] = price
-            row["member_fee_month"] = member_fee
-            row["phone"] = phone
-            row["email"] = email
-            row["address"] = address
-            row["hours"] = hours
-            rows.append(row)
+        # Compiled field rules (units/price, member fee, phone, email, address, hours), one pass over the text
+        fields = self.extractor.extract(full_text)
+        unit_price = fields.get("unit_price") or []
+        member_fee = fields.get("member_fee")
+        phone = fields.get("phone")
+        email = fields.get("email")
+        address = fields.get("address")
+        hours = fields.get("hours")
 
-        return rows
+        for units, price in unit_price:
+            yield self._row(
+                type="service",
+                section_label="Botox / Dysport",
+                title="Botox® / Dysport®",
+                content="It's all we do.",
+                units=units,
+                price=price,
+                member_fee_month=member_fee,
+                phone=phone,
+                email=email,
+                address=address,
+                hours=hours,
+            )
 
     # ------------------ Elfsight Block Parsing (About / Pricing / Membership / Reviews) ------------------ #
 
-    def _parse_elfsight_blocks(self, soup: BeautifulSoup):
+    def _parse_elfsight_blocks(self, doc: PageDocument):
         """
         Specifically handle the Elfsight widget structure:
         - Titles are in font-size:40px TextBlock__TextHTML
         - Content is in font-size:22px TextBlock__TextHTML
         """
-        rows = []
-
         # All text blocks (titles + content)
-        text_blocks = soup.select("div[class*='TextBlock__TextHTML']")
+        text_blocks = doc.text_blocks("div[class*='TextBlock__TextHTML']")
         current_section = None  # Remember "About Us" titles
 
-        for tb in text_blocks:
-            raw = tb.get_text("\n", strip=True)
+        for style, raw in text_blocks:
             if not raw:
                 continue
 
-            style = tb.get("style", "")
             lower = raw.lower()
 
             # 40px: treat as title
@@ -271,121 +214,143 @@ class DynamicScraper:
 
             # 22px: content block corresponding to title
             if "font-size: 22px" in style:
-                row = self._empty_row()
-
                 # 1) Membership / Join
                 if "memberships are just" in lower or "membership" in lower:
-                    row["type"] = "join_info"
-                    row["section_label"] = "Join"
-                    row["title"] = "Membership"
-                    row["content"] = raw
+                    yield self._row(type="join_info", section_label="Join", title="Membership", content=raw)
 
                 # 2) Pricing summary (non-member / member unit prices)
                 elif "we charge" in lower and ("botox" in lower or "dysport" in lower):
-                    row["type"] = "pricing_summary"
-                    row["section_label"] = "Pricing"
-                    row["title"] = "Pricing Summary"
-                    row["content"] = raw
+                    yield self._row(type="pricing_summary", section_label="Pricing", title="Pricing Summary",
+                                    content=raw)
 
                 # 3) About content (first 22px block after About Us title)
                 elif current_section == "about" and (
                     "clubinject" in lower and "group of" in lower
                 ):
-                    row["type"] = "about"
-                    row["section_label"] = "About"
-                    row["title"] = "About Us"
-                    row["content"] = raw
+                    yield self._row(type="about", section_label="About", title="About Us", content=raw)
 
                 # 4) Reviews / Testimonials (e.g., Google reviews widget text)
                 elif "review" in lower or ("google" in lower and "stars" in lower):
-                    row["type"] = "testimonial"
-                    row["section_label"] = "Testimonials"
-                    row["title"] = "Reviews"
-                    row["content"] = raw
+                    yield self._row(type="testimonial", section_label="Testimonials", title="Reviews", content=raw)
 
                 # 5) Others: treat as general text
                 else:
-                    row["type"] = "generic"
-                    row["section_label"] = "Text"
                     first_line = raw.splitlines()[0]
-                    row["title"] = first_line[:80]
-                    row["content"] = raw
-
-                rows.append(row)
-
-        return rows
+                    yield self._row(type="generic", section_label="Text", title=first_line[:80], content=raw)
 
     # ------------------ General sections (currently conservative, no duplicate Elfsight parsing) ------------------ #
 
-    def _parse_sections(self, soup: BeautifulSoup):
+    def _parse_sections(self, doc: PageDocument):
         """
         If future non-Elfsight <section> content appears, rules can be added here.
-        Currently returns an empty list or performs very weak generic extraction to avoid duplication.
+        Currently yields nothing to avoid duplicating the Elfsight rows.
         """
-        rows = []
         # Add specific rules here if needed in the future
-        return rows
+        return iter(())
 
     # ------------------ Links ------------------ #
 
-    def _parse_links(self, soup: BeautifulSoup):
+    def _parse_links(self, doc: PageDocument):
         """Parse all a[href] links (excluding #anchor)"""
-        rows = []
         seen = set()
 
-        for a in soup.select("a[href]"):
-            href = a.get("href")
+        for href, text in doc.links():
             if not href or not isinstance(href, str) or href.startswith("#"):
                 continue
             if href in seen:
                 continue
             seen.add(href)
 
-            text = a.get_text(strip=True) or None
-            row = self._empty_row()
-            row["type"] = "link"
-            row["section_label"] = "Link"
-            row["title"] = text
-            row["link_text"] = text
-            row["link_url"] = href
-            rows.append(row)
-
-        return rows
+            text = text or None
+            yield self._row(type="link", section_label="Link", title=text, link_text=text, link_url=href)
 
     # ------------------ master parse ------------------ #
 
-    def parse_page(self, html: str):
-        soup = BeautifulSoup(html, "html.parser")
+    def _timed_stage(self, name, rows):
+        """Pass rows through while recording how many the stage produced and the time spent producing them"""
+        stats = self.stage_stats[name] = {"rows": 0, "seconds": 0.0}
+        it = iter(rows)
+        clock = time.perf_counter
+        while True:
+            start = clock()
+            try:
+                row = next(it)
+            except StopIteration:
+                stats["seconds"] += clock() - start
+                metrics.record_phase(f"parse.{name}", stats["seconds"], self.spans, rows=stats["rows"],
+                                     site=self.site_name)
+                return
+            stats["seconds"] += clock() - start
+            stats["rows"] += 1
+            yield row
+
+    def iter_rows(self, html: str):
+        """
+        Lazily yield rows stage by stage, so a sink can write them as they are produced.
+        Per-stage row counts and seconds are kept in self.stage_stats.
+        """
+        # Parsed once with the configured backend; every stage reuses the same document
+        with metrics.span("soup_build", self.spans, site=self.site_name) as span:
+            doc = PageDocument(html, self.parser).build()
+            span.add(bytes=len(html))
+        self.stage_stats = {}
+
+        stages = (
+            ("services", self._parse_services_and_contact),  # Services & Contact
+            ("elfsight", self._parse_elfsight_blocks),  # Elfsight content (About / Pricing / Membership / Reviews)
+            ("sections", self._parse_sections),  # Other sections (currently conservative, not used)
+            ("links", self._parse_links),  # Site-wide links
+        )
+        for name, stage in stages:
+            yield from self._timed_stage(name, stage(doc))
 
-        rows = []
-        # Services & Contact
-        rows += self._parse_services_and_contact(soup)
-        # Elfsight content (About / Pricing / Membership / Reviews)
-        rows += self._parse_elfsight_blocks(soup)
-        # Other sections (currently conservative, not used)
-        rows += self._parse_sections(soup)
-        # Site-wide links
-        rows += self._parse_links(soup)
+        logging.info(f"parse stages: {self.stage_stats}")
 
+    def parse_page(self, html: str) -> list:
+        """
+        All rows of the page as dicts (the public format callers index by field name).
+        iter_rows yields the tuple-backed rows.Row that run() streams into the sink.
+        """
+        rows = [row._asdict() for row in self.iter_rows(html)]
         logging.info(f"parse_page: Generated {len(rows)} rows in total")
         return rows
 
-
-    
     # ------------------ save & run ------------------ #
 
-    def save_to_csv(self, rows):
-        df = pd.DataFrame(rows)
-        path = Path(self.storage.get("path", "output.csv"))
-        path.parent.mkdir(parents=True, exist_ok=True)
-        df.to_csv(path, index=False, encoding="utf-8-sig")
-        logging.info(f"Saved CSV to {path}")
-        return path, df
+    def save(self, rows):
+        """Stream rows into the sink configured by `storage` (csv, jsonl, parquet, sqlite)"""
+        sink = make_sink(self.storage, sample_size=3)
+        tracker = make_tracker(self.config.get("changeset"), sink.path)  # Diff against the previous run's rows
+        result = sink.write(tracker.track(rows) if tracker else rows)
+        if tracker:
+            self.changes = tracker.commit()
+            logging.info(f"Changes since the last run: {self.changes}")
+        # The sink's own time only: with a streamed input the rest is spent in the parse stages
+        metrics.record_phase("sink_write", sink.write_seconds, self.spans, bytes=file_size(result.path),
+                             rows=result.count, site=self.site_name)
+        logging.info(f"Saved {result.count} rows to {result.path}")
+        return result
+
+    # Kept for callers of the previous API; the sink decides the actual format
+    save_to_csv = save
 
     def run(self):
+        self.spans = []
         html = self.fetch_page()
-        rows = self.parse_page(html)
-        path, df = self.save_to_csv(rows)
-        logging.info(f"✅ {self.site_name} scraping completed, {len(df)} rows in total")
+        out = str(Path(self.storage.get("path", "output.csv")))
+        if self.unchanged:
+            previous = get_page_cache().unchanged_result(self.cache_key, out, self.parse_key)
+            if previous is not None:
+                self.status = "unchanged"
+                logging.info(f"{self.site_name} unchanged since last run, skipping parse")
+                return previous[0], out, previous[1]
+
+        # Rows stream from the parse stages straight into the sink
+        result = self.save(self.iter_rows(html))
+        if self.use_cache:
+            get_page_cache().record_output(self.cache_key, result.path, result.count, result.sample, self.parse_key)
+        self.status = "updated"
+        logging.info(f"✅ {self.site_name} scraping completed, {result.count} rows in total")
+        logging.info(f"spans: {json.dumps(self.spans, ensure_ascii=False)}")
         # Return: total rows, file path, first three samples (for API /scrape use)
-        return len(df), str(path), df.head(3).to_dict(orient="records")
+        return result.count, result.path, result.sample
@@ -0,0 +1,179 @@
+# backend/scraper/extractors.py
+import re
+import json
+from functools import lru_cache
+
+# Field rules used when a config has no `extract` block (ClubInject-style pages).
+# Two rule kinds:
+#   text rules: `pattern` searched over the whole text; `all: true` collects every match;
+#               `anchor` (a literal inside every match) limits the regex to the text around its hits
+#   line rules: a (stripped, non-empty) line qualifies if it contains every `contains` string, at least
+#               one `contains_any` string and matches every regex in `matches`; `prefer` picks the first
+#               qualifying line matching that regex, otherwise `fallback` (first | last | none) decides
+DEFAULT_RULES = {
+    "unit_price": {"pattern": r"(\d+)\s*Units?\s*\$([0-9]+(?:\.[0-9]{2})?)", "flags": "i",
+                   "all": True, "cast": ["int", "float"], "anchor": "$"},
+    "member_fee": {"pattern": r"\$([0-9]+(?:\.[0-9]{2})?)\s*/\s*month", "flags": "i", "cast": ["float"]},
+    "phone": {"pattern": r"\(\d{3}\)\s*\d{3}-\d{4}"},
+    # The lookbehind only skips start positions inside a run (same matches, far fewer attempts)
+    "email": {"pattern": r"(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}",
+              "anchor": "@"},
+    # Avoid capturing titles like "Botox® / Dysport® Scottsdale Arizona — ClubInject®": prefer street numbers
+    "address": {"contains": ["Scottsdale"], "contains_any": ["AZ", "Arizona"], "prefer": r"\d{3,}",
+                "fallback": "last"},
+    # e.g. Mon–Fri 10AM–6PM
+    "hours": {"contains_any": ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"], "matches": [r"(AM|PM|am|pm)"],
+              "fallback": "first"},
+}
+
+_FLAGS = {"i": re.I, "m": re.M, "s": re.S}
+_CASTS = {"int": int, "float": float, "str": str}
+
+
+def _compile_flags(spec) -> int:
+    flags = 0
+    for ch in spec or "":
+        flags |= _FLAGS[ch]
+    return flags
+
+
+class _TextRule:
+    __slots__ = ("name", "regex", "all", "casts", "anchor", "window")
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.regex = re.compile(spec["pattern"], _compile_flags(spec.get("flags")))
+        self.all = bool(spec.get("all"))
+        self.casts = [_CASTS[c] for c in spec.get("cast", [])]
+        # Optional literal that every match contains exactly once, with at most `window` chars before it
+        # and nothing after it past the end of its line; the regex then only runs around anchor hits
+        self.anchor = spec.get("anchor")
+        self.window = int(spec.get("window", 64))
+
+    def _value(self, m):
+        if not self.casts:
+            return m.group(0)
+        values = tuple(cast(m.group(i + 1)) for i, cast in enumerate(self.casts))
+        return values if len(values) > 1 else values[0]
+
+    def _matches(self, text):
+        if not self.anchor:
+            yield from self.regex.finditer(text)
+            return
+
+        search, find, pos = self.regex.search, text.find, 0
+        while True:
+            hit = find(self.anchor, pos)
+            if hit == -1:
+                return
+            end = find("\n", hit)
+            end = len(text) if end == -1 else end
+            m = search(text, max(pos, hit - self.window), end)
+            if m:
+                yield m
+                pos = max(m.end(), hit + 1)
+            else:
+                pos = hit + 1
+
+    def apply(self, text):
+        if self.all:
+            return [self._value(m) for m in self._matches(text)]
+        m = next(self._matches(text), None)
+        return self._value(m) if m else None
+
+
+class _LineRule:
+    __slots__ = ("name", "contains", "contains_any", "matches", "prefer", "fallback", "anchor")
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.contains = tuple(spec.get("contains", ()))
+        self.contains_any = tuple(spec.get("contains_any", ()))
+        self.matches = tuple(re.compile(p) for p in spec.get("matches", ()))
+        self.prefer = re.compile(spec["prefer"]) if spec.get("prefer") else None
+        self.fallback = spec.get("fallback", "first")
+
+        # Every qualifying line contains one of these literals, so only lines around their hits are visited
+        literals = self.contains[:1] or self.contains_any
+        self.anchor = re.compile("|".join(map(re.escape, literals))) if literals else None
+
+    def qualifies(self, line) -> bool:
+        # Cheap substring checks first, regexes only for survivors
+        for s in self.contains:
+            if s not in line:
+                return False
+        if self.contains_any and not any(s in line for s in self.contains_any):
+            return False
+        for r in self.matches:
+            if not r.search(line):
+                return False
+        return True
+
+    def candidate_lines(self, text):
+        """Yield stripped, non-empty lines that may qualify, in text order"""
+        if self.anchor is None:
+            for line in text.splitlines():
+                line = line.strip()
+                if line:
+                    yield line
+            return
+
+        pos = 0
+        search = self.anchor.search
+        while True:
+            m = search(text, pos)
+            if not m:
+                return
+            start = text.rfind("\n", 0, m.start()) + 1
+            end = text.find("\n", m.end())
+            if end == -1:
+                end = len(text)
+            line = text[start:end].strip()
+            if line:
+                yield line
+            pos = end + 1
+
+    def apply(self, text):
+        first = last = None
+        for line in self.candidate_lines(text):
+            if not self.qualifies(line):
+                continue
+            if self.prefer is None or self.prefer.search(line):
+                return line
+            if first is None:
+                first = line
+            last = line
+        if self.fallback == "first":
+            return first
+        if self.fallback == "last":
+            return last
+        return None
+
+
+class Extractor:
+    """
+    Field extraction compiled once per rule set. Text rules run one regex over the full text;
+    line rules jump straight to the lines around their literal anchors instead of walking every line.
+    """
+
+    def __init__(self, rules: dict):
+        self.rules = []
+        for name, spec in rules.items():
+            if not spec:
+                continue
+            self.rules.append(_TextRule(name, spec) if "pattern" in spec else _LineRule(name, spec))
+
+    def extract(self, text: str) -> dict:
+        return {rule.name: rule.apply(text) for rule in self.rules}
+
+
+@lru_cache(maxsize=64)
+def _compiled(rules_key: str) -> Extractor:
+    return Extractor(json.loads(rules_key))
+
+
+def get_extractor(config: dict) -> Extractor:
+    """Extractor for a site config: DEFAULT_RULES overridden field-by-field by the config's `extract` block"""
+    rules = dict(DEFAULT_RULES)
+    rules.update(config.get("extract") or {})
+    return _compiled(json.dumps(rules, sort_keys=True))
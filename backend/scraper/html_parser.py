@@ -0,0 +1,180 @@
+# backend/scraper/html_parser.py
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+# Fastest first; "auto" picks the first one that is installed
+BACKENDS = ("selectolax", "lxml", "html.parser")
+
+# Tags whose contents BeautifulSoup.get_text() leaves out
+_NON_TEXT_TAGS = ["script", "style", "template"]
+_SPLIT = "\x00"  # Between selectolax text nodes; never part of page text
+
+
+def _node_text(node, separator: str = "") -> str:
+    """
+    selectolax text with BeautifulSoup's get_text(separator, strip=True) semantics: every string
+    stripped and whitespace-only ones (indentation between tags) dropped before joining
+    """
+    return separator.join(filter(None, (s.strip() for s in node.text(separator=_SPLIT).split(_SPLIT))))
+
+
+@lru_cache(maxsize=None)
+def is_available(backend: str) -> bool:
+    if backend == "html.parser":
+        return True
+    try:
+        if backend == "lxml":
+            import lxml  # noqa: F401
+        elif backend == "selectolax":
+            from selectolax.lexbor import LexborHTMLParser  # noqa: F401
+        else:
+            return False
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_backend(name: str = "auto") -> str:
+    """Map a configured parser name to an installed backend, falling back to html.parser"""
+    name = (name or "auto").lower()
+    if name == "auto":
+        return next(b for b in BACKENDS if is_available(b))
+    if name not in BACKENDS:
+        raise ValueError(f"Unsupported parser backend: {name}")
+    return name if is_available(name) else "html.parser"
+
+
+def make_soup(html: str, backend: str = "auto") -> "BeautifulSoup":
+    """BeautifulSoup with the fastest installed tree builder (lxml, else html.parser)"""
+    from bs4 import BeautifulSoup  # Not needed at all on the selectolax path
+
+    builder = "lxml" if resolve_backend(backend) in ("lxml", "selectolax") and is_available("lxml") else "html.parser"
+    return BeautifulSoup(html, builder)
+
+
+class PageDocument:
+    """
+    A page parsed once and shared by every parse stage. Stages ask for plain data
+    (full text, text blocks, links) so they work the same on every backend:
+    - selectolax: lexbor C parser, no BeautifulSoup tree at all
+    - lxml / html.parser: one BeautifulSoup tree, built lazily
+    Results are cached, so repeated questions do not walk the tree again.
+    """
+
+    def __init__(self, html: str, backend: str = "auto"):
+        self.html = html
+        self.backend = resolve_backend(backend)
+        self._tree = None
+        self._soup = None
+        self._text = None
+        self._blocks = {}
+        self._links = None
+
+    def build(self) -> "PageDocument":
+        """Parse now instead of on first use (lets callers time the tree build on its own)"""
+        if self.backend == "selectolax":
+            self.tree
+        else:
+            self.soup
+        return self
+
+    @property
+    def soup(self) -> "BeautifulSoup":
+        """BeautifulSoup tree for custom stages (built on first use)"""
+        if self._soup is None:
+            self._soup = make_soup(self.html, self.backend)
+        return self._soup
+
+    @property
+    def tree(self):
+        if self._tree is None:
+            from selectolax.lexbor import LexborHTMLParser
+            self._tree = LexborHTMLParser(self.html)
+            self._tree.strip_tags(_NON_TEXT_TAGS)
+        return self._tree
+
+    def text(self) -> str:
+        """All visible text, one stripped string per line (same as soup.get_text("\\n", strip=True))"""
+        if self._text is None:
+            if self.backend == "selectolax":
+                self._text = _node_text(self.tree.root, "\n") if self.tree.root else ""
+            else:
+                self._text = self.soup.get_text("\n", strip=True)
+        return self._text
+
+    def text_blocks(self, selector: str) -> list:
+        """[(style attribute, text with "\\n" between strings)] for elements matching a CSS selector"""
+        if selector not in self._blocks:
+            if self.backend == "selectolax":
+                blocks = [(node.attributes.get("style") or "", _node_text(node, "\n"))
+                          for node in self.tree.css(selector)]
+            else:
+                blocks = [(tag.get("style", ""), tag.get_text("\n", strip=True))
+                          for tag in self.soup.select(selector)]
+            self._blocks[selector] = blocks
+        return self._blocks[selector]
+
+    def links(self) -> list:
+        """[(href, text)] for every a[href], in document order"""
+        if self._links is None:
+            if self.backend == "selectolax":
+                self._links = [(node.attributes.get("href"), _node_text(node))
+                               for node in self.tree.css("a[href]")]
+            else:
+                self._links = [(a.get("href"), a.get_text(strip=True)) for a in self.soup.select("a[href]")]
+        return self._links
+
+    # ------------------ selector extraction ------------------ #
+
+    @staticmethod
+    def _split_field(spec: str):
+        """"h3 a@title" -> ("h3 a", "title"); plain selectors read the element text"""
+        selector, _, attr = spec.partition("@")
+        return selector.strip(), attr.strip() or None
+
+    def _value(self, node, attr):
+        if self.backend == "selectolax":
+            return node.attributes.get(attr) if attr else _node_text(node)
+        return node.get(attr) if attr else node.get_text(strip=True)
+
+    def _select(self, root, selector):
+        if self.backend == "selectolax":
+            return root.css(selector)
+        return root.select(selector)
+
+    def select_values(self, spec: str) -> list:
+        """Text (or @attribute) of every element matching "css selector[@attr]" """
+        selector, attr = self._split_field(spec)
+        root = self.tree if self.backend == "selectolax" else self.soup
+        return [self._value(node, attr) for node in self._select(root, selector)]
+
+    def select_records(self, fields: dict, item: str = None) -> list:
+        """
+        One dict per record. With `item`, each field is looked up inside every item element
+        (missing -> None); without it, the per-field match lists are zipped together.
+
+        Raises:
+            ValueError: Without `item`, when the fields match different numbers of elements (zipping
+                would silently drop or misalign records; set `item` so each record is scoped).
+        """
+        if not item:
+            columns = {name: self.select_values(spec) for name, spec in fields.items()}
+            counts = {name: len(values) for name, values in columns.items()}
+            if len(set(counts.values())) > 1:
+                raise ValueError(f"Selectors match different numbers of elements {counts}; "
+                                 f"set `item` to scope each record")
+            return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+        specs = {name: self._split_field(spec) for name, spec in fields.items()}
+        root = self.tree if self.backend == "selectolax" else self.soup
+        records = []
+        for node in self._select(root, item):
+            record = {}
+            for name, (selector, attr) in specs.items():
+                found = self._select(node, selector)
+                record[name] = self._value(found[0], attr) if found else None
+            records.append(record)
+        return records
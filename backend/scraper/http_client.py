@@ -0,0 +1,171 @@
+# backend/scraper/http_client.py
+import time
+import random
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Default User-Agent string for HTTP requests
+DEFAULT_UA = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/121.0 Safari/537.36"
+)
+
+# Status codes worth retrying: rate limited or a transient server-side failure
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def _accept_encoding() -> str:
+    """urllib3 only decodes brotli when a brotli package is installed, so only advertise it then"""
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+        except ImportError:
+            return "gzip, deflate"
+    return "gzip, deflate, br"
+
+
+def parse_retry_after(value):
+    """Return the Retry-After header as seconds (it may be a number or an HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostRateLimiter:
+    """
+    Per-host request spacing: requests to the same host start at least `interval` seconds apart.
+    Different hosts never wait on each other. Intervals can be set per host, robots Crawl-delay
+    acts as a floor, and a host can be pushed back after a 429.
+    """
+
+    def __init__(self, min_interval: float = 1.2):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._intervals = {}
+        self._crawl_delays = {}
+        self._next_slot = {}
+
+    def set_interval(self, host: str, seconds: float):
+        """Configured spacing for host (site config); replaces the default interval"""
+        with self._lock:
+            self._intervals[host] = float(seconds)
+
+    def set_crawl_delay(self, host: str, seconds: float):
+        """Crawl-delay from robots.txt: a floor that the configured interval can never undercut"""
+        with self._lock:
+            self._crawl_delays[host] = float(seconds)
+
+    def interval(self, host: str) -> float:
+        return max(self._intervals.get(host, self.min_interval), self._crawl_delays.get(host, 0.0))
+
+    def defer(self, host: str, seconds: float):
+        """Push the host's next slot back, e.g. when the server asked us to slow down"""
+        with self._lock:
+            self._next_slot[host] = max(self._next_slot.get(host, 0.0), time.monotonic() + seconds)
+
+    def wait(self, host: str):
+        """Reserve the next slot for host and sleep until it arrives"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval(host)
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class HttpClient:
+    """
+    Shared fetch layer for static scraping:
+    - One requests.Session with keep-alive connection pools per host
+    - gzip / deflate (and brotli when available) response compression
+    - Retries with exponential backoff on connection errors, 429 and 5xx, honouring Retry-After
+    - Per-host politeness through HostRateLimiter instead of a fixed sleep
+    """
+
+    def __init__(self, user_agent: str = DEFAULT_UA, timeout: float = 15, retries: int = 3,
+                 backoff: float = 0.5, max_backoff: float = 30, min_interval: float = 1.2,
+                 pool_maxsize: int = 10):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.limiter = HostRateLimiter(min_interval)
+
+        self.session = requests.Session()
+        # Retries are handled here (with Retry-After + rate limiter), so urllib3 must not retry on its own
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "User-Agent": user_agent,
+            "Accept-Encoding": _accept_encoding(),
+        })
+
+    def _backoff_delay(self, attempt: int) -> float:
+        delay = min(self.max_backoff, self.backoff * (2 ** attempt))
+        return delay + random.uniform(0, delay / 2)
+
+    def get(self, url: str, headers=None, timeout=None, retries=None, **kwargs) -> requests.Response:
+        """
+        GET a URL through the shared session.
+
+        Returns:
+            requests.Response: The final response (the caller decides whether to raise_for_status()),
+                with `.retries` set to the number of retries it took.
+
+        Raises:
+            requests.RequestException: If the request still fails after all retries.
+        """
+        host = urlsplit(url).netloc.lower()
+        retries = self.retries if retries is None else retries
+        timeout = self.timeout if timeout is None else timeout
+
+        for attempt in range(retries + 1):
+            self.limiter.wait(host)
+            try:
+                r = self.session.get(url, headers=headers, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+                logging.warning(f"GET {url} failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+
+            r.retries = attempt  # Retries spent on this request (reported in scrape metrics)
+            if r.status_code not in RETRY_STATUS or attempt >= retries:
+                return r
+
+            retry_after = parse_retry_after(r.headers.get("Retry-After"))
+            delay = min(self.max_backoff, retry_after) if retry_after is not None else self._backoff_delay(attempt)
+            logging.warning(f"GET {url} -> {r.status_code}, retrying in {delay:.1f}s")
+            r.close()
+            # Everyone sharing this host backs off, not just this thread
+            self.limiter.defer(host, delay)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide HttpClient so all scrapers share connections and rate limits"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
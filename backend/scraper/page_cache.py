@@ -0,0 +1,185 @@
+# backend/scraper/page_cache.py
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+# Config keys that only affect how / when a page is fetched, not the rows parsed out of it
+FETCH_ONLY_KEYS = frozenset({"http", "page_cache", "changeset", "schedule", "browser", "browser_pool", "render_wait",
+                             "retry", "delay", "check_robots", "debug_html"})
+# Modules whose code decides the rows written for a page (besides the scraper class's own module)
+PARSE_MODULES = ("backend.scraper.html_parser", "backend.scraper.extractors", "backend.scraper.rows",
+                 "backend.scraper.sinks")
+
+
+def body_hash(html: str) -> str:
+    return hashlib.sha256(html.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def code_salt(modules: tuple) -> str:
+    """Hash of the parsing modules' source, so editing the parse code invalidates unchanged-page results"""
+    digest = hashlib.sha256()
+    for name in modules:
+        path = getattr(sys.modules.get(name), "__file__", None)
+        try:
+            digest.update(Path(path).read_bytes() if path else name.encode())
+        except OSError:
+            digest.update(name.encode())
+    return digest.hexdigest()[:16]
+
+
+def parse_fingerprint(config: dict, module: str) -> str:
+    """
+    Identity of "how a page becomes rows" for a scraper: its parse-relevant config (selectors, item,
+    parse_mode, extract rules, parser, storage, ...) plus the code of `module` and PARSE_MODULES
+    """
+    relevant = {k: v for k, v in (config or {}).items() if k not in FETCH_ONLY_KEYS}
+    text = json.dumps(relevant, sort_keys=True, ensure_ascii=False, default=str)
+    digest = hashlib.sha256(text.encode("utf-8"))
+    digest.update(code_salt(PARSE_MODULES + (module,)).encode())
+    return digest.hexdigest()[:16]
+
+
+class PageCache:
+    """
+    Content-addressed raw page cache, keyed by cleaned URL:
+    - Bodies are stored once per content hash (<cache_dir>/<sha256>.html)
+    - index.json maps url -> {hash, etag, last_modified, fetched_at, output, parse_key, rows, sample}
+    - A run whose page is unchanged (HTTP 304 or same hash) can reuse the last output instead of re-parsing,
+      as long as it was parsed the same way (parse_key, see parse_fingerprint)
+    - A body no URL points to any more is deleted when its URL moves to new content
+    """
+
+    def __init__(self, cache_dir="backend/data/cache/pages"):
+        self.cache_dir = Path(cache_dir)
+        self.index_path = self.cache_dir / "index.json"
+        self._lock = threading.Lock()
+        self._index = None
+
+    # ------------------ index ------------------ #
+
+    def _load_index(self) -> dict:
+        if self._index is None:
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, ensure_ascii=False, default=str)
+        os.replace(tmp, self.index_path)
+
+    def get(self, url: str):
+        with self._lock:
+            entry = self._load_index().get(url)
+            return dict(entry) if entry else None
+
+    # ------------------ conditional fetch ------------------ #
+
+    def conditional_headers(self, url: str) -> dict:
+        """If-None-Match / If-Modified-Since for the last stored version of url"""
+        entry = self.get(url)
+        if not entry or not (self.cache_dir / f"{entry['hash']}.html").exists():
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def cached_body(self, url: str):
+        entry = self.get(url)
+        if not entry:
+            return None
+        try:
+            return (self.cache_dir / f"{entry['hash']}.html").read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def store(self, url: str, html: str, etag=None, last_modified=None) -> bool:
+        """
+        Store a freshly fetched body.
+
+        Returns:
+            bool: True if the content differs from the previously stored version.
+        """
+        digest = body_hash(html)
+        body_path = self.cache_dir / f"{digest}.html"
+        if not body_path.exists():
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = body_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(html, encoding="utf-8")
+            os.replace(tmp, body_path)
+
+        with self._lock:
+            index = self._load_index()
+            previous = index.get(url) or {}
+            changed = previous.get("hash") != digest
+            entry = dict(previous, hash=digest, etag=etag, last_modified=last_modified, fetched_at=time.time())
+            if changed:
+                # Output recorded for the old content no longer describes this page
+                for key in ("output", "parse_key", "rows", "sample"):
+                    entry.pop(key, None)
+            index[url] = entry
+            self._save_index()
+            old = previous.get("hash")
+            if changed and old and not any(e.get("hash") == old for e in index.values()):
+                # Rendered pages hash differently on almost every fetch: keep only bodies still referenced
+                try:
+                    (self.cache_dir / f"{old}.html").unlink()
+                except OSError:
+                    pass
+        return changed
+
+    def touch(self, url: str):
+        """Record a 304 revalidation"""
+        with self._lock:
+            entry = self._load_index().get(url)
+            if entry:
+                entry["fetched_at"] = time.time()
+                self._save_index()
+
+    # ------------------ last output ------------------ #
+
+    def record_output(self, url: str, output: str, rows: int, sample, parse_key: str = None):
+        with self._lock:
+            entry = self._load_index().get(url)
+            if entry:
+                entry.update(output=output, parse_key=parse_key, rows=rows, sample=sample)
+                self._save_index()
+
+    def unchanged_result(self, url: str, output: str, parse_key: str = None):
+        """
+        (rows, sample) from the last run if it wrote `output` for the current content with the same
+        parse_key (config and parsing code) and the file still exists
+        """
+        entry = self.get(url)
+        if not entry or entry.get("output") != output or entry.get("parse_key") != parse_key:
+            return None
+        if not Path(output).exists():
+            return None
+        return entry.get("rows", 0), entry.get("sample", [])
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> PageCache:
+    """Return the process-wide PageCache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PageCache()
+        return _cache
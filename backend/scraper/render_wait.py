@@ -0,0 +1,131 @@
+# backend/scraper/render_wait.py
+import time
+import logging
+
+# selenium is imported when a wait actually runs: building a RenderWaiter (config validation) stays cheap
+
+# Used when a config has no `render_wait` block: footer present, then scroll until the page stops growing
+DEFAULT_STEPS = [
+    {"type": "selector", "selector": "footer", "min_count": 1, "timeout": 20, "required": True},
+    {"type": "scroll_stable", "pause": 0.6, "stable_rounds": 2, "max_scrolls": 8, "timeout": 12},
+]
+
+# Installs a MutationObserver once per document and records the time of the last DOM change
+_MUTATION_PROBE_JS = """
+if (!window.__monagentMutations) {
+    window.__monagentMutations = {last: performance.now()};
+    new MutationObserver(function () {
+        window.__monagentMutations.last = performance.now();
+    }).observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+return performance.now() - window.__monagentMutations.last;
+"""
+
+# Resource Timing entries only appear once a request finishes, so a stable count means no new traffic
+_NETWORK_PROBE_JS = """
+return [document.readyState, performance.getEntriesByType('resource').length];
+"""
+
+
+class RenderWaiter:
+    """
+    Condition-driven readiness checks for rendered pages, configured per site:
+
+        render_wait:
+          - {type: selector, selector: "div[class*='TextBlock__TextHTML']", min_count: 5, timeout: 15}
+          - {type: dom_quiet, quiet_ms: 500, timeout: 8}
+          - {type: network_idle, idle_ms: 500, timeout: 8}
+          - {type: scroll_stable, pause: 0.5, stable_rounds: 2, max_scrolls: 8, timeout: 10}
+
+    Each step returns as soon as its condition holds. A timed-out step is logged and skipped,
+    unless it sets `required: true`, in which case the TimeoutException propagates (and the fetch retries).
+    """
+
+    def __init__(self, steps=None, poll: float = 0.1):
+        self.steps = list(steps) if steps else list(DEFAULT_STEPS)
+        self.poll = poll
+        for step in self.steps:
+            if not hasattr(self, f"_wait_{step.get('type')}"):
+                raise ValueError(f"Unknown render_wait step type: {step.get('type')}")
+
+    def wait(self, driver) -> dict:
+        """Run every step in order and return the seconds spent in each phase"""
+        from selenium.common.exceptions import TimeoutException
+
+        timings = {}
+        for i, step in enumerate(self.steps):
+            kind = step["type"]
+            name = step.get("name") or f"{i}:{kind}"
+            timeout = float(step.get("timeout", 10))
+            start = time.perf_counter()
+            try:
+                getattr(self, f"_wait_{kind}")(driver, step, timeout)
+            except TimeoutException:
+                timings[name] = round(time.perf_counter() - start, 3)
+                if step.get("required"):
+                    raise
+                logging.warning(f"render_wait: step {name} timed out after {timeout}s, continuing")
+                continue
+            timings[name] = round(time.perf_counter() - start, 3)
+        logging.info(f"render_wait timings: {timings}")
+        return timings
+
+    # ------------------ step implementations ------------------ #
+
+    def _until(self, driver, timeout, predicate, message):
+        from selenium.webdriver.support.ui import WebDriverWait
+        return WebDriverWait(driver, timeout, poll_frequency=self.poll).until(predicate, message)
+
+    def _wait_selector(self, driver, step, timeout):
+        selector = step["selector"]
+        min_count = int(step.get("min_count", 1))
+        js = "return document.querySelectorAll(arguments[0]).length;"
+        self._until(
+            driver, timeout,
+            lambda d: d.execute_script(js, selector) >= min_count,
+            f"fewer than {min_count} elements match {selector!r}",
+        )
+
+    def _wait_dom_quiet(self, driver, step, timeout):
+        quiet_ms = float(step.get("quiet_ms", 500))
+        self._until(
+            driver, timeout,
+            lambda d: d.execute_script(_MUTATION_PROBE_JS) >= quiet_ms,
+            f"DOM kept changing for {timeout}s",
+        )
+
+    def _wait_network_idle(self, driver, step, timeout):
+        idle = float(step.get("idle_ms", 500)) / 1000
+        state = {"count": -1, "since": time.monotonic()}
+
+        def idle_for_long_enough(d):
+            ready, count = d.execute_script(_NETWORK_PROBE_JS)
+            now = time.monotonic()
+            if ready != "complete" or count != state["count"]:
+                state["count"], state["since"] = count, now
+                return False
+            return now - state["since"] >= idle
+
+        self._until(driver, timeout, idle_for_long_enough, f"network not idle within {timeout}s")
+
+    def _wait_scroll_stable(self, driver, step, timeout):
+        """Scroll to the bottom until scrollHeight stays the same for `stable_rounds` checks"""
+        from selenium.common.exceptions import TimeoutException
+
+        pause = float(step.get("pause", 0.5))
+        stable_rounds = int(step.get("stable_rounds", 2))
+        max_scrolls = int(step.get("max_scrolls", 8))
+        deadline = time.monotonic() + timeout
+
+        last_height, stable = None, 0
+        for _ in range(max_scrolls):
+            height = driver.execute_script(
+                "window.scrollTo(0, document.body.scrollHeight); return document.body.scrollHeight;"
+            )
+            stable = stable + 1 if height == last_height else 0
+            if stable >= stable_rounds:
+                return
+            last_height = height
+            if time.monotonic() + pause > deadline:
+                raise TimeoutException(f"page height still changing after {timeout}s")
+            time.sleep(pause)
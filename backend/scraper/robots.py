@@ -0,0 +1,164 @@
+# backend/scraper/robots.py
+import re
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from urllib import robotparser
+from urllib.parse import urlsplit
+
+import requests
+
+from backend.scraper.http_client import get_http_client
+
+# Default User-Agent token matched against robots.txt rules
+ROBOTS_UA = "MonAgentCrawler"
+
+
+class RobotsCache:
+    """
+    One robots.txt resolver shared by every scraper in the process:
+    - Per-host (netloc) cache in memory and on disk (<cache_dir>/<netloc>.json)
+    - Entries live for `ttl` seconds, then are revalidated with If-None-Match / If-Modified-Since
+    - Fetch failures are cached as "disallow" for `negative_ttl` seconds (conservative, like before)
+    - Crawl-delay is pushed into the shared HttpClient rate limiter, which spaces both plain GETs and
+      DynamicScraper's browser page loads
+    """
+
+    def __init__(self, cache_dir="backend/data/cache/robots", ttl: float = 24 * 3600, negative_ttl: float = 600,
+                 user_agent: str = ROBOTS_UA):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.user_agent = user_agent
+        self._entries = {}  # netloc -> (entry dict, RobotFileParser)
+        self._lock = threading.Lock()
+        self._host_locks = {}
+
+    # ------------------ storage ------------------ #
+
+    def _disk_path(self, netloc: str) -> Path:
+        return self.cache_dir / (re.sub(r"[^A-Za-z0-9.-]", "_", netloc) + ".json")
+
+    def _read_disk(self, netloc: str):
+        try:
+            with open(self._disk_path(netloc), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, netloc: str, entry: dict):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self._disk_path(netloc), "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+        except OSError as e:
+            logging.warning(f"robots cache: could not write {netloc}: {e}")
+
+    # ------------------ fetch & parse ------------------ #
+
+    @staticmethod
+    def _build_parser(entry: dict) -> robotparser.RobotFileParser:
+        """Same status handling as RobotFileParser.read(), but from a cached entry"""
+        rp = robotparser.RobotFileParser()
+        status = entry.get("status")
+        if status in (401, 403) or entry.get("failed"):
+            rp.disallow_all = True
+        elif status is not None and 400 <= status < 500:
+            rp.allow_all = True
+        else:
+            rp.parse((entry.get("body") or "").splitlines())
+        return rp
+
+    def _fetch(self, netloc: str, scheme: str, previous):
+        robots_url = f"{scheme}://{netloc}/robots.txt"
+        headers = {}
+        if previous and not previous.get("failed"):
+            if previous.get("etag"):
+                headers["If-None-Match"] = previous["etag"]
+            if previous.get("last_modified"):
+                headers["If-Modified-Since"] = previous["last_modified"]
+
+        try:
+            r = get_http_client().get(robots_url, headers=headers, retries=1)
+        except requests.RequestException as e:
+            now = time.time()  # After the attempt: retries and rate limiting can outlast negative_ttl
+            logging.error(f"Failed to read robots.txt {robots_url}: {e}")
+            return {"scheme": scheme, "failed": True, "fetched_at": now, "expires": now + self.negative_ttl}
+
+        now = time.time()
+        if r.status_code == 304 and previous:
+            logging.info(f"robots.txt not modified: {robots_url}")
+            return dict(previous, fetched_at=now, expires=now + self.ttl)
+        if r.status_code >= 500:
+            logging.error(f"Failed to read robots.txt {robots_url}: HTTP {r.status_code}")
+            return {"scheme": scheme, "failed": True, "fetched_at": now, "expires": now + self.negative_ttl}
+
+        logging.info(f"robots.txt fetched: {robots_url} ({r.status_code})")
+        return {
+            "scheme": scheme,
+            "status": r.status_code,
+            "body": r.text if r.status_code < 400 else "",
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+            "fetched_at": now,
+            "expires": now + self.ttl,
+        }
+
+    def _policy(self, url: str) -> robotparser.RobotFileParser:
+        parts = urlsplit(url)
+        netloc = parts.netloc.lower()
+
+        cached = self._entries.get(netloc)
+        if cached and cached[0]["expires"] > time.time():
+            return cached[1]
+
+        with self._lock:
+            host_lock = self._host_locks.setdefault(netloc, threading.Lock())
+        # One fetch per host even when many threads ask at once
+        with host_lock:
+            cached = self._entries.get(netloc)
+            if cached and cached[0]["expires"] > time.time():
+                return cached[1]
+
+            entry = cached[0] if cached else self._read_disk(netloc)
+            if not entry or entry["expires"] <= time.time():
+                entry = self._fetch(netloc, parts.scheme or "https", entry)
+                self._write_disk(netloc, entry)
+
+            rp = self._build_parser(entry)
+            self._entries[netloc] = (entry, rp)
+
+        delay = rp.crawl_delay(self.user_agent)
+        if delay:
+            get_http_client().limiter.set_crawl_delay(netloc, float(delay))
+        return rp
+
+    # ------------------ public API ------------------ #
+
+    def allowed(self, url: str, ua: str = None) -> bool:
+        """Check if robots.txt allows `ua` to crawl url"""
+        return self._policy(url).can_fetch(ua or self.user_agent, url)
+
+    def crawl_delay(self, url: str, ua: str = None):
+        """Crawl-delay (seconds) declared for `ua` on url's host, or None"""
+        delay = self._policy(url).crawl_delay(ua or self.user_agent)
+        return float(delay) if delay is not None else None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_robots_cache() -> RobotsCache:
+    """Return the process-wide RobotsCache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = RobotsCache()
+        return _cache
@@ -0,0 +1,24 @@
+# backend/scraper/rows.py
+from typing import NamedTuple, Optional
+
+
+class Row(NamedTuple):
+    """
+    General output schema shared by the dynamic scraper, its sinks and the chatbot loader.
+    Tuple-backed with a fixed field order: no per-row dict, unset fields default to None.
+    """
+    type: Optional[str] = None
+    section_label: Optional[str] = None
+    title: Optional[str] = None
+    content: Optional[str] = None
+    units: Optional[int] = None
+    price: Optional[float] = None
+    member_fee_month: Optional[float] = None
+    phone: Optional[str] = None
+    email: Optional[str] = None
+    address: Optional[str] = None
+    hours: Optional[str] = None
+    link_text: Optional[str] = None
+    link_url: Optional[str] = None
+    source_url: Optional[str] = None
+
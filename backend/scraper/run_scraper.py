@@ -1,38 +1,60 @@
 # backend/scraper/run_scraper.py
+import sys
+import json
 
 from backend.config.config_loader import load_config
-from backend.scraper.base_scraper import BaseScraper
-from backend.scraper.dynamic_scraper import DynamicScraper
 
-def run_with_config(config_name="clubinject_scottsdale"):
+def build_scraper(config: dict):
     """
-    Run scraper using the given config name.
+    Create the scraper matching the config's mode.
+    The scraper modules are imported here, on first use, so importing this module (e.g. from the API)
+    does not load requests / bs4 / selenium.
     """
-
-    # Load the config file
-    config = load_config(config_name)
-
     # Detect mode
     mode = config.get("mode", "static").lower()
 
     # Use the BaseScraper type so the common run() interface is recognized by static analyzers
-    scraper: BaseScraper
+    scraper: "BaseScraper"
     if mode == "dynamic":
+        from backend.scraper.dynamic_scraper import DynamicScraper
         print("🔄 Using DynamicScraper...")
         scraper = DynamicScraper(config)
     else:
+        from backend.scraper.base_scraper import BaseScraper
         print("🧱 Using BaseScraper (static)...")
         scraper = BaseScraper(config)
+    return scraper
+
+def run_with_config(config_name="clubinject_scottsdale"):
+    """
+    Run scraper using the given config name.
+    """
+
+    # Load the config file
+    config = load_config(config_name)
 
     # Execute scraper
-    return scraper.run()
+    return build_scraper(config).run()
 
 
-def main():
-    rows, out_path, sample = run_with_config("clubinject_scottsdale")
-    print("Rows:", rows)
-    print("Output:", out_path)
-    print("Sample:", sample)
+def main(argv=None):
+    """
+    Usage:
+        python -m backend.scraper.run_scraper                       # clubinject_scottsdale
+        python -m backend.scraper.run_scraper "*"                   # every backend/config/*.yml, concurrently
+        python -m backend.scraper.run_scraper book_toscrape clubinject_scottsdale
+    """
+    args = sys.argv[1:] if argv is None else argv
+    if not args:
+        rows, out_path, sample = run_with_config("clubinject_scottsdale")
+        print("Rows:", rows)
+        print("Output:", out_path)
+        print("Sample:", sample)
+        return
+
+    from backend.scraper.batch_runner import run_batch
+    report = run_batch(args)
+    print(json.dumps(report, indent=2, ensure_ascii=False, default=str))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,271 @@
+# backend/scraper/scheduler.py
+"""
+Long-running scrape scheduler: one process replaces per-run cron jobs, so pandas / selenium are
+imported once and the shared browser pool, HTTP sessions, robots and page caches stay warm.
+
+Configs opt in with a `schedule` block:
+    schedule:
+      interval: "6h"        # seconds or "<n>s|m|h|d"
+      jitter: "10m"         # each run starts up to ± this much off the interval (default 10% of interval)
+      max_backoff: "1d"     # cap on the failure backoff (default: max(interval, 1d))
+      run_on_start: false   # first run right away instead of somewhere within the first interval
+
+Usage:
+    python -m backend.scraper.scheduler                  # every backend/config/*.yml with a schedule
+    python -m backend.scraper.scheduler "clubinject_*"   # a subset (names / globs)
+    python -m backend.scraper.scheduler --once           # run each scheduled config once and exit
+"""
+import re
+import json
+import time
+import heapq
+import signal
+import random
+import logging
+import argparse
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.config.config_loader import load_config, resolve_config_names
+from backend.scraper.batch_runner import DomainGate, run_one
+
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+STOP_POLL = 1.0  # Longest run_forever() sleeps before checking for a stop request
+
+
+def parse_duration(value) -> float:
+    """30, "30", "30s", "15m", "6h", "1d" -> seconds"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*", str(value).lower())
+    if not m:
+        raise ValueError(f"Invalid duration: {value!r}")
+    return float(m.group(1)) * _UNITS.get(m.group(2) or "s")
+
+
+class _Job:
+    """Per-config schedule state"""
+
+    def __init__(self, name: str, mode: str, schedule: dict):
+        self.name = name
+        self.mode = mode
+        self.interval = parse_duration(schedule["interval"])
+        self.jitter = parse_duration(schedule.get("jitter", self.interval * 0.1))
+        self.max_backoff = parse_duration(schedule.get("max_backoff", max(self.interval, 86400)))
+        self.run_on_start = bool(schedule.get("run_on_start", False))
+        self.next_run = 0.0
+        self.failures = 0
+        self.runs = 0
+        self.skipped = 0  # Due while the previous run was still going
+
+    def delay_after(self, ok: bool) -> float:
+        """Seconds until the next run: the interval with jitter, or exponential backoff after failures"""
+        if ok:
+            base = self.interval
+        else:
+            base = min(self.interval * 2 ** min(self.failures, 16), self.max_backoff)
+        return max(1.0, base + random.uniform(-self.jitter, self.jitter))
+
+
+class Scheduler:
+    """
+    Runs scheduled configs forever on bounded pools (static / dynamic, like run_batch),
+    never two runs of the same config at once, with per-domain politeness shared by all runs.
+    Each finished run appends one JSON line to `metrics_path`.
+    """
+
+    def __init__(self, configs="*", metrics_path="logs/scheduler_metrics.jsonl", static_workers: int = 4,
+                 dynamic_workers: int = 2, per_domain: int = 1, politeness_delay: float = 1.0,
+                 rescan_interval: float = 60.0):
+        self.specs = configs
+        self.metrics_path = Path(metrics_path) if metrics_path else None
+        self.rescan_interval = rescan_interval
+        self.gate = DomainGate(per_domain, politeness_delay)
+        self.jobs = {}
+        self._heap = []  # (next_run, name)
+        # Configs with a run in flight, by name: a config removed and re-added meanwhile gets a new _Job
+        self._running = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._record_lock = threading.Lock()  # Metrics file appends, kept off the scheduling lock
+        self._stop = threading.Event()
+        self._pools = {
+            "static": ThreadPoolExecutor(max_workers=max(1, static_workers), thread_name_prefix="sched-static"),
+            "dynamic": ThreadPoolExecutor(max_workers=max(1, dynamic_workers), thread_name_prefix="sched-dynamic"),
+        }
+
+    # ------------------ config discovery ------------------ #
+
+    def rescan(self):
+        """Pick up added / removed / edited schedules (config files are re-read on every run anyway)"""
+        now = time.time()
+        seen = set()
+        for name in resolve_config_names(self.specs):
+            try:
+                config = load_config(name) or {}
+                schedule = config.get("schedule")
+                if not schedule or schedule.get("enabled", True) is False:
+                    continue
+                job = _Job(name, (config.get("mode") or "static").lower(), schedule)
+            except Exception as e:
+                logging.warning(f"Scheduler: ignoring {name}: {e}")
+                continue
+            seen.add(name)
+            with self._lock:
+                current = self.jobs.get(name)
+                if current is not None:
+                    # Keep run state; take the new timing settings
+                    current.interval, current.jitter = job.interval, job.jitter
+                    current.max_backoff, current.mode = job.max_backoff, job.mode
+                    continue
+                job.next_run = now if job.run_on_start else now + random.uniform(0, job.interval)
+                self.jobs[name] = job
+                heapq.heappush(self._heap, (job.next_run, name))
+                logging.info(f"Scheduler: {name} every {job.interval:.0f}s (±{job.jitter:.0f}s), "
+                             f"first run in {job.next_run - now:.0f}s")
+        with self._lock:
+            for name in set(self.jobs) - seen:
+                logging.info(f"Scheduler: {name} no longer scheduled")
+                del self.jobs[name]
+            self._wake.notify()
+
+    # ------------------ running ------------------ #
+
+    def _dispatch(self, job: _Job):
+        self._running.add(job.name)
+        pool = self._pools["dynamic" if job.mode == "dynamic" else "static"]
+        pool.submit(self._run, job)
+
+    def _run(self, job: _Job):
+        started = time.time()
+        try:
+            result = run_one(job.name, self.gate)
+        except Exception as e:  # run_one already turns scrape failures into results
+            result = {"config": job.name, "status": "error", "error": f"{type(e).__name__}: {e}", "seconds": 0.0}
+        ok = result.get("status") == "success"
+        with self._lock:
+            self._running.discard(job.name)
+            job.runs += 1
+            job.failures = 0 if ok else job.failures + 1
+            delay = job.delay_after(ok)
+            job.next_run = time.time() + delay
+            if self.jobs.get(job.name) is job:
+                heapq.heappush(self._heap, (job.next_run, job.name))
+            self._wake.notify()
+        self._record({
+            "ts": round(started, 3),
+            "config": job.name,
+            "status": result.get("status"),
+            "changed": result.get("changed"),
+            "changes": result.get("changes"),
+            "rows": result.get("rows"),
+            "seconds": result.get("seconds"),
+            "error": result.get("error"),
+            "consecutive_failures": job.failures,
+            "skipped_overlaps": job.skipped,
+            "next_run_in": round(delay, 1),
+        })
+        log = logging.info if ok else logging.warning
+        log(f"Scheduler: {job.name} -> {result.get('status')} in {result.get('seconds')}s, "
+            f"next run in {delay:.0f}s" + ("" if ok else f" (failure #{job.failures}, backing off)"))
+        return result
+
+    def _record(self, entry: dict):
+        if self.metrics_path is None:
+            return
+        self.metrics_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._record_lock, open(self.metrics_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+
+    def run_forever(self):
+        self.rescan()
+        next_rescan = time.monotonic() + self.rescan_interval
+        with self._lock:
+            while not self._stop.is_set():
+                now = time.time()
+                while self._heap and self._heap[0][0] <= now:
+                    _, name = heapq.heappop(self._heap)
+                    job = self.jobs.get(name)
+                    if job is None or job.next_run > now:
+                        continue  # Removed, or a stale heap entry
+                    if name in self._running:
+                        # Overlap protection: a run is still going; try again one interval later
+                        job.skipped += 1
+                        job.next_run = now + job.delay_after(True)
+                        heapq.heappush(self._heap, (job.next_run, name))
+                        logging.warning(f"Scheduler: {name} still running, skipping this slot")
+                        continue
+                    self._dispatch(job)
+
+                timeout = next_rescan - time.monotonic()
+                if self._heap:
+                    timeout = min(timeout, self._heap[0][0] - time.time())
+                # Bounded so a stop requested from a signal handler (which cannot notify) is seen soon
+                self._wake.wait(min(max(0.05, timeout), STOP_POLL))
+
+                if time.monotonic() >= next_rescan:
+                    self._lock.release()
+                    try:
+                        self.rescan()
+                    finally:
+                        self._lock.acquire()
+                    next_rescan = time.monotonic() + self.rescan_interval
+
+    def run_once(self) -> list:
+        """Run every scheduled config once (respecting pools and politeness) and return the results"""
+        self.rescan()
+        with self._lock:
+            jobs = [j for j in self.jobs.values() if j.name not in self._running]
+            self._running.update(j.name for j in jobs)
+        futures = [self._pools["dynamic" if j.mode == "dynamic" else "static"].submit(self._run, j) for j in jobs]
+        return [f.result() for f in futures]
+
+    def request_stop(self):
+        """
+        Make run_forever() return within STOP_POLL seconds. Safe to call from a signal handler: it only sets
+        an event, since the handler runs on the main thread, which may already hold the scheduler lock.
+        """
+        self._stop.set()
+
+    def stop(self, wait: bool = True):
+        """Stop scheduling; runs in progress finish when wait=True"""
+        self.request_stop()
+        with self._lock:
+            self._wake.notify()
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("configs", nargs="*", default=["*"])
+    ap.add_argument("--once", action="store_true", help="Run each scheduled config once and exit")
+    ap.add_argument("--metrics", default="logs/scheduler_metrics.jsonl")
+    ap.add_argument("--static-workers", type=int, default=4)
+    ap.add_argument("--dynamic-workers", type=int, default=2)
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    scheduler = Scheduler(args.configs, metrics_path=args.metrics, static_workers=args.static_workers,
+                          dynamic_workers=args.dynamic_workers)
+    if args.once:
+        results = scheduler.run_once()
+        scheduler.stop()
+        print(json.dumps(results, indent=2, ensure_ascii=False, default=str))
+        return
+
+    def stop(signum, frame):
+        logging.info("Scheduler: stopping, waiting for running scrapes")
+        scheduler.request_stop()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    try:
+        scheduler.run_forever()
+    finally:
+        scheduler.stop(wait=True)
+
+
+if __name__ == "__main__":
+    main()
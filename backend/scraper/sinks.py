@@ -0,0 +1,330 @@
+# backend/scraper/sinks.py
+import os
+import csv
+import json
+import sqlite3
+import time
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import NamedTuple, Optional, get_args, get_type_hints
+
+
+class SinkResult(NamedTuple):
+    path: str
+    count: int
+    sample: list
+
+
+def as_dict(row) -> dict:
+    """Rows may be plain dicts or NamedTuple-style records"""
+    if isinstance(row, dict):
+        return row
+    return row._asdict()
+
+
+def file_size(path) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def field_names(row) -> list:
+    return list(row._fields) if hasattr(row, "_fields") else list(row)
+
+
+class BaseSink(ABC):
+    """
+    Streaming output writer selected by `storage.type`:
+    - write() consumes rows from any iterable (a generator is fine) and writes them in batches
+    - Output goes to a temporary file that atomically replaces `path` only after the last row,
+      so readers never see a half-written file and a failed run leaves the previous output intact
+    - Only a running count and the first `sample_size` rows are kept in memory
+    - Tuple-backed rows (e.g. rows.Row) are written without being turned into dicts
+    - Columns come from `fieldnames` or the first row; without `fieldnames`, keys that first appear in
+      a later dict row become new columns (earlier rows have no value for them)
+    """
+
+    def __init__(self, path, batch_size: int = 500, sample_size: int = 4, fieldnames=None, **options):
+        self.path = Path(path)
+        self.batch_size = max(1, int(batch_size))
+        self.sample_size = sample_size
+        self.fieldnames = list(fieldnames) if fieldnames else None
+        self._widen = not fieldnames  # Columns follow the rows only when the caller did not fix them
+        self.options = options
+        self.write_seconds = 0.0  # Time spent in the sink itself (not waiting on the row stream)
+
+    @abstractmethod
+    def _open(self, tmp_path: Path, first_row: dict):
+        """Create the output at tmp_path (first_row is {} when there are no rows)"""
+
+    @abstractmethod
+    def _write_batch(self, batch: list):
+        """Append a batch of rows"""
+
+    @abstractmethod
+    def _close(self):
+        """Flush and close the output; may be called again after a failure"""
+
+    def _add_fields(self, names: list):
+        """Columns appended to fieldnames after the sink was opened (nothing to do for self-describing rows)"""
+
+    def _new_fields(self, row) -> list:
+        if getattr(row, "_fields", None) == self._field_tuple:
+            return []
+        row = as_dict(row)
+        if self._field_set.issuperset(row):
+            return []
+        return [name for name in row if name not in self._field_set]
+
+    def write(self, rows) -> SinkResult:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        count, sample, batch = 0, [], []
+        opened = False
+        clock = time.perf_counter
+        spent = 0.0
+        try:
+            for row in rows:
+                if not opened:
+                    if self.fieldnames is None:
+                        self.fieldnames = field_names(row)
+                    self._field_tuple = tuple(self.fieldnames)
+                    self._field_set = set(self.fieldnames)
+                    start = clock()
+                    self._open(tmp, row)
+                    spent += clock() - start
+                    opened = True
+                if len(sample) < self.sample_size:
+                    sample.append(dict(as_dict(row)))
+                if self._widen:
+                    new = self._new_fields(row)
+                    if new:
+                        start = clock()
+                        if batch:  # Rows before this one keep the old columns
+                            self._write_batch(batch)
+                            batch = []
+                        self.fieldnames += new
+                        self._field_tuple = tuple(self.fieldnames)
+                        self._field_set.update(new)
+                        self._add_fields(new)
+                        spent += clock() - start
+                batch.append(row)
+                count += 1
+                if len(batch) >= self.batch_size:
+                    start = clock()
+                    self._write_batch(batch)
+                    spent += clock() - start
+                    batch = []
+            start = clock()
+            if not opened:
+                self._open(tmp, {})  # No rows: still produce an (empty) output file
+                opened = True
+            if batch:
+                self._write_batch(batch)
+            self._close()
+            os.replace(tmp, self.path)
+            self.write_seconds = spent + clock() - start
+        except BaseException:
+            if opened:
+                try:
+                    self._close()
+                except Exception:
+                    pass
+            tmp.unlink(missing_ok=True)
+            raise
+        return SinkResult(str(self.path), count, sample)
+
+    def _values(self, row):
+        """Row values in fieldnames order"""
+        if getattr(row, "_fields", None) == self._field_tuple:
+            return row
+        return [as_dict(row).get(name) for name in self.fieldnames]
+
+
+class CsvSink(BaseSink):
+    """
+    CSV with a header row. A column added after the first row means the header written at the top is
+    short: the file is rewritten once on close with the full header, earlier rows padded with empty cells.
+    """
+
+    def _open(self, tmp_path, first_row):
+        self._tmp = tmp_path
+        self._encoding = self.options.get("encoding", "utf-8-sig")
+        self._file = open(tmp_path, "w", newline="", encoding=self._encoding)
+        self._writer = csv.writer(self._file)
+        self._header = list(self.fieldnames or [])
+        if self._header:
+            self._writer.writerow(self._header)
+
+    def _write_batch(self, batch):
+        self._writer.writerows(self._values(row) for row in batch)
+
+    def _close(self):
+        if self._file.closed:
+            return
+        self._file.close()
+        if self.fieldnames and self.fieldnames != self._header:
+            self._rewrite_header()
+
+    def _rewrite_header(self):
+        fixed = self._tmp.with_name(self._tmp.name + ".header")
+        width = len(self.fieldnames)
+        with open(self._tmp, newline="", encoding=self._encoding) as src, \
+                open(fixed, "w", newline="", encoding=self._encoding) as dst:
+            reader, writer = csv.reader(src), csv.writer(dst)
+            if self._header:
+                next(reader, None)
+            writer.writerow(self.fieldnames)
+            writer.writerows(row + [""] * (width - len(row)) for row in reader)
+        os.replace(fixed, self._tmp)
+
+
+class JsonlSink(BaseSink):
+    """One JSON object per line"""
+
+    def _open(self, tmp_path, first_row):
+        self._file = open(tmp_path, "w", encoding="utf-8")
+
+    def _write_batch(self, batch):
+        self._file.write("".join(json.dumps(as_dict(row), ensure_ascii=False, default=str) + "\n" for row in batch))
+
+    def _close(self):
+        self._file.close()
+
+
+def arrow_schema(row_type, pa):
+    """
+    Arrow schema declared by a NamedTuple row type's annotations (str, int, float, bool, Optional[...]),
+    or None if any field has another type
+    """
+    types = {str: pa.string(), int: pa.int64(), float: pa.float64(), bool: pa.bool_()}
+    try:
+        hints = get_type_hints(row_type)
+    except Exception:
+        return None
+    fields = []
+    for name in row_type._fields:
+        hint = hints.get(name)
+        args = [a for a in get_args(hint) if a is not type(None)]
+        if hint is not None and args and hint == Optional[args[0]]:
+            hint = args[0]
+        if hint not in types:
+            return None
+        fields.append(pa.field(name, types[hint]))
+    return pa.schema(fields)
+
+
+class ParquetSink(BaseSink):
+    """
+    Parquet via pyarrow (optional dependency); one row group per batch.
+    Tuple rows with typed fields (rows.Row) use the schema their annotations declare. Otherwise each
+    batch's types are inferred and unified with the schema so far: a column that was all None, or
+    ints followed by floats, widens the schema, and the rows already written are rewritten once to match.
+    """
+
+    def _open(self, tmp_path, first_row):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("storage.type 'parquet' requires pyarrow: pip install pyarrow") from e
+        self._pa, self._pq = pa, pq
+        self._tmp = tmp_path
+        self._writer = None
+        self._schema = None
+        declared = None
+        if hasattr(first_row, "_fields") and tuple(first_row._fields) == tuple(self.fieldnames or ()):
+            declared = arrow_schema(type(first_row), pa)
+        self._declared = declared
+
+    def _write_batch(self, batch):
+        pa = self._pa
+        values = [self._values(row) for row in batch]
+        columns = {name: [v[i] for v in values] for i, name in enumerate(self.fieldnames)}
+        if self._declared is not None and len(columns) == len(self._declared):
+            table = pa.Table.from_pydict(columns, schema=self._declared)
+        else:
+            table = pa.Table.from_pydict(columns)
+        if self._schema is None:
+            self._schema = table.schema
+            self._writer = self._pq.ParquetWriter(self._tmp, self._schema)
+        elif table.schema != self._schema:
+            schema = pa.unify_schemas([self._schema, table.schema], promote_options="permissive")
+            if schema != self._schema:
+                self._rewrite(schema)
+            table = table.cast(schema)
+        self._writer.write_table(table)
+
+    def _rewrite(self, schema):
+        """Reopen the file with a wider schema, casting the row groups written so far"""
+        pa = self._pa
+        self._writer.close()
+        written = self._pq.read_table(self._tmp)
+        for field in schema:
+            if field.name not in written.column_names:
+                written = written.append_column(field.name, pa.nulls(len(written), field.type))
+        written = written.select(schema.names).cast(schema)
+        self._schema = schema
+        self._writer = self._pq.ParquetWriter(self._tmp, schema)
+        self._writer.write_table(written, row_group_size=self.batch_size)
+
+    def _close(self):
+        if self._writer is None and self._schema is None:
+            # No rows: write an empty table so the output file exists
+            self._pq.write_table(self._pa.table({name: [] for name in self.fieldnames or []}), self._tmp)
+        elif self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class SqliteSink(BaseSink):
+    """A SQLite table (storage.table, default "rows") in a database file that replaces the previous one"""
+
+    def _open(self, tmp_path, first_row):
+        self._table = self.options.get("table", "rows")
+        self._conn = sqlite3.connect(tmp_path)
+        cols = ", ".join(f'"{name}"' for name in self.fieldnames or ["_empty"])
+        self._conn.execute(f'CREATE TABLE "{self._table}" ({cols})')
+        marks = ", ".join("?" for _ in self.fieldnames or [])
+        self._insert = f'INSERT INTO "{self._table}" VALUES ({marks})'
+
+    def _write_batch(self, batch):
+        self._conn.executemany(self._insert, (self._values(row) for row in batch))
+
+    def _add_fields(self, names):
+        for name in names:
+            self._conn.execute(f'ALTER TABLE "{self._table}" ADD COLUMN "{name}"')
+        marks = ", ".join("?" for _ in self.fieldnames)
+        cols = ", ".join(f'"{name}"' for name in self.fieldnames)
+        self._insert = f'INSERT INTO "{self._table}" ({cols}) VALUES ({marks})'
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+
+SINKS = {
+    "csv": CsvSink,
+    "jsonl": JsonlSink,
+    "json_lines": JsonlSink,
+    "parquet": ParquetSink,
+    "sqlite": SqliteSink,
+}
+
+
+def make_sink(storage: dict, default_path: str = "output.csv", **kwargs) -> BaseSink:
+    """
+    Build the sink described by a config's `storage` block, e.g.
+        storage: {type: "jsonl", path: "backend/data/processed/site.jsonl", batch_size: 1000}
+    """
+    storage = storage or {}
+    kind = (storage.get("type") or "csv").lower()
+    if kind not in SINKS:
+        raise ValueError(f"Unsupported storage type: {kind}")
+    options = {k: v for k, v in storage.items() if k not in ("type", "path")}
+    options.update(kwargs)
+    return SINKS[kind](storage.get("path", default_path), **options)
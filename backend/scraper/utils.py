@@ -1,6 +1,5 @@
 # backend/scraper/utils.py
 from urllib.parse import urlsplit, urlunsplit
-from urllib import robotparser
 
 # Define a set of query parameter keys to be filtered out
 BLOCKED_QUERY_KEYS = {
@@ -28,20 +27,14 @@ def clean_url(url: str, strip_query_params: bool = True) -> str:
 def is_allowed_by_robots(url: str, ua: str = "MonAgentCrawler") -> bool:
     """
     Check if the URL is allowed to be crawled by robots.txt.
+    Uses the shared, cached robots resolver (see backend.scraper.robots).
 
     Parameters:
         url (str): The URL to check.
         ua (str): The User-Agent to use.
 
     Returns:
-        bool: True if crawling is allowed, False otherwise.
+        bool: True if crawling is allowed, False otherwise (also when robots.txt cannot be read).
     """
-    base = f"{urlsplit(url).scheme}://{urlsplit(url).netloc}"
-    rp = robotparser.RobotFileParser()
-    rp.set_url(f"{base}/robots.txt")
-    try:
-        rp.read()
-        return rp.can_fetch(ua, url)
-    except Exception:
-        # If reading fails, conservatively treat as not allowed
-        return False
+    from backend.scraper.robots import get_robots_cache
+    return get_robots_cache().allowed(url, ua)
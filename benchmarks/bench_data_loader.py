@@ -0,0 +1,91 @@
+# benchmarks/bench_data_loader.py
+"""
+ChatBot data loading and lookup: KnowledgeStore (csv module, one pass) vs the previous iterrows loader.
+
+"legacy" is load_business_data() before the store: one pandas Series per CSV row,
+then a linear scan over services for every unit-price question.
+
+Usage:
+    python -m benchmarks.bench_data_loader [--rows 1000 100000] [--lookups 100000]
+"""
+import os
+import argparse
+import tempfile
+import time
+import timeit
+import warnings
+
+import pandas as pd
+
+from benchmarks.fixtures import UNIT_PRICES, business_csv
+from backend.bot.knowledge_store import load_store
+
+
+def legacy_load(csv_path):
+    df = pd.read_csv(csv_path)
+    data = {"services": [], "about": None, "join_info": None, "pricing_summary": None, "testimonials": [],
+            "links": [], "address": None, "phone": None, "email": None}
+    for _, row in df.iterrows():
+        t = row["type"]
+        if t == "service":
+            data["services"].append({"units": row["units"], "price": row["price"],
+                                     "member_fee_month": row["member_fee_month"]})
+            if not data["address"] and pd.notna(row["address"]):
+                data["address"] = row["address"]
+            if not data["phone"] and pd.notna(row["phone"]):
+                data["phone"] = row["phone"]
+            if not data["email"] and pd.notna(row["email"]):
+                data["email"] = row["email"]
+        elif t == "about":
+            data["about"] = row["content"]
+        elif t == "join_info":
+            data["join_info"] = row["content"]
+        elif t == "pricing_summary":
+            data["pricing_summary"] = row["content"]
+        elif t == "testimonial":
+            data["testimonials"].append(row["content"])
+        elif t == "link":
+            data["links"].append({"text": row["link_text"], "url": row["link_url"]})
+    return data
+
+
+def legacy_price_answer(data, units):
+    for s in data.get("services", []):
+        if s["units"] == units:
+            return f"The price for {units} units is: ${s['price']}"
+    return f"Could not find pricing for {units} units."
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", type=int, nargs="+", default=[1000, 100_000])
+    ap.add_argument("--lookups", type=int, default=100_000)
+    args = ap.parse_args(argv)
+
+    warnings.simplefilter("ignore", pd.errors.DtypeWarning)  # The legacy loader reads every column untyped
+    queries = [u for u, _ in UNIT_PRICES] + [999]
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = business_csv(os.path.join(tmp, f"business_{rows}.csv"), rows)
+            print(f"\n{rows} rows ({os.path.getsize(path) / 1024:.0f} KB)")
+
+            start = time.perf_counter()
+            data = legacy_load(path)
+            t_legacy = time.perf_counter() - start
+            start = time.perf_counter()
+            store = load_store(path)
+            t_store = time.perf_counter() - start
+            print(f"  load  legacy {t_legacy * 1000:>9.1f} ms   store {t_store * 1000:>9.1f} ms   "
+                  f"{t_legacy / t_store:>6.1f}x")
+
+            for u in queries:
+                assert legacy_price_answer(data, u) == store.price_answer(u), u
+            n = args.lookups
+            t_scan = timeit.timeit(lambda: [legacy_price_answer(data, u) for u in queries], number=n // len(queries))
+            t_dict = timeit.timeit(lambda: [store.price_answer(u) for u in queries], number=n // len(queries))
+            print(f"  unit-price lookup  legacy {t_scan / n * 1e6:>7.2f} µs   store {t_dict / n * 1e6:>7.2f} µs   "
+                  f"{t_scan / t_dict:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/bench_extractors.py
+"""
+Micro-benchmark: compiled single-pass Extractor vs the previous per-scraper regex code.
+
+Usage:
+    python -m benchmarks.bench_extractors [--scales 1 10 100] [--repeat 50]
+"""
+import re
+import argparse
+import timeit
+
+from bs4 import BeautifulSoup
+
+from benchmarks.fixtures import clubinject_page
+from backend.scraper.extractors import get_extractor
+
+
+def legacy_dynamic_fields(full_text):
+    """DynamicScraper._parse_services_and_contact field extraction before the Extractor engine"""
+    unit_price = []
+    for m in re.finditer(r"(\d+)\s*Units?\s*\$([0-9]+(?:\.[0-9]{2})?)", full_text, re.I):
+        unit_price.append((int(m.group(1)), float(m.group(2))))
+    member_fee = None
+    mm = re.search(r"\$([0-9]+(?:\.[0-9]{2})?)\s*/\s*month", full_text, re.I)
+    if mm:
+        member_fee = float(mm.group(1))
+    phone = None
+    ph = re.search(r"\(\d{3}\)\s*\d{3}-\d{4}", full_text)
+    if ph:
+        phone = ph.group(0)
+    email = None
+    em = re.search(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", full_text)
+    if em:
+        email = em.group(0)
+    address = None
+    candidate_lines = []
+    for line in full_text.splitlines():
+        if "Scottsdale" in line and ("AZ" in line or "Arizona" in line):
+            candidate_lines.append(line.strip())
+    for line in candidate_lines:
+        if re.search(r"\d{3,}", line):
+            address = line.strip()
+            break
+    if not address and candidate_lines:
+        address = candidate_lines[-1].strip()
+    hours = None
+    for line in full_text.splitlines():
+        l = line.strip()
+        if not l:
+            continue
+        if re.search(r"(Mon|Tue|Wed|Thu|Fri|Sat|Sun)", l) and re.search(r"(AM|PM|am|pm)", l):
+            hours = l
+            break
+    return {"unit_price": unit_price, "member_fee": member_fee, "phone": phone, "email": email,
+            "address": address, "hours": hours}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    ap.add_argument("--repeat", type=int, default=50)
+    args = ap.parse_args(argv)
+
+    extractor = get_extractor({})
+    print(f"{'scale':>6} {'text KB':>8} {'legacy ms':>10} {'engine ms':>10} {'speedup':>8}")
+    for scale in args.scales:
+        text = BeautifulSoup(clubinject_page(scale), "html.parser").get_text("\n", strip=True)
+        assert extractor.extract(text) == legacy_dynamic_fields(text), "engine output differs from legacy"
+
+        legacy = min(timeit.repeat(lambda: legacy_dynamic_fields(text), number=args.repeat, repeat=3)) / args.repeat
+        engine = min(timeit.repeat(lambda: extractor.extract(text), number=args.repeat, repeat=3)) / args.repeat
+        print(f"{scale:>6} {len(text) / 1024:>8.1f} {legacy * 1000:>10.3f} {engine * 1000:>10.3f} "
+              f"{legacy / engine:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
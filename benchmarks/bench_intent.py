@@ -0,0 +1,64 @@
+# benchmarks/bench_intent.py
+"""
+Intent classification throughput: compiled keyword table vs the previous if-chain.
+
+"legacy" is IntentClassifier.classify before the compiled table plus ChatBot.chat's separate
+re.search for the unit number; "compiled" is IntentClassifier.match (intent and number in one call).
+The corpus is either chat-like sentences or random keyword soup (the equivalence-test generator).
+
+Usage:
+    python -m benchmarks.bench_intent [--corpus sentences|random] [--messages 20000] [--repeat 5]
+"""
+import argparse
+import timeit
+
+from backend.bot.intent_classifier import IntentClassifier
+from tests.test_bot import legacy_classify, legacy_units, random_messages
+
+SENTENCES = [
+    "Hi there, could you tell me how much 20 units of Botox would cost me?",
+    "Where exactly is the Scottsdale clinic located?",
+    "I'd like to know more about the membership plan please",
+    "Can you share some reviews from your customers?",
+    "What's the price of Dysport?",
+    "請問你們在哪裡？",
+    "What are your opening hours on Saturday?",
+    "Thanks!",
+]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--messages", type=int, default=20_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--corpus", choices=["sentences", "random"], default="sentences")
+    args = ap.parse_args(argv)
+
+    if args.corpus == "random":
+        messages = list(random_messages(args.messages, seed=1))
+    else:
+        messages = [SENTENCES[i % len(SENTENCES)] for i in range(args.messages)]
+    clf = IntentClassifier()
+    for m in messages:
+        intent = legacy_classify(m)
+        assert clf.match(m) == (intent, legacy_units(m) if intent == "unit_price" else None), m
+
+    def legacy():
+        for m in messages:
+            if legacy_classify(m) == "unit_price":
+                legacy_units(m)
+
+    def compiled():
+        for m in messages:
+            clf.match(m)
+
+    print(f"{len(messages)} messages, avg {sum(map(len, messages)) / len(messages):.0f} chars")
+    base = None
+    for name, fn in (("legacy", legacy), ("compiled", compiled)):
+        t = min(timeit.repeat(fn, number=args.repeat, repeat=3)) / args.repeat
+        base = base or t
+        print(f"  {name:<10} {len(messages) / t:>12,.0f} msg/s  {base / t:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
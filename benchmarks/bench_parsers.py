@@ -0,0 +1,70 @@
+# benchmarks/bench_parsers.py
+"""
+Parse-time benchmark per HTML parser backend on the checked-in sample pages (tests/pages/*.html),
+plus generated ClubInject pages at the given --scales.
+
+Each run does what DynamicScraper.parse_page needs: full text, Elfsight text blocks and links.
+"baseline" is the previous code path: BeautifulSoup(html, "html.parser") walked three times.
+
+Usage:
+    python -m benchmarks.bench_parsers [--pages DIR] [--scales 1 10 100] [--repeat 5]
+"""
+import argparse
+import timeit
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from benchmarks.fixtures import clubinject_page
+from backend.scraper.html_parser import BACKENDS, PageDocument, is_available
+
+BLOCKS = "div[class*='TextBlock__TextHTML']"
+PAGES = Path(__file__).resolve().parents[1] / "tests" / "pages"
+
+
+def baseline(html):
+    soup = BeautifulSoup(html, "html.parser")
+    soup.get_text("\n", strip=True)
+    [(tb.get("style", ""), tb.get_text("\n", strip=True)) for tb in soup.select(BLOCKS)]
+    [(a.get("href"), a.get_text(strip=True)) for a in soup.select("a[href]")]
+
+
+def with_backend(backend):
+    def run(html):
+        doc = PageDocument(html, backend)
+        doc.text()
+        doc.text_blocks(BLOCKS)
+        doc.links()
+    return run
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--pages", type=Path, default=PAGES, help="Directory of sample pages (*.html)")
+    ap.add_argument("--scales", type=int, nargs="*", default=[],
+                    help="Also time generated ClubInject pages at these scales")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    cases = [("baseline", baseline)]
+    cases += [(b, with_backend(b)) for b in reversed(BACKENDS) if is_available(b)]
+    missing = [b for b in BACKENDS if not is_available(b)]
+    if missing:
+        print(f"(not installed: {', '.join(missing)})")
+
+    pages = [(path.name, path.read_text(encoding="utf-8")) for path in sorted(args.pages.glob("*.html"))]
+    pages += [(f"scale {scale}", clubinject_page(scale)) for scale in args.scales]
+    if not pages:
+        ap.error(f"No *.html pages in {args.pages} and no --scales")
+
+    for label, html in pages:
+        print(f"\n{label}: {len(html) / 1024:.0f} KB")
+        base = None
+        for name, fn in cases:
+            t = min(timeit.repeat(lambda: fn(html), number=args.repeat, repeat=3)) / args.repeat
+            base = base or t
+            print(f"  {name:<18} {t * 1000:>9.2f} ms  {base / t:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
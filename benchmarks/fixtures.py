@@ -0,0 +1,136 @@
+# benchmarks/fixtures.py
+"""
+Deterministic stand-ins for the pages we scrape, rebuilt from what the checked-in CSVs record.
+`scale` multiplies the repeated parts (links, text blocks) to model larger pages.
+"""
+from html import escape
+
+UNIT_PRICES = [(20, "150.80"), (30, "226.20"), (40, "301.60"), (50, "377.00")]
+
+LOCATIONS = [
+    "mesa", "peoria", "scottsdale", "tucson", "brea", "burlingame", "costamesa", "glendale",
+    "mountain-view", "sandiego", "denver", "greenwood", "westminster", "austin", "northaustin",
+    "dallas", "houstongalleria", "houstonheights", "katy", "plano", "southlake", "woodlands",
+    "bellevue", "seattle",
+]
+
+ABOUT = ("ClubInject®<br>is a group of<br>Physicians<br>,<br>Practitioners<br>and<br>Registered Nurses"
+         "<br>focusing only on Botox®/Dysport® treatments in<br>24 cities.")
+MEMBERSHIP = ("We charge<br>$13 per unit for Botox®<br>for non - members and<br>$7.54/unit<br>for Members."
+              "<br>We charge<br>$5.20 per unit of Dysport®<br>for non - members and<br>$3.01/unit*"
+              "<br>for Members<br>Memberships are just<br>$9.72/month")
+REVIEW = "Amazing service, quick and painless. Google review, 5 stars from {name}."
+
+
+def _text_block(size: int, inner: str) -> str:
+    return (f'<div class="TextBlock__TextHTML-sc-1x2y3z" style="font-size: {size}px; color: #111">'
+            f"{inner}</div>")
+
+
+def clubinject_page(scale: int = 1) -> str:
+    """ClubInject-style location page: Elfsight text blocks, pricing lines, contact info and many links"""
+    nav = "".join(
+        f'<li><a href="/{loc}{"" if i == 0 else f"-{i}"}">ClubInject® {escape(loc.title())}</a></li>'
+        for i in range(scale) for loc in LOCATIONS
+    )
+    prices = "".join(f"<p>{u} Units</p><p>${p}</p>" for u, p in UNIT_PRICES)
+    reviews = "".join(_text_block(22, REVIEW.format(name=f"Client {i}")) for i in range(3 * scale))
+    generic = "".join(_text_block(22, f"Section {i}<br>Fast, friendly injectors in Scottsdale.")
+                      for i in range(5 * scale))
+    footer_links = "".join(
+        f'<a href="https://www.google.com/maps/reviews/data={i}">Review {i}</a>' for i in range(10 * scale)
+    )
+    return f"""<!DOCTYPE html>
+<html><head><title>Botox® / Dysport® Scottsdale Arizona — ClubInject®</title>
+<style>body {{ font-family: sans-serif; }}</style>
+<script>window.dataLayer = [];</script></head>
+<body>
+<header><a href="/cart">0</a><a href="/"></a><ul>{nav}</ul></header>
+<main>
+<section><h1>Botox® / Dysport® Scottsdale Arizona — ClubInject®</h1><p>It's all we do.</p>{prices}</section>
+<section class="elfsight">
+{_text_block(40, "About Us")}
+{_text_block(22, ABOUT)}
+{_text_block(40, "Joining is simple")}
+{_text_block(22, MEMBERSHIP)}
+{reviews}
+{generic}
+</section>
+<section><p>Hours</p><p>Mon–Fri 10AM–6PM</p><p>Sat 9AM–3PM</p></section>
+</main>
+<footer>
+<p>ClubInject® 7077 E Bell Rd Suite 501, Scottsdale AZ 85254</p>
+<a href="https://maps.app.goo.gl/ULdkW4DVQCFksQFR8">ClubInject® 7077 E Bell Rd Suite 501, Scottsdale AZ 85254</a>
+<a href="mailto:members@clubinject.com?">members@clubinject.com</a>
+<a href="sms:4805762246">(480) 576-2246</a>
+<a href="#top">Back to top</a>
+{footer_links}
+<a href="https://www.facebook.com/clubinject">Facebook</a>
+<a href="https://www.instagram.com/clubinject/">Instagram</a>
+<a href="/terms">Terms</a>
+</footer>
+</body></html>"""
+
+
+def books_listing_page(page: int, pages: int = 50, per_page: int = 20, root: bool = False) -> str:
+    """books.toscrape.com-style catalogue listing; `root` renders the site index (links into catalogue/)"""
+    prefix = "catalogue/" if root else ""
+    items = []
+    for i in range(per_page):
+        n = (page - 1) * per_page + i + 1
+        title = f"Book number {n} with a fairly long catalogue title"
+        items.append(
+            f'<li class="col-xs-6"><article class="product_pod">'
+            f'<div class="image_container"><a href="{prefix}book-{n}_{n}/index.html">'
+            f'<img src="media/cache/{n}.jpg" alt="{title}" class="thumbnail"></a></div>'
+            f'<p class="star-rating Three"></p>'
+            f'<h3><a href="{prefix}book-{n}_{n}/index.html" title="{title}">{title[:20]}...</a></h3>'
+            f'<div class="product_price"><p class="price_color">£{10 + n % 50}.{n % 100:02d}</p>'
+            f'<p class="instock availability">In stock</p></div></article></li>'
+        )
+    pager = f'<li class="current">Page {page} of {pages}</li>'
+    if page > 1:
+        pager = f'<li class="previous"><a href="{prefix}page-{page - 1}.html">previous</a></li>' + pager
+    if page < pages:
+        pager += f'<li class="next"><a href="{prefix}page-{page + 1}.html">next</a></li>'
+    return (
+        '<!DOCTYPE html><html lang="en-us"><head><meta charset="utf-8"><title>All products | Books to Scrape</title>'
+        '</head><body><div class="page_inner"><ul class="breadcrumb"><li><a href="index.html">Home</a></li></ul>'
+        f'<section><ol class="row">{"".join(items)}</ol><div><ul class="pager">{pager}</ul></div></section>'
+        '</div></body></html>'
+    )
+
+
+def business_csv(path, rows: int = 100_000) -> str:
+    """
+    A scraper CSV in the general row schema with `rows` rows: the real page's services, about,
+    pricing and membership rows, then testimonials and links repeated to fill it (units as floats, like pandas writes).
+    """
+    import csv
+
+    header = ["type", "section_label", "title", "content", "units", "price", "member_fee_month", "phone",
+              "email", "address", "hours", "link_text", "link_url", "source_url"]
+    src = "https://www.clubinject.com/scottsdale"
+    address = "ClubInject® 7077 E Bell Rd Suite 501, Scottsdale AZ 85254"
+    fixed = [["service", "Botox / Dysport", "Botox® / Dysport®", "It's all we do.", f"{u}.0", p, "9.72",
+              "(480) 576-2246", "members@clubinject.com", address, "", "", "", src] for u, p in UNIT_PRICES]
+    fixed += [
+        ["about", "About", "About Us", ABOUT.replace("<br>", "\n"), "", "", "", "", "", "", "", "", "", src],
+        ["pricing_summary", "Pricing", "Pricing Summary", MEMBERSHIP.replace("<br>", "\n"),
+         "", "", "", "", "", "", "", "", "", src],
+        ["join_info", "Join", "Membership", "Memberships are just\n$9.72/month", "", "", "", "", "", "", "", "",
+         "", src],
+    ]
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        w.writerows(fixed)
+        for i in range(max(0, rows - len(fixed))):
+            if i % 10 == 0:
+                w.writerow(["testimonial", "Testimonials", "Reviews", REVIEW.format(name=f"Client {i}"),
+                            "", "", "", "", "", "", "", "", "", src])
+            else:
+                loc = LOCATIONS[i % len(LOCATIONS)]
+                w.writerow(["link", "Link", loc.title(), "", "", "", "", "", "", "", "", loc.title(),
+                            f"https://www.clubinject.com/{loc}?ref={i}", src])
+    return str(path)
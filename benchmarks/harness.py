@@ -0,0 +1,341 @@
+# benchmarks/harness.py
+"""
+Offline benchmark suite: the scrape and chat hot paths timed against the local fixture site
+(benchmarks.site) at synthetic scales, with machine-readable results to diff between commits.
+
+Cases, per scale (the ClubInject page and books listings scaled to `scale` × the rows and links):
+    fetch_page           BaseScraper.fetch_page of /x<scale>/scottsdale (robots, HTTP, decode; no page cache)
+    parse_page.dynamic   DynamicScraper.parse_page on that page (the production ClubInject parser)
+    parse_page.units     BaseScraper.parse_page, clubinject_units mode
+    parse_page.books     BaseScraper.parse_page, book_toscrape selectors on one listing page
+    save_to_csv          DynamicScraper.save_to_csv of the parsed rows
+    crawl.books          BaseScraper.run of a 10-page book_toscrape crawl (fetch + parse + save)
+    load_business_data   on a 100 × scale row business CSV
+    classify             IntentClassifier.classify over 1000 × scale messages
+    retrieve             RetrievalIndex.search (top 3) over the text rows of a 100 × scale row business CSV
+    chat                 POST /chat over HTTP to the threaded server, bot loaded from a 100 × scale row CSV
+
+Everything writes into a scratch working directory (page / robots caches, outputs, logs, job queue),
+so the checkout is left untouched. Each case runs `--repeat` times or until `--budget` seconds are spent;
+min and median are reported.
+
+Usage:
+    python -m benchmarks.harness [--scales 1 10 100 1000] [--cases fetch_page chat] [--out results.json]
+    python -m benchmarks.harness --compare baseline.json [--threshold 0.25]   # exit 1 on regressions
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+import statistics
+import threading
+import contextlib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+CASES = ("fetch_page", "parse_page.dynamic", "parse_page.units", "parse_page.books", "save_to_csv",
+         "crawl.books", "load_business_data", "classify", "retrieve", "chat")
+CHAT_MESSAGES = ["Where are you located?", "membership", "phone number", "botox price", "Tell me about you",
+                 "reviews", "email", "what's this?"]
+
+
+def measure(fn, repeat: int = 5, budget: float = 10.0) -> tuple:
+    """Run fn() up to `repeat` times (at least once, stopping early past `budget` seconds): (times, last result)"""
+    times, result = [], None
+    deadline = time.perf_counter() + budget
+    while len(times) < repeat and (not times or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return times, result
+
+
+def summarize(case: str, scale: int, times: list, ops: int = 1, **extra) -> dict:
+    best = min(times)
+    return {
+        "case": case,
+        "scale": scale,
+        "runs": len(times),
+        "min_s": round(best, 6),
+        "median_s": round(statistics.median(times), 6),
+        "ops": ops,
+        "us_per_op": round(best / ops * 1e6, 3),
+        **extra,
+    }
+
+
+class Suite:
+    """Builds the scrapers / bot for each case against one running FixtureSite, inside the scratch dir"""
+
+    def __init__(self, site, workdir: Path, repeat: int, budget: float, concurrency: int):
+        self.site = site
+        self.workdir = workdir
+        self.repeat = repeat
+        self.budget = budget
+        self.concurrency = concurrency
+        self._html = {}
+        self._rows = {}
+        self._server = None
+
+    def _measure(self, fn):
+        return measure(fn, self.repeat, self.budget)
+
+    def _out(self, name: str) -> str:
+        return str(self.workdir / "out" / name)
+
+    def _clubinject_config(self, scale: int, **extra) -> dict:
+        return {"site_name": f"bench_clubinject_x{scale}", "target_url": self.site.url(f"/x{scale}/scottsdale"),
+                "page_cache": False, "http": {"min_interval": 0, "retries": 0},
+                "storage": {"type": "csv", "path": self._out(f"clubinject_x{scale}.csv")}, **extra}
+
+    def _books_config(self, scale: int, pages: int = 10) -> dict:
+        from backend.config.config_loader import load_config
+
+        config = dict(load_config("book_toscrape"))
+        config.update(site_name=f"bench_books_x{scale}", target_url=self.site.url(f"/x{scale}/"), page_cache=False,
+                      http={"min_interval": 0, "retries": 0},
+                      storage={"type": "csv", "path": self._out(f"books_x{scale}.csv")})
+        config["pagination"] = {**config.get("pagination", {}), "max_pages": pages}
+        config.pop("schedule", None)
+        return config
+
+    def html(self, scale: int) -> str:
+        if scale not in self._html:
+            from backend.scraper.base_scraper import BaseScraper
+            self._html[scale] = BaseScraper(self._clubinject_config(scale)).fetch_page()
+        return self._html[scale]
+
+    def dynamic_scraper(self, scale: int):
+        from backend.scraper.dynamic_scraper import DynamicScraper
+        return DynamicScraper(self._clubinject_config(scale))
+
+    # ------------------ cases ------------------ #
+
+    def fetch_page(self, scale):
+        from backend.scraper.base_scraper import BaseScraper
+
+        self.html(scale)  # Warm-up: the site renders and caches the page, robots.txt gets cached
+        scraper = BaseScraper(self._clubinject_config(scale))
+        times, html = self._measure(scraper.fetch_page)
+        return summarize("fetch_page", scale, times, bytes=len(html.encode("utf-8")))
+
+    def parse_page_dynamic(self, scale):
+        scraper, html = self.dynamic_scraper(scale), self.html(scale)
+        times, rows = self._measure(lambda: scraper.parse_page(html))
+        self._rows[scale] = rows
+        return summarize("parse_page.dynamic", scale, times, rows=len(rows), bytes=len(html.encode("utf-8")))
+
+    def parse_page_units(self, scale):
+        from backend.scraper.base_scraper import BaseScraper
+
+        scraper = BaseScraper(self._clubinject_config(scale, parse_mode="clubinject_units"))
+        html = self.html(scale)
+        times, rows = self._measure(lambda: scraper.parse_page(html))
+        return summarize("parse_page.units", scale, times, rows=len(rows))
+
+    def parse_page_books(self, scale):
+        from backend.scraper.base_scraper import BaseScraper
+
+        config = self._books_config(scale)
+        html = BaseScraper(config).fetch_page()
+        scraper = BaseScraper({**config, "pagination": {}})
+        times, rows = self._measure(lambda: scraper.parse_page(html))
+        return summarize("parse_page.books", scale, times, rows=len(rows), bytes=len(html.encode("utf-8")))
+
+    def save_to_csv(self, scale):
+        rows = self._rows.get(scale)
+        if rows is None:
+            rows = self.dynamic_scraper(scale).parse_page(self.html(scale))
+        scraper = self.dynamic_scraper(scale)
+        times, result = self._measure(lambda: scraper.save_to_csv(rows))
+        return summarize("save_to_csv", scale, times, rows=result.count, bytes=os.path.getsize(result.path))
+
+    def crawl_books(self, scale):
+        from backend.scraper.base_scraper import BaseScraper
+
+        scraper = BaseScraper(self._books_config(scale))
+        served = self.site.requests
+        times, (count, _, _) = self._measure(scraper.run)
+        return summarize("crawl.books", scale, times, rows=count, pages=scraper.crawl_stats.get("pages"),
+                         requests=(self.site.requests - served) // len(times))
+
+    def load_business_data(self, scale):
+        from benchmarks.fixtures import business_csv
+        from backend.bot.data_loader import load_business_data
+
+        path = business_csv(self._out(f"business_x{scale}.csv"), 100 * scale)
+        times, _ = self._measure(lambda: load_business_data(path))
+        return summarize("load_business_data", scale, times, rows=100 * scale, bytes=os.path.getsize(path))
+
+    def classify(self, scale):
+        from backend.bot.intent_classifier import IntentClassifier
+
+        classifier = IntentClassifier()
+        messages = [f"{m} ({i})" if i % 2 else m for i, m in enumerate(CHAT_MESSAGES * (125 * scale))]
+        times, _ = self._measure(lambda: [classifier.classify(m) for m in messages])
+        return summarize("classify", scale, times, ops=len(messages))
+
+    def retrieve(self, scale):
+        from benchmarks.fixtures import business_csv
+        from backend.bot.knowledge_store import load_store
+        from backend.bot.retrieval import RetrievalIndex
+
+        store = load_store(business_csv(self._out(f"business_x{scale}.csv"), 100 * scale))
+        start = time.perf_counter()
+        index = RetrievalIndex(store.documents, store.version)
+        build_s = time.perf_counter() - start
+        queries = ["quick and painless?", "registered nurses", "client 10", "which cities", "weather today"] * 200
+        times, _ = self._measure(lambda: [index.search(q) for q in queries])
+        return summarize("retrieve", scale, times, ops=len(queries), documents=len(index), build_s=round(build_s, 6))
+
+    def chat(self, scale):
+        from benchmarks.fixtures import business_csv
+        from benchmarks.load_test import run_load
+        from backend.bot.registry import DEFAULT_SITE
+        from backend.api.app import bots
+
+        # The default site's CSV (a relative path, resolved in the scratch dir) at this scale
+        business_csv(self.workdir / "backend/data/processed" / f"{DEFAULT_SITE}.csv", 100 * scale)
+        bots.get(DEFAULT_SITE).reload(wait=True)
+        host, port = self._serve()
+        total = 2000
+        run_load(host, port, 200, self.concurrency)  # Warm-up
+        times, res = self._measure(lambda: run_load(host, port, total, self.concurrency))
+        return summarize("chat", scale, times, ops=total, rps=res["rps"], p50_ms=res["p50_ms"],
+                         p99_ms=res["p99_ms"], errors=res["errors"])
+
+    def _serve(self):
+        if self._server is None:
+            from werkzeug.serving import make_server
+            from backend.api.app import app, start_background_services
+
+            logging.getLogger("werkzeug").setLevel(logging.WARNING)  # No per-request access log lines
+            self._server = make_server("127.0.0.1", 0, app, threaded=True)
+            start_background_services()
+            threading.Thread(target=self._server.serve_forever, name="bench-api", daemon=True).start()
+        return self._server.host, self._server.port
+
+    def close(self):
+        if self._server is not None:
+            from backend.api.app import stop_background_services
+
+            self._server.shutdown()
+            self._server.server_close()
+            stop_background_services(wait=True)
+
+    def run(self, case: str, scale: int) -> dict:
+        return getattr(self, case.replace(".", "_"))(scale)
+
+
+def prepare_workdir(path=None) -> Path:
+    """Scratch dir laid out like the repo root: the chat case needs the default site's CSV at its relative path"""
+    workdir = Path(path or tempfile.mkdtemp(prefix="monagent-bench-")).resolve()
+    processed = workdir / "backend/data/processed"
+    processed.mkdir(parents=True, exist_ok=True)
+    (workdir / "out").mkdir(exist_ok=True)
+    for csv_path in (ROOT / "backend/data/processed").glob("*.csv"):
+        if not (processed / csv_path.name).exists():
+            shutil.copy(csv_path, processed / csv_path.name)
+    return workdir
+
+
+def environment() -> dict:
+    from backend.scraper.html_parser import BACKENDS, is_available
+
+    commit = None
+    head = ROOT / ".git" / "HEAD"
+    with contextlib.suppress(OSError):
+        ref = head.read_text().strip()
+        commit = (ROOT / ".git" / ref[5:]).read_text().strip() if ref.startswith("ref: ") else ref
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "parsers": [b for b in BACKENDS if is_available(b)],
+        "commit": commit,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare(results: list, baseline: list, threshold: float) -> list:
+    """Cases whose min time grew by more than `threshold` (0.25 = 25%) against the baseline"""
+    previous = {(r["case"], r["scale"]): r for r in baseline}
+    regressions = []
+    for r in results:
+        old = previous.get((r["case"], r["scale"]))
+        if old and old["min_s"] > 0 and r["min_s"] / old["min_s"] > 1 + threshold:
+            regressions.append({"case": r["case"], "scale": r["scale"], "baseline_s": old["min_s"],
+                                "min_s": r["min_s"], "ratio": round(r["min_s"] / old["min_s"], 2)})
+    return regressions
+
+
+def run_suite(scales=(1, 10, 100), cases=CASES, repeat: int = 5, budget: float = 10.0, concurrency: int = 4,
+              workdir=None, quiet: bool = True, progress=None) -> dict:
+    """Run the cases at each scale from inside a scratch dir and return {"environment", "results"}"""
+    from benchmarks.site import FixtureSite
+
+    workdir = prepare_workdir(workdir)
+    cwd = os.getcwd()
+    results = []
+    os.chdir(workdir)
+    try:
+        with FixtureSite() as site:
+            suite = Suite(site, workdir, repeat, budget, concurrency)
+            try:
+                for scale in scales:
+                    for case in cases:
+                        with open(os.devnull, "w") as devnull, \
+                                contextlib.redirect_stdout(devnull if quiet else sys.stdout):
+                            result = suite.run(case, scale)
+                        results.append(result)
+                        if progress:
+                            progress(result)
+            finally:
+                suite.close()
+    finally:
+        os.chdir(cwd)
+    return {"environment": environment(), "workdir": str(workdir), "results": results}
+
+
+def _print_result(r: dict):
+    extra = "   ".join(f"{k} {r[k]}" for k in ("rows", "bytes", "rps", "p99_ms") if k in r)
+    print(f"{r['case']:<19} x{r['scale']:<5} min {r['min_s'] * 1000:>10.2f} ms   "
+          f"median {r['median_s'] * 1000:>10.2f} ms   {r['us_per_op']:>12.2f} µs/op   {extra}", flush=True)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100, 1000])
+    ap.add_argument("--cases", nargs="+", default=list(CASES), choices=CASES)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--budget", type=float, default=10.0, help="Seconds per case before repeats stop early")
+    ap.add_argument("--concurrency", type=int, default=4, help="Client threads for the chat case")
+    ap.add_argument("--workdir", help="Scratch directory (default: a new temporary directory)")
+    ap.add_argument("--out", default="bench_results.json")
+    ap.add_argument("--compare", help="Baseline results JSON from an earlier run")
+    ap.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown before a case counts as regressed")
+    args = ap.parse_args(argv)
+
+    report = run_suite(args.scales, args.cases, args.repeat, args.budget, args.concurrency, args.workdir,
+                       progress=_print_result)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            report["regressions"] = compare(report["results"], json.load(f)["results"], args.threshold)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Results written to {args.out}")
+
+    for r in report.get("regressions", []):
+        print(f"REGRESSION {r['case']} x{r['scale']}: {r['baseline_s'] * 1000:.2f} ms -> {r['min_s'] * 1000:.2f} ms "
+              f"({r['ratio']}x)")
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
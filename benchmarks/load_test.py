@@ -0,0 +1,142 @@
+# benchmarks/load_test.py
+"""
+/chat load test: requests/sec and p50 / p99 latency per serving mode.
+
+Each mode is started as a subprocess on a free local port, warmed up, then hit by `--concurrency`
+client threads (keep-alive connections) for `--requests` POSTs in total.
+
+Modes:
+    dev       app.run() — Flask's development server (what `python backend/api/app.py` uses, minus debug)
+    threaded  python -m backend.api.serve --mode threaded
+    prefork   python -m backend.api.serve --mode prefork (skipped when gunicorn is not installed)
+
+Usage:
+    python -m benchmarks.load_test [--modes dev threaded prefork] [--requests 5000] [--concurrency 16]
+    python -m benchmarks.load_test --url http://127.0.0.1:5000     # an already running server
+"""
+import sys
+import json
+import time
+import socket
+import argparse
+import threading
+import subprocess
+import http.client
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from backend.api.serve import gunicorn_available
+
+ROOT = Path(__file__).resolve().parents[1]
+MESSAGES = ["Where are you located?", "How much for 20 units?", "membership", "phone number", "botox price",
+            "Tell me about you", "reviews", "30 units please"]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _server_cmd(mode, port, workers, threads):
+    if mode == "dev":
+        code = f"from backend.api.app import app; app.run(host='127.0.0.1', port={port})"
+        return [sys.executable, "-c", code]
+    return [sys.executable, "-m", "backend.api.serve", "--mode", mode, "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--threads", str(threads)]
+
+
+def _wait_ready(host, port, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            conn.request("GET", "/")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server on {host}:{port} did not become ready")
+
+
+def run_load(host, port, total, concurrency) -> dict:
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    counter = iter(range(total))
+
+    def client():
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        mine = []
+        for i in counter:
+            body = json.dumps({"message": MESSAGES[i % len(MESSAGES)]})
+            start = time.perf_counter()
+            try:
+                conn.request("POST", "/chat", body, {"Content-Type": "application/json"})
+                resp = conn.getresponse()
+                resp.read()
+                ok = resp.status == 200
+            except OSError:
+                ok = False
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=30)
+            mine.append(time.perf_counter() - start)
+            if not ok:
+                with lock:
+                    errors[0] += 1
+        with lock:
+            latencies.extend(mine)
+
+    start = time.perf_counter()
+    pool = [threading.Thread(target=client) for _ in range(concurrency)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+    return {"requests": len(latencies), "errors": errors[0], "seconds": round(elapsed, 3),
+            "rps": round(len(latencies) / elapsed, 1), "p50_ms": round(pct(0.50), 2), "p99_ms": round(pct(0.99), 2)}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--modes", nargs="+", default=["dev", "threaded", "prefork"],
+                    choices=["dev", "threaded", "prefork"])
+    ap.add_argument("--requests", type=int, default=5000)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--threads", type=int, default=4)
+    ap.add_argument("--url", help="Load-test a running server instead of starting one per mode")
+    args = ap.parse_args(argv)
+
+    if args.url:
+        u = urlsplit(args.url)
+        _wait_ready(u.hostname, u.port or 80)
+        print(json.dumps({"url": args.url, **run_load(u.hostname, u.port or 80, args.requests, args.concurrency)}))
+        return
+
+    results = []
+    for mode in args.modes:
+        if mode == "prefork" and not gunicorn_available():
+            print(f"{mode:<9} skipped (gunicorn not installed)")
+            continue
+        port = _free_port()
+        proc = subprocess.Popen(_server_cmd(mode, port, args.workers, args.threads), cwd=ROOT,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            _wait_ready("127.0.0.1", port)
+            run_load("127.0.0.1", port, min(200, args.requests), args.concurrency)  # Warm-up
+            res = {"mode": mode, **run_load("127.0.0.1", port, args.requests, args.concurrency)}
+        finally:
+            proc.terminate()
+            proc.wait(timeout=60)
+        results.append(res)
+        print(f"{mode:<9} {res['rps']:>9.1f} req/s   p50 {res['p50_ms']:>7.2f} ms   p99 {res['p99_ms']:>7.2f} ms   "
+              f"errors {res['errors']}")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# benchmarks/site.py
+"""
+Local stand-in for the sites we scrape: serves the benchmarks.fixtures pages over HTTP so fetch,
+crawl and end-to-end runs can be measured offline and repeatably.
+
+A `/x<scale>` path prefix selects the synthetic scale (default 1):
+    /robots.txt                       allow-all robots file
+    /x100/scottsdale                  ClubInject Scottsdale page, clubinject_page(100)
+    /x10/ or /x10/index.html          books.toscrape index (20 × 10 books per page)
+    /x10/catalogue/page-3.html        books.toscrape listing page 3
+
+Responses carry an ETag (If-None-Match gets a 304) and are gzip-compressed when the client accepts it,
+like the real sites. Rendered pages are cached, so timings measure the client rather than the generator.
+
+    with FixtureSite() as site:
+        BaseScraper({"target_url": site.url("/x10/scottsdale"), ...}).fetch_page()
+"""
+import re
+import gzip
+import hashlib
+import threading
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.fixtures import books_listing_page, clubinject_page
+
+ROBOTS = "User-agent: *\nAllow: /\n"
+BOOK_PAGES = 50
+_PATH_RE = re.compile(r"^(?:/x(?P<scale>\d+))?(?P<route>/[^?#]*)")
+
+
+@lru_cache(maxsize=128)
+def _render(route: str, scale: int):
+    """route -> (body bytes, gzip body, etag), or None for unknown paths"""
+    if route == "/robots.txt":
+        text = ROBOTS
+    elif route == "/scottsdale":
+        text = clubinject_page(scale)
+    elif route in ("/", "/index.html"):
+        text = books_listing_page(1, BOOK_PAGES, 20 * scale, root=True)
+    else:
+        m = re.fullmatch(r"/catalogue/page-(\d+)\.html", route)
+        if not m or not 1 <= int(m.group(1)) <= BOOK_PAGES:
+            return None
+        text = books_listing_page(int(m.group(1)), BOOK_PAGES, 20 * scale)
+    body = text.encode("utf-8")
+    return body, gzip.compress(body, 6), '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real sites
+    disable_nagle_algorithm = True  # Headers and body go out in separate writes: avoid the delayed-ACK stall
+
+    def do_GET(self):
+        m = _PATH_RE.match(self.path)
+        page = _render(m.group("route"), int(m.group("scale") or 1)) if m else None
+        if page is None:
+            self._reply(404, b"Not found", "text/plain")
+            return
+        body, compressed, etag = page
+        if self.headers.get("If-None-Match") == etag:
+            self._reply(304, b"", None, etag)
+            return
+        ctype = "text/plain" if m.group("route") == "/robots.txt" else "text/html"
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            self._reply(200, compressed, ctype, etag, "gzip")
+        else:
+            self._reply(200, body, ctype, etag)
+
+    def _reply(self, status, body, ctype, etag=None, encoding=None):
+        self.send_response(status)
+        if ctype:
+            self.send_header("Content-Type", f"{ctype}; charset=utf-8")
+        if etag:
+            self.send_header("ETag", etag)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.requests += 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureSite:
+    """The fixture server on a free local port, run in a daemon thread (a context manager)"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.server = ThreadingHTTPServer((host, port), _Handler)
+        self.server.daemon_threads = True
+        self.server.requests = 0
+        self.host, self.port = self.server.server_address[:2]
+        self._thread = None
+
+    def url(self, path: str = "/") -> str:
+        return f"http://{self.host}:{self.port}{path}"
+
+    @property
+    def requests(self) -> int:
+        """Responses served so far"""
+        return self.server.requests
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="fixture-site", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
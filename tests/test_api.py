@@ -0,0 +1,183 @@
+import os
+import sys
+import json
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Cold start of a chat-only process: importing the app and answering /chat
+HEAVY_MODULES = ("pandas", "numpy", "bs4", "requests", "selenium", "webdriver_manager", "lxml", "selectolax")
+IMPORT_SECONDS_BUDGET = 0.75  # ~0.2 s now; pandas + selenium + the bot load at import took ~0.9 s
+RSS_MB_BUDGET = 80  # ~35 MB now; ~135 MB with the scraping stack and pandas loaded
+
+_PROBE = """
+import sys, time, json, resource
+start = time.perf_counter()
+import backend.api.app as api
+seconds = time.perf_counter() - start
+reply = api.app.test_client().post("/chat", json={"message": "How much for 20 units?"}).get_json()
+print(json.dumps({
+    "seconds": seconds,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy": [m for m in HEAVY if m in sys.modules],
+    "reply": reply,
+}))
+"""
+
+
+def _probe(tmp_path) -> dict:
+    code = f"HEAVY = {HEAVY_MODULES!r}\n" + _PROBE
+    env = dict(os.environ, MONAGENT_JOBS_DB=str(tmp_path / "jobs.sqlite3"))  # Keep the checkout clean
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True,
+                         timeout=60, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def test_chat_process_cold_start_budget(tmp_path):
+    result = _probe(tmp_path)
+    assert result["heavy"] == []  # The scraping stack and pandas load on first scrape only
+    assert result["reply"]["reply"].startswith("The price for 20 units is")
+    assert result["seconds"] < IMPORT_SECONDS_BUDGET, result
+    assert result["rss_mb"] < RSS_MB_BUDGET, result
+
+
+def _job_queue(tmp_path, monkeypatch, release):
+    from backend.api import jobs
+
+    def run_one(name, gate):
+        release.wait(10)
+        return {"config": name, "status": "success", "changed": True, "rows": 3, "seconds": 0.0}
+
+    monkeypatch.setattr(jobs, "run_one", run_one)
+    return jobs.JobQueue(db_path=tmp_path / "jobs.sqlite3", per_domain=4, politeness_delay=0)
+
+
+def test_job_queue_dedups_across_processes_and_persists(tmp_path, monkeypatch):
+    import threading
+
+    release = threading.Event()
+    queues = [_job_queue(tmp_path, monkeypatch, release) for _ in range(4)]  # As if one per worker process
+    results = []
+    threads = [threading.Thread(target=lambda q=q: results.append(q.submit("book_toscrape"))) for q in queues]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({job["job_id"] for job, _ in results}) == 1
+    assert sorted(dedup for _, dedup in results) == [False, True, True, True]
+
+    release.set()
+    for q in queues:
+        q.shutdown(wait=True)
+    job_id = results[0][0]["job_id"]
+    reopened = _job_queue(tmp_path, monkeypatch, release)
+    assert reopened.get(job_id)["status"] == "success" and reopened.get(job_id)["rows"] == 3
+    assert reopened.submit("book_toscrape")[1] is False  # Finished jobs are not reused
+    reopened.shutdown(wait=True)
+
+
+def test_job_queue_requeues_jobs_of_dead_processes(tmp_path, monkeypatch):
+    import socket
+    import sqlite3
+    import threading
+
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    release = threading.Event()
+    release.set()
+    queue = _job_queue(tmp_path, monkeypatch, release)
+    conn = sqlite3.connect(tmp_path / "jobs.sqlite3")
+    with conn:
+        conn.execute("INSERT INTO jobs (id, config, mode, status, created_at, started_at, owner) "
+                     "VALUES ('interrupted', 'book_toscrape', 'static', 'running', 1, 2, ?)",
+                     (f"{socket.gethostname()}:{dead.pid}",))
+        conn.execute("INSERT INTO jobs (id, config, mode, status, created_at, started_at, owner) "
+                     "VALUES ('alive', 'book_toscrape', 'static', 'running', 1, 2, ?)",
+                     (f"{socket.gethostname()}:{os.getpid()}",))
+    conn.close()
+    queue.start()
+    queue.shutdown(wait=True)
+    assert queue.get("interrupted")["status"] == "success"  # Re-queued, claimed and run again
+    assert queue.get("alive")["status"] == "running"  # Its process still runs it
+
+
+def test_metrics_render_and_disabled_path(monkeypatch):
+    from backend import metrics
+
+    registry = metrics.MetricsRegistry()
+    registry.observe("monagent_chat_seconds", 0.003, {"endpoint": "chat"})
+    registry.observe("monagent_chat_seconds", 0.2, {"endpoint": "chat"})
+    registry.inc("monagent_chat_intent_total", 2, {"intent": 'say "hi"\n'})
+    text = registry.render()
+    assert "# TYPE monagent_chat_seconds histogram" in text
+    assert 'monagent_chat_seconds_bucket{endpoint="chat",le="0.005"} 1' in text
+    assert 'monagent_chat_seconds_bucket{endpoint="chat",le="+Inf"} 2' in text
+    assert 'monagent_chat_seconds_count{endpoint="chat"} 2' in text
+    assert 'monagent_chat_intent_total{intent="say \\"hi\\"\\n"} 2' in text
+
+    monkeypatch.setattr(metrics, "_enabled", False)
+    spans = []
+    with metrics.span("fetch", spans, site="s") as span:
+        span.add(bytes=10)
+    assert metrics.record_phase("parse", 0.1, spans) is None and spans == []
+    metrics.inc("monagent_chat_messages_total", endpoint="disabled_test")
+    assert "disabled_test" not in metrics.get_metrics().render()
+
+
+def test_metrics_sum_across_processes(tmp_path, monkeypatch):
+    from backend import metrics
+
+    code = ("from backend import metrics; metrics.set_shared_dir({d!r}); "
+            "metrics.inc('monagent_chat_messages_total', 2, endpoint='chat'); "
+            "metrics.record_phase('fetch', 0.01, site='s')").format(d=str(tmp_path))
+    for _ in range(2):  # Two workers that have since exited
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, timeout=60)
+    monkeypatch.setattr(metrics, "_registry", metrics.MetricsRegistry())
+    monkeypatch.setattr(metrics, "_shared_dir", str(tmp_path))
+    metrics.inc("monagent_chat_messages_total", 1, endpoint="chat")
+    text = metrics.get_metrics().render()
+    assert 'monagent_chat_messages_total{endpoint="chat"} 5' in text
+    assert 'monagent_scrape_phase_seconds_count{phase="fetch",site="s"} 2' in text
+    assert len(list(tmp_path.glob("metrics-*.json"))) == 3
+
+
+def _client(monkeypatch):
+    import backend.api.app as api
+
+    monkeypatch.setattr(api, "_services_pid", os.getpid())  # No watcher or job queue for these requests
+    return api, api.app.test_client()
+
+
+def test_chat_batch_orders_replies_across_sites(monkeypatch):
+    api, client = _client(monkeypatch)
+    messages = ["How much for 20 units?", {"message": "hi", "site": "no_such_site"},
+                {"message": "How much for 40 units?", "site": api.DEFAULT_SITE}, "How much for 20 units?"]
+    body = client.post("/chat/batch", json={"messages": messages}).get_json()
+
+    single = client.post("/chat", json={"message": "How much for 40 units?"}).get_json()["reply"]
+    assert body["replies"][0].startswith("The price for 20 units is")
+    assert body["replies"][1] is None
+    assert body["replies"][2] == single
+    assert body["replies"][3] == body["replies"][0]
+    assert [(e["index"], e["site"]) for e in body["errors"]] == [(1, "no_such_site")]
+    assert body["meta"]["count"] == 4 and body["meta"]["sites"] == 2
+
+
+def test_chat_batch_rejects_bad_input(monkeypatch):
+    api, client = _client(monkeypatch)
+    post = lambda data: client.post("/chat/batch", json=data)
+    assert post({"messages": "hi"}).status_code == 400
+    assert post({"messages": [{"message": 3}]}).status_code == 400
+    assert post({"messages": [{"message": "hi", "site": ["a"]}]}).status_code == 400
+    assert post({"messages": ["hi"], "site": {"name": "a"}}).status_code == 400
+    assert post({"messages": ["hi"] * (api.MAX_BATCH + 1)}).status_code == 413
+    assert post({"messages": []}).get_json()["replies"] == []
+
+
+def test_chat_rejects_bad_sites(monkeypatch):
+    api, client = _client(monkeypatch)
+    assert client.post("/chat", json={"message": "hi", "site": {"a": 1}}).status_code == 400
+    assert client.post("/chat", json={"message": "hi", "site": "../config"}).status_code == 404
+    assert client.post("/chat", json={"message": "hi", "site": "no_such_site"}).status_code == 404
+    assert api.bots._loading == {}
@@ -0,0 +1,244 @@
+import re
+import random
+
+import pytest
+
+from backend.bot.intent_classifier import INTENT_KEYWORDS, IntentClassifier
+
+
+def legacy_classify(message: str) -> str:
+    """IntentClassifier.classify before the compiled matcher"""
+    msg = message.lower().strip()
+    if any(k in msg for k in ["address", "在哪", "location", "where"]):
+        return "address"
+    if any(k in msg for k in ["phone", "電話"]):
+        return "phone"
+    if "email" in msg or "mail" in msg:
+        return "email"
+    if any(k in msg for k in ["about", "你們是誰", "介紹", "who are you"]):
+        return "about"
+    if any(k in msg for k in ["member", "membership", "加入", "會員"]):
+        return "join"
+    if any(k in msg for k in ["review", "評論", "評價"]):
+        return "review"
+    if re.search(r"(\d+)\s*units?", msg):
+        return "unit_price"
+    if any(k in msg for k in ["botox", "dysport", "價格", "price"]):
+        return "pricing"
+    return "unknown"
+
+
+def legacy_units(message: str):
+    """ChatBot.chat's unit-number extraction before the compiled matcher"""
+    m = re.search(r"(\d+)", message)
+    return int(m.group(1)) if m else None
+
+
+KEYWORDS = [k for _, keywords in INTENT_KEYWORDS if keywords for k in keywords]
+FILLER = ["how much", "is", "the", "for", "?", "!", "請問", "多少", "Units", "UNIT", "unit", "units",
+          "20", "30units", "7", "ph", "one", "mem", "rev", "  ", "\n", "$", "wh", "ere", "ail"]
+
+MESSAGES = [
+    "", "   ", "hello", "Where are you?", "What is your ADDRESS", "你們在哪", "phone number please",
+    "電話", "Email?", "do you have a mail address", "Who are you", "介紹一下", "membership price",
+    "加入會員", "reviews of botox", "評價", "How much for 20 units?", "30 UNITS", "40unit", "2 questions: 30 units",
+    "botox price", "Dysport 價格", "price for 50 units", "20 units where", "somewhere", "emailing", "unit 20",
+]
+
+
+def random_messages(n, seed=0):
+    rng = random.Random(seed)
+    pool = KEYWORDS + FILLER
+    for _ in range(n):
+        words = [rng.choice(pool) for _ in range(rng.randint(0, 6))]
+        sep = rng.choice([" ", "", "-"])
+        text = sep.join(words)
+        if rng.random() < 0.5:
+            text = text.upper() if rng.random() < 0.3 else text.title()
+        yield text
+
+
+@pytest.mark.parametrize("message", MESSAGES)
+def test_classify_matches_legacy(message):
+    assert IntentClassifier().classify(message) == legacy_classify(message)
+
+
+def test_classify_matches_legacy_random():
+    clf = IntentClassifier()
+    for message in random_messages(20_000):
+        intent = legacy_classify(message)
+        units = legacy_units(message) if intent == "unit_price" else None
+        assert clf.match(message) == (intent, units), message
+
+
+def test_match_extracts_first_number():
+    clf = IntentClassifier()
+    assert clf.match("How much for 20 units?") == ("unit_price", 20)
+    assert clf.match("2 questions: 30 units") == ("unit_price", 2)
+    assert clf.match("membership for 40 units") == ("join", None)
+    assert clf.match("botox price") == ("pricing", None)
+
+
+def test_classify_many_matches_single_calls():
+    clf = IntentClassifier()
+    batch = MESSAGES + MESSAGES[::-1]
+    assert clf.match_many(batch) == [clf.match(m) for m in batch]
+    assert clf.classify_many(batch) == [clf.classify(m) for m in batch]
+
+
+def test_reply_cache_lru_and_ttl():
+    from backend.bot.reply_cache import ReplyCache
+
+    cache = ReplyCache(max_entries=2, ttl=60)
+    cache.put(("v1", "a"), "A")
+    cache.put(("v1", "b"), "B")
+    assert cache.get(("v1", "a")) == "A"
+    cache.put(("v1", "c"), "C")  # Evicts "b", the least recently used
+    assert cache.get(("v1", "b")) is None
+    assert cache.get(("v2", "a")) is None  # New data version: different key
+
+    cache.ttl = -1
+    cache.put(("v1", "d"), "D")
+    assert cache.get(("v1", "d")) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["evictions"], stats["expired"]) == (1, 2, 1)
+
+
+def test_store_from_the_scraped_csv():
+    from backend.bot.knowledge_store import MISSING, load_store
+
+    store = load_store("backend/data/processed/clubinject_scottsdale.csv")
+    assert dict(store.prices) == {20: 150.8, 30: 226.2, 40: 301.6, 50: 377.0}
+    assert store.address == "ClubInject® 7077 E Bell Rd Suite 501, Scottsdale AZ 85254"
+    assert (store.phone, store.email, store.member_fee_month) == ("(480) 576-2246", "members@clubinject.com", 9.72)
+    assert store.about.startswith("ClubInject®\nis a group of") and "$9.72/month" in store.join_info
+    assert store.testimonials == () and store.answer("review") == MISSING["review"]
+    assert store.pricing_summary is None and store.answer("pricing") == MISSING["pricing"]
+    assert len(store.links) == 49 and store.links[:2] == (("0", "/cart"), (None, "/"))
+    assert store.documents == (store.about, store.join_info)
+    assert store.answer("address") == f"Our address is: {store.address}"
+    assert store.price_answer(30) == "The price for 30 units is: $226.2"
+
+
+def test_store_edge_cases(tmp_path):
+    from backend.bot.knowledge_store import MISSING, load_store
+
+    path = tmp_path / "site.csv"
+    # No email / link_text columns; a row shorter than the header; NA cells; the same text on two rows
+    path.write_text(
+        "type,content,units,price,member_fee_month,phone,address,link_url\n"
+        "service,,20.0,150.8,NA,,,\n"
+        "service,,20,999,$9/mo,(480) 000-0000,1 Main St,\n"
+        "service,,20.5,10,,,,\n"
+        "service,,N/A,10,,,,\n"
+        "service,,30,n/a,,,,\n"
+        "testimonial,Great,,,,,,\n"
+        "testimonial,,,,,,,\n"
+        "testimonial,Great,,,,,,\n"
+        "about,Old about,,,,,,\n"
+        "about,New about,,,,,,\n"
+        "link,,,,,,,/cart\n"
+        "link\n"
+        "\n",
+        encoding="utf-8",
+    )
+    store = load_store(path)
+    assert dict(store.prices) == {20: 150.8}  # First price per whole unit count; unparseable cells skipped
+    assert (store.phone, store.address, store.email) == ("(480) 000-0000", "1 Main St", None)
+    assert store.member_fee_month == "$9/mo"  # First non-missing fee, kept as text when it is not a number
+    assert store.testimonials == ("Great", "Great") and store.documents == ("Great", "Old about", "New about")
+    assert store.about == "New about" and store.answer("about") == "About us:\nNew about"
+    assert store.links == ((None, "/cart"), (None, None))
+    assert store.answer("email") == MISSING["email"] and store.answer("join") == MISSING["join"]
+
+    for text in ("", "content,units\nhello,1\n", "type,content\n"):  # Empty, no type column, header only
+        path.write_text(text, encoding="utf-8")
+        store = load_store(path)
+        assert dict(store.prices) == {} and store.links == () and store.documents == ()
+        assert dict(store.answers) == MISSING
+
+
+def test_chatbot_applies_scrape_changeset(tmp_path, monkeypatch):
+    from backend.bot.bot_core import ChatBot
+    from backend.bot.knowledge_store import load_store
+    from backend.scraper.dynamic_scraper import DynamicScraper
+    from backend.scraper.rows import Row
+
+    monkeypatch.chdir(tmp_path)
+    scraper = DynamicScraper({"site_name": "changeset_test", "target_url": "https://example.com/",
+                              "storage": {"type": "csv", "path": "site.csv"}})
+    rows = [Row(type="service", units=20, price=150.8, address="7077 E Bell Rd"),
+            Row(type="testimonial", content="Great"), Row(type="testimonial", content="Quick")]
+    scraper.save(rows)
+    bot = ChatBot("site.csv", reply_cache=False)
+    assert bot.chat("20 units") == "The price for 20 units is: $150.8"
+
+    scraper.save([rows[0]._replace(price=160.0), rows[2], Row(type="about", title="About Us", content="We inject")])
+    applied = bot._apply_changes()
+    assert applied is not None
+    bot.reload(wait=True)
+    assert bot.store == load_store("site.csv")
+    assert bot.chat("20 units") == "The price for 20 units is: $160.0"
+    assert bot.chat("Tell me about you") == "About us:\nWe inject"
+
+
+def test_retrieval_index_ranks_and_reuses_documents():
+    from backend.bot.retrieval import RetrievalIndex
+
+    docs = ("We are a group of physicians and registered nurses in 24 cities.",
+            "Quick and painless, the nurses were great.",
+            "Memberships are just $9.72/month.")
+    index = RetrievalIndex(docs, "v1")
+    hits = index.search("Do you have registered nurses?", k=3, min_score=0)
+    assert [d for d, _ in hits] == [docs[0], docs[1]] and hits[0][1] > hits[1][1]
+    assert [d for d, _ in index.search("nurses")] == []  # In most documents: too common to answer with
+    assert index.search("weather forecast") == [] and index.search("the and you") == []
+
+    rebuilt = RetrievalIndex(docs[1:] + ("Open on Saturdays in Scottsdale.",), "v2", previous=index)
+    assert rebuilt.reused == 2 and len(rebuilt) == 3
+    assert rebuilt.search("saturday hours scottsdale")[0][0] == "Open on Saturdays in Scottsdale."
+    assert RetrievalIndex((), "empty").search("nurses") == []
+
+
+def test_chatbot_answers_unknown_intents_from_site_text(tmp_path):
+    from backend.bot.bot_core import FALLBACK, ChatBot
+
+    path = tmp_path / "site.csv"
+    path.write_text("type,title,content\n"
+                    "about,About Us,\"ClubInject is a group of Physicians and Registered Nurses\nin 24 cities.\"\n"
+                    "testimonial,Reviews,Quick and painless. The nurses were lovely.\n"
+                    "generic,Text,Free parking is available behind the building.\n", encoding="utf-8")
+    bot = ChatBot(str(path), reply_cache=False)
+    assert bot._index is None  # Built on the first fallback
+    assert bot.chat("Is there parking?") == ("Here's what I found on our site:\n"
+                                             "Free parking is available behind the building.")
+    assert bot.chat("Which cities?").endswith("Registered Nurses in 24 cities.")
+    assert bot.chat("What's the weather like?") == FALLBACK
+    assert bot.chat_many(["Is there parking?", "hello"])[1] == FALLBACK
+
+    index = bot._index
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("generic,Text,We are open on Saturdays.\n")
+    bot.reload(wait=True)
+    assert bot._index is not index and bot._index.reused == 3  # Rebuilt on reload, old documents not re-tokenized
+    assert bot.chat("Are you open on saturdays?") == "Here's what I found on our site:\nWe are open on Saturdays."
+
+
+def test_registry_rejects_bad_sites_without_leaking_locks():
+    import threading
+    from backend.bot.registry import DEFAULT_SITE, BotRegistry, UnknownSite
+
+    registry = BotRegistry()
+    for site in ({"a": 1}, ["a"], "../etc/passwd", "no_such_site_1", "no_such_site_2"):
+        with pytest.raises(UnknownSite):
+            registry.get(site)
+    assert registry._loading == {} and registry.stats()["loaded"] == 0
+
+    bots = []
+    threads = [threading.Thread(target=lambda: bots.append(registry.get(DEFAULT_SITE))) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(bots) == 6 and len({id(b) for b in bots}) == 1  # One load for concurrent first requests
+    assert registry._loading == {}
@@ -0,0 +1,536 @@
+from pathlib import Path
+
+from benchmarks.harness import compare, run_suite
+from benchmarks.site import FixtureSite
+from backend.scraper.base_scraper import BaseScraper
+from backend.scraper.dynamic_scraper import DynamicScraper
+from backend.scraper.html_parser import BACKENDS, PageDocument, is_available
+from backend.scraper.changeset import ChangeTracker, apply_changes, load_changes
+from backend.scraper.rows import Row
+from backend.scraper.sinks import make_sink
+
+PAGES = Path(__file__).parent / "pages"  # Checked-in sample pages, indented like real markup
+
+
+def _books_config(site, tmp_path, pages=3):
+    return {
+        "site_name": "books_fixture",
+        "target_url": site.url("/x2/"),
+        "item": "article.product_pod",
+        "selectors": {"title": "h3 a", "price": ".price_color"},
+        "pagination": {"next": "li.next a", "url_template": "catalogue/page-{page}.html", "max_pages": pages},
+        "http": {"min_interval": 0, "retries": 0},
+        "page_cache": False,
+        "storage": {"type": "csv", "path": str(tmp_path / "books.csv")},
+    }
+
+
+def test_crawl_against_fixture_site(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Page / robots caches
+    with FixtureSite() as site:
+        scraper = BaseScraper(_books_config(site, tmp_path))
+        count, path, sample = scraper.run()
+    assert count == 3 * 40  # 3 pages of 20 × 2 books
+    assert scraper.crawl_stats == {"pages": 3, "failed": 0, "records": 120}
+    assert sample[0]["price"].startswith("£")
+    assert {s["phase"] for s in scraper.spans} >= {"fetch", "parse", "sink_write"}
+
+
+def test_fixture_site_revalidates_with_etag(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with FixtureSite() as site:
+        config = {"site_name": "clubinject_fixture", "target_url": site.url("/x1/scottsdale"),
+                  "http": {"min_interval": 0, "retries": 0}}
+        first = BaseScraper(config)
+        html = first.fetch_page()
+        second = BaseScraper(config)
+        assert second.fetch_page() == html
+    assert "ClubInject" in html
+    assert not first.unchanged and second.unchanged  # 304 Not Modified, served from the page cache
+
+
+def test_harness_results_and_compare(tmp_path):
+    report = run_suite(scales=(1,), cases=("parse_page.dynamic", "save_to_csv", "classify"), repeat=2,
+                       workdir=tmp_path)
+    results = {r["case"]: r for r in report["results"]}
+    assert set(results) == {"parse_page.dynamic", "save_to_csv", "classify"}
+    assert results["save_to_csv"]["rows"] == results["parse_page.dynamic"]["rows"] > 0
+    assert all(r["runs"] >= 1 and r["min_s"] <= r["median_s"] for r in results.values())
+
+    slower = [dict(r, min_s=r["min_s"] * 2) for r in report["results"]]
+    assert [r["case"] for r in compare(slower, report["results"], 0.25)] == [r["case"] for r in report["results"]]
+    assert compare(report["results"], report["results"], 0.25) == []
+
+
+def _save(rows, path, index_dir):
+    tracker = ChangeTracker(path, index_dir=index_dir)
+    make_sink({"type": "csv", "path": str(path)}).write(tracker.track(rows))
+    return tracker.commit()
+
+
+def test_changeset_diffs_runs_and_applies(tmp_path):
+    path, index_dir = tmp_path / "site.csv", tmp_path / "index"
+    rows = [Row(type="service", units=u, price=p) for u, p in ((20, 150.8), (30, 226.2))]
+    rows += [Row(type="testimonial", content=f"review {i}") for i in range(3)]
+    rows += [Row(type="link", link_text="Home", link_url="/"), Row(type="link", link_text="Home", link_url="/")]
+    first = _save(rows, path, index_dir)
+    assert first["base_version"] is None and first["added"] == len(rows)
+    assert load_changes(path)["added"] == []  # Nothing to apply on top of: consumers reload in full
+
+    new = list(rows)
+    new[0] = new[0]._replace(price=160.0)
+    del new[3]
+    new.insert(4, Row(type="testimonial", content="fresh review"))
+    second = _save(new, path, index_dir)
+    assert (second["added"], second["modified"], second["removed"]) == (1, 1, 1)
+    assert second["base_version"] == first["version"] and not second["order_changed"]
+
+    changes = load_changes(path)
+    assert changes["modified"][0]["key"] == ["service", "20"]
+    assert changes["removed"][0] == {"key": ["testimonial", "review 1"], "old_index": 3}
+    assert apply_changes(rows, changes, convert=lambda row: Row(**row)) == new
+
+    assert _save(new[::-1], path, index_dir)["order_changed"]
+
+
+def test_parser_backends_agree_on_indented_pages():
+    html = (PAGES / "clubinject_scottsdale.html").read_text(encoding="utf-8")
+    backends = [b for b in BACKENDS if is_available(b)]
+    config = {"site_name": "sample", "target_url": "https://www.clubinject.com/scottsdale"}
+    rows = {b: DynamicScraper(dict(config, parser=b)).parse_page(html) for b in backends}
+    assert all(rows[b] == rows["html.parser"] for b in backends)
+    review = next(r for r in rows["html.parser"] if r["title"] == "Great service and friendly staff")
+    assert review["content"] == "Great service and friendly staff\nBooked online, in and out in\n20 minutes\n."
+
+    docs = {b: PageDocument(html, b) for b in backends}
+    for b, doc in docs.items():
+        assert doc.text() == docs["html.parser"].soup.get_text("\n", strip=True)
+        assert doc.links() == docs["html.parser"].links()
+    units = {b: BaseScraper(dict(config, mode="clubinject_units", parser=b))._parse_clubinject_units(html)
+             for b in backends}
+    assert all(units[b] == units["html.parser"] for b in backends) and units["html.parser"]
+
+    books = (PAGES / "books_listing.html").read_text(encoding="utf-8")
+    fields = {"title": "h3 a@title", "short": "h3 a", "price": ".price_color"}
+    records = {b: PageDocument(books, b).select_records(fields, item="article.product_pod") for b in backends}
+    assert all(records[b] == records["html.parser"] for b in backends)
+    assert records["html.parser"][0] == {"title": "Book number 6 with a fairly long catalogue title",
+                                         "short": "Book number 6 with a...", "price": "£16.06"}
+
+
+def test_unchanged_page_reparses_when_parse_config_changes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with FixtureSite() as site:
+        config = {"site_name": "units_fixture", "target_url": site.url("/x1/scottsdale"),
+                  "parse_mode": "clubinject_units", "http": {"min_interval": 0, "retries": 0}, "storage": {"type": "csv", "path": "units.csv"}}
+        statuses = []
+        for changed in ({}, {}, {"parser": "html.parser"},
+                        {"parser": "html.parser", "http": {"min_interval": 0, "retries": 1}}):
+            scraper = BaseScraper(dict(config, **changed))
+            scraper.run()
+            statuses.append(scraper.status)
+        assert statuses == ["updated", "unchanged", "updated", "unchanged"]  # http settings do not affect rows
+
+        cache_dir = tmp_path / "backend/data/cache/pages"
+        before = sorted(p.name for p in cache_dir.iterdir())
+        BaseScraper(dict(config, target_url=site.url("/x2/scottsdale"), page_cache=False)).run()
+        assert sorted(p.name for p in cache_dir.iterdir()) == before  # page_cache: false writes nothing
+
+
+def test_page_cache_evicts_replaced_bodies(tmp_path):
+    from backend.scraper.page_cache import PageCache, body_hash
+
+    cache = PageCache(tmp_path)
+    assert cache.store("https://a.example/", "<p>v1</p>") and cache.store("https://b.example/", "<p>v1</p>")
+    assert cache.store("https://a.example/", "<p>v2</p>")
+    assert (tmp_path / f"{body_hash('<p>v1</p>')}.html").exists()  # Still the body of b.example
+    assert cache.store("https://b.example/", "<p>v3</p>")
+    assert sorted(p.name for p in tmp_path.glob("*.html")) == sorted(
+        f"{body_hash(h)}.html" for h in ("<p>v2</p>", "<p>v3</p>"))
+    assert not cache.store("https://b.example/", "<p>v3</p>")
+
+
+def _schedule_dir(tmp_path, monkeypatch, configs):
+    from backend.config import config_loader
+
+    monkeypatch.setattr(config_loader, "CONFIG_DIR", tmp_path)
+    for path in tmp_path.glob("*.yml"):
+        path.unlink()
+    for name, schedule in configs.items():
+        body = "".join(f"  {k}: {v}\n" for k, v in schedule.items())
+        (tmp_path / f"{name}.yml").write_text(f"site_name: {name}\nschedule:\n{body}", encoding="utf-8")
+
+
+def test_scheduler_backoff_and_rescan(tmp_path, monkeypatch):
+    from backend.scraper.scheduler import Scheduler, _Job
+
+    job = _Job("a", "static", {"interval": "10s", "jitter": 0, "max_backoff": "60s"})
+    job.failures = 2
+    assert (job.delay_after(True), job.delay_after(False)) == (10.0, 40.0)
+    job.failures = 5
+    assert job.delay_after(False) == 60.0  # Capped
+
+    _schedule_dir(tmp_path, monkeypatch, {"a": {"interval": "1h"}, "b": {"interval": "2h"}})
+    scheduler = Scheduler("*", metrics_path=None)
+    scheduler.rescan()
+    first = scheduler.jobs["a"]
+    assert sorted(scheduler.jobs) == ["a", "b"]
+    _schedule_dir(tmp_path, monkeypatch, {"a": {"interval": "30m"}, "c": {"interval": "1d", "enabled": "false"}})
+    scheduler.rescan()
+    assert sorted(scheduler.jobs) == ["a"] and scheduler.jobs["a"] is first and first.interval == 1800
+    scheduler.stop()
+
+
+def test_scheduler_never_overlaps_runs_of_a_config(tmp_path, monkeypatch):
+    import threading
+    import time
+    from backend.scraper import scheduler as scheduler_module
+
+    release, calls = threading.Event(), []
+
+    def run_one(name, gate):
+        calls.append(name)
+        release.wait(10)
+        return {"config": name, "status": "success", "seconds": 0.0}
+
+    monkeypatch.setattr(scheduler_module, "run_one", run_one)
+    _schedule_dir(tmp_path, monkeypatch, {"a": {"interval": "1h", "run_on_start": "true"}})
+    scheduler = scheduler_module.Scheduler("*", metrics_path=None, rescan_interval=3600)
+    loop = threading.Thread(target=scheduler.run_forever)
+    loop.start()
+    try:
+        deadline = time.time() + 5
+        while not calls and time.time() < deadline:
+            time.sleep(0.01)
+        # Removed and re-added (due right away) while its first run is still going
+        _schedule_dir(tmp_path, monkeypatch, {})
+        scheduler.rescan()
+        _schedule_dir(tmp_path, monkeypatch, {"a": {"interval": "1h", "run_on_start": "true"}})
+        scheduler.rescan()
+        time.sleep(0.3)
+        assert calls == ["a"] and scheduler.jobs["a"].skipped == 1
+
+        with scheduler._lock:  # A signal handler can run while the loop's thread holds the lock
+            scheduler.request_stop()
+    finally:
+        release.set()
+        scheduler.request_stop()
+        loop.join(5)
+        scheduler.stop()
+    assert not loop.is_alive()
+
+
+class _FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+
+    def delete_all_cookies(self):
+        pass
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+def _fake_pool(**options):
+    from backend.scraper.browser_pool import BrowserPool
+
+    class FakePool(BrowserPool):
+        launched = []
+
+        def _new_driver(self):
+            self.launched.append(_FakeDriver())
+            return self.launched[-1]
+
+    return FakePool(**options)
+
+
+def test_browser_pool_never_exceeds_size():
+    import threading
+
+    pool = _fake_pool(size=2, max_pages=2, acquire_timeout=5)
+    assert pool.warm() == 2 and pool.warm() == 0  # Idle drivers count against the size
+    with pool.acquire() as first:
+        assert pool.warm() == 0
+    assert len(pool.launched) == 2
+
+    seen = []
+
+    def borrow():
+        with pool.acquire() as driver:
+            seen.append(driver)
+
+    threads = [threading.Thread(target=borrow) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(seen) == 8 and len(pool._live) + pool._launching <= 2
+    assert any(d.quit_called for d in pool.launched)  # Recycled after max_pages, replaced within the bound
+    assert first in pool.launched
+
+    try:
+        with pool.acquire():
+            raise ValueError("page failed")
+    except ValueError:
+        pass
+    assert pool._idle.qsize() == len(pool._live) <= 2  # Returned to the pool despite the error
+    pool.close()
+    assert not pool._live and all(d.quit_called for d in pool.launched)
+
+
+def test_select_records_without_item_rejects_uneven_columns():
+    import pytest
+
+    doc = PageDocument("<h3>A</h3><p class='p'>1</p><h3>B</h3><p class='p'>2</p><h3>C</h3>", "html.parser")
+    assert doc.select_records({"title": "h3", "price": "h3"})[2] == {"title": "C", "price": "C"}
+    with pytest.raises(ValueError, match="different numbers"):
+        doc.select_records({"title": "h3", "price": ".p"})
+
+
+def test_sinks_add_columns_that_appear_after_the_first_row(tmp_path):
+    import csv
+    import sqlite3
+
+    rows = [{"title": "a"}, {"title": "b", "price": 1}, {"price": 2.5, "title": "c", "note": "x"}]
+    path = tmp_path / "out.csv"
+    assert make_sink({"type": "csv", "path": str(path)}, batch_size=2).write(iter(rows)).count == 3
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        assert list(csv.reader(f)) == [["title", "price", "note"], ["a", "", ""], ["b", "1", ""], ["c", "2.5", "x"]]
+
+    path = tmp_path / "out.sqlite3"
+    make_sink({"type": "sqlite", "path": str(path)}).write(iter(rows))
+    with sqlite3.connect(path) as conn:
+        assert conn.execute('SELECT title, price, note FROM "rows"').fetchall() == [
+            ("a", None, None), ("b", 1, None), ("c", 2.5, "x")]
+
+    fixed = tmp_path / "fixed.csv"  # Explicit fieldnames still fix the columns
+    make_sink({"type": "csv", "path": str(fixed)}, fieldnames=["title"]).write(iter(rows))
+    assert fixed.read_text(encoding="utf-8-sig").split() == ["title", "a", "b", "c"]
+
+
+def test_incomplete_sink_fails_when_built():
+    import pytest
+    from backend.scraper.sinks import BaseSink
+
+    class NoClose(BaseSink):
+        def _open(self, tmp_path, first_row):
+            pass
+
+        def _write_batch(self, batch):
+            pass
+
+    with pytest.raises(TypeError, match="_close"):
+        NoClose("out.csv")
+
+
+def test_parquet_sink_widens_schema_across_batches(tmp_path):
+    import pytest
+
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    # First batch: price all None and units ints; later batches bring numbers, floats and a new column
+    rows = [{"title": "a", "price": None, "units": 1}, {"title": "b", "price": None, "units": 2},
+            {"title": "c", "price": 10, "units": 3}, {"title": "d", "price": 12.5, "units": 4.5},
+            {"title": "e", "price": 1, "units": 5, "note": "x"}]
+    path = tmp_path / "out.parquet"
+    make_sink({"type": "parquet", "path": str(path)}, batch_size=2).write(iter(rows))
+    table = pq.read_table(path)
+    assert table.schema.field("price").type == pa.float64()
+    assert table.schema.field("units").type == pa.float64()
+    assert table.column("price").to_pylist() == [None, None, 10.0, 12.5, 1.0]
+    assert table.column("note").to_pylist() == [None, None, None, None, "x"]
+
+    # Row declares its types: an all-None column keeps its type
+    path = tmp_path / "rows.parquet"
+    make_sink({"type": "parquet", "path": str(path)}, batch_size=1).write(
+        iter([Row(type="about", content="x"), Row(type="service", units=20, price=200.0)]))
+    schema = pq.read_schema(path)
+    assert schema.field("units").type == pa.int64() and schema.field("phone").type == pa.string()
+
+
+def _flaky_server(replies):
+    """Local HTTP server answering GETs with `replies` in turn ((status, headers)), then 200s"""
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(time.monotonic())
+            status, headers = replies[len(hits) - 1] if len(hits) <= len(replies) else (200, {})
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/", hits
+
+
+def test_http_client_retries_with_retry_after_and_backoff():
+    import time
+    import pytest
+    import requests
+    from email.utils import formatdate
+    from backend.scraper.http_client import HttpClient, parse_retry_after
+
+    replies = [(503, {"Retry-After": "0.3"}), (429, {"Retry-After": "0.2"})]
+    server, url, hits = _flaky_server(replies)
+    try:
+        r = HttpClient(retries=3, backoff=0.01, min_interval=0).get(url)
+        assert (r.status_code, r.retries, len(hits)) == (200, 2, 3)
+        assert hits[1] - hits[0] >= 0.3 and hits[2] - hits[1] >= 0.2  # The server's delays, not the backoff
+
+        # Retry-After is capped by max_backoff; once retries run out the last response is returned
+        replies[:] = [(429, {"Retry-After": "3600"})] * 5
+        hits.clear()
+        start = time.monotonic()
+        r = HttpClient(retries=2, backoff=0.01, max_backoff=0.05, min_interval=0).get(url)
+        assert (r.status_code, r.retries, len(hits)) == (429, 2, 3)
+        assert time.monotonic() - start < 2
+
+        # No Retry-After: exponential backoff
+        replies[:] = [(500, {}), (502, {})]
+        hits.clear()
+        r = HttpClient(retries=2, backoff=0.1, min_interval=0).get(url)
+        assert (r.status_code, r.retries) == (200, 2)
+        assert hits[1] - hits[0] >= 0.1 and hits[2] - hits[1] >= 0.2
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    with pytest.raises(requests.ConnectionError):  # Server gone: back off, retry, then raise
+        HttpClient(retries=2, backoff=0.01, min_interval=0).get(url)
+
+    assert parse_retry_after("2") == 2.0 and parse_retry_after("soon") is None
+    assert 50 < parse_retry_after(formatdate(time.time() + 60, usegmt=True)) <= 60
+
+
+def test_books_changeset_keys_on_resolved_book_urls(tmp_path, monkeypatch):
+    import yaml
+
+    monkeypatch.chdir(tmp_path)
+    shipped = yaml.safe_load((Path(__file__).resolve().parents[1] / "backend/config/book_toscrape.yml").read_text())
+    with FixtureSite() as site:
+        config = dict(_books_config(site, tmp_path), selectors=shipped["selectors"])
+        records = list(BaseScraper(config).iter_records())
+    urls = [r["link_url"] for r in records]
+    assert len(set(urls)) == len(records) == 120  # Page 1 links say "catalogue/...", later pages do not
+    assert all(u.startswith(site.url("/x2/catalogue/book-")) for u in urls)
+
+    # Two books whose truncated titles match, listed in the other order next run
+    books = [{"title": "A Long Title That...", "price": f"£{n}", "link_url": f"https://b/{n}"} for n in (1, 2)]
+    path, index_dir = tmp_path / "books.csv", tmp_path / "index"
+    for rows in (books, books[::-1]):
+        tracker = ChangeTracker(path, key=shipped["changeset"]["key"], index_dir=index_dir)
+        make_sink({"type": "csv", "path": str(path)}).write(tracker.track(rows))
+        summary = tracker.commit()
+    assert (summary["added"], summary["modified"], summary["removed"]) == (0, 0, 0) and summary["order_changed"]
+
+
+def _robots_server(state):
+    """robots.txt server: body and status from `state`, 304 for a matching If-None-Match; records each request"""
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state["requests"].append((self.path, self.headers.get("If-None-Match")))
+            if self.path != "/robots.txt":
+                status, body = 200, b"<html></html>"
+            elif state["status"] == 200 and self.headers.get("If-None-Match") == state["etag"]:
+                status, body = 304, b""
+            else:
+                status, body = state["status"], state["body"].encode()
+            self.send_response(status)
+            if self.path == "/robots.txt":
+                self.send_header("ETag", state["etag"])
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def test_robots_cache_ttl_negative_caching_and_etag(tmp_path, monkeypatch):
+    import time
+    from backend.scraper import robots
+    from backend.scraper.http_client import HttpClient
+
+    client = HttpClient(backoff=0.01, min_interval=0)
+    monkeypatch.setattr(robots, "get_http_client", lambda: client)
+    state = {"status": 200, "body": "User-agent: *\nDisallow: /private\n", "etag": '"v1"', "requests": []}
+    server, base = _robots_server(state)
+    try:
+        cache = robots.RobotsCache(cache_dir=tmp_path, ttl=0.3, negative_ttl=0.3)
+        assert cache.allowed(base + "/public") and not cache.allowed(base + "/private")
+        assert cache.crawl_delay(base + "/") is None
+        assert state["requests"] == [("/robots.txt", None)]  # One fetch, then served from memory
+
+        # A second process reads the disk copy while it is fresh
+        assert not robots.RobotsCache(cache_dir=tmp_path, ttl=0.3).allowed(base + "/private")
+        assert len(state["requests"]) == 1
+
+        time.sleep(0.35)  # Expired: revalidated with the ETag, 304 keeps the cached rules
+        assert not cache.allowed(base + "/private")
+        assert state["requests"][1:] == [("/robots.txt", '"v1"')]
+
+        state["status"] = 503
+        time.sleep(0.35)  # Server errors are cached as "disallow all" for negative_ttl
+        assert not cache.allowed(base + "/public")
+        assert not cache.allowed(base + "/public") and len(state["requests"]) == 4  # One retry, then cached
+
+        state.update(status=200, body="User-agent: *\nDisallow:\n", etag='"v2"')
+        time.sleep(0.35)  # After a failure the next fetch is unconditional
+        assert cache.allowed(base + "/private")
+        assert state["requests"][4:] == [("/robots.txt", None)]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_dynamic_scraper_honours_crawl_delay(tmp_path, monkeypatch):
+    import time
+    from backend.scraper import dynamic_scraper, robots
+    from backend.scraper.http_client import HttpClient
+
+    monkeypatch.chdir(tmp_path)  # Scraper log file
+    client = HttpClient(retries=0, min_interval=0)
+    monkeypatch.setattr(robots, "get_http_client", lambda: client)
+    monkeypatch.setattr(dynamic_scraper, "get_http_client", lambda: client)
+    monkeypatch.setattr(robots, "_cache", robots.RobotsCache(cache_dir=tmp_path / "robots"))
+    monkeypatch.setattr(_FakeDriver, "page_source", "<html><body>ok</body></html>", raising=False)
+    pool = _fake_pool(size=1)
+    state = {"status": 200, "body": "User-agent: *\nCrawl-delay: 1\n", "etag": '"v1"', "requests": []}
+    server, base = _robots_server(state)
+    try:
+        scraper = DynamicScraper({"site_name": "delay_test", "target_url": base + "/page", "page_cache": False})
+        monkeypatch.setattr(scraper, "_browser_pool", lambda: pool)
+        monkeypatch.setattr(scraper.render_waiter, "wait", lambda driver: {})
+        loads = []
+        for _ in range(2):
+            scraper.fetch_page()
+            loads.append(time.monotonic())
+        assert loads[1] - loads[0] >= 0.9  # Browser loads wait for Crawl-delay like plain GETs
+        assert client.limiter.interval(base.split("//")[1]) == 1.0
+    finally:
+        server.shutdown()
+        server.server_close()
+        pool.close()